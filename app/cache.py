@@ -0,0 +1,116 @@
+# app/cache.py
+"""
+Shared blueprint cache for multi-worker deployments.
+
+Each Uvicorn/Gunicorn worker would otherwise parse the YAML blueprint on its
+own. When QNF_REDIS_URL is set, the first worker to start publishes the parsed
+blueprint to Redis and the others load it from there; the payloads derived
+per worker on ``app.state`` remain the L1 cache.
+
+Also provides the stale-while-revalidate holder used for /api/metrics.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+import orjson
+
+from app.quantum_nexus import QuantumNexus
+
+logger = logging.getLogger("sentinel-dashboard")
+
+BLUEPRINT_TTL = int(os.getenv("QNF_BLUEPRINT_CACHE_TTL", "3600"))
+
+# Process-wide counters, reported by /api/cache
+stats: Dict[str, int] = {"hits": 0, "misses": 0, "errors": 0}
+
+
+def _redis_client():
+    url = os.getenv("QNF_REDIS_URL")
+    if not url:
+        return None
+    try:
+        from redis import asyncio as aioredis
+    except ImportError:
+        logger.warning("QNF_REDIS_URL is set but the redis package is not installed")
+        return None
+    return aioredis.from_url(url)
+
+
+async def load_blueprint(path: str | Path) -> QuantumNexus:
+    """
+    Load the blueprint, preferring the copy another worker already parsed.
+
+    Entries are keyed by the blueprint's content hash, so an edited YAML file
+    never resolves to a stale entry. Any Redis failure falls back to parsing.
+    """
+    client = _redis_client()
+    if client is None:
+        return await asyncio.to_thread(QuantumNexus.load, path)
+
+    raw = await asyncio.to_thread(Path(path).read_bytes)
+    key = "sentinel:blueprint:" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+    try:
+        cached = await client.get(key)
+        if cached is not None:
+            stats["hits"] += 1
+            return QuantumNexus.from_dict(orjson.loads(cached))
+
+        stats["misses"] += 1
+        # Parse the bytes already read for the key instead of reopening the file
+        qn = await asyncio.to_thread(QuantumNexus.from_yaml_bytes, raw)
+        # NX: when several workers miss at once, the first writer wins
+        await client.set(key, orjson.dumps(qn.bp), ex=BLUEPRINT_TTL, nx=True)
+        return qn
+    except Exception as e:
+        stats["errors"] += 1
+        logger.warning("Blueprint cache unavailable, parsing locally: %s", e)
+        return await asyncio.to_thread(QuantumNexus.load, path)
+    finally:
+        await client.aclose()
+
+
+class StaleWhileRevalidate:
+    """
+    Single cached value refreshed with stale-while-revalidate semantics.
+
+    Younger than ``expire`` seconds: served as is. Between ``expire`` and
+    ``stale``: served immediately while one background task rebuilds it.
+    Older than ``stale`` (or never built): the caller awaits the rebuild.
+    Rebuilds are single-flight.
+    """
+
+    def __init__(self, build: Callable[[], Awaitable[bytes]], expire: float = 5.0, stale: float = 30.0):
+        self._build = build
+        self.expire = expire
+        self.stale = stale
+        self._value: Optional[bytes] = None
+        self._generated_at = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def get(self) -> bytes:
+        age = time.monotonic() - self._generated_at
+        if self._value is not None:
+            if age < self.expire:
+                return self._value
+            if age < self.stale:
+                if self._task is None or self._task.done():
+                    self._task = asyncio.create_task(self._refresh())
+                return self._value
+        return await self._refresh()
+
+    async def _refresh(self) -> bytes:
+        async with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._value is not None and time.monotonic() - self._generated_at < self.expire:
+                return self._value
+            self._value = await self._build()
+            self._generated_at = time.monotonic()
+            return self._value
@@ -4,29 +4,71 @@ Sentinel Forge Phase 2 Dashboard Application
 Quantum Nexus lattice-aware cognitive orchestration UI
 
 Run with: uvicorn app.main:app --reload --port 8001
+
+Production (uvloop event loop, httptools parser, one worker per core):
+    uvicorn app.main:app --port 8001 --loop uvloop --http httptools --workers $(nproc) --no-access-log
+or under Gunicorn:
+    gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w $((2 * $(nproc) + 1)) -b 0.0.0.0:8001
 """
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from app.cache import load_blueprint
+from app.middleware import ETagMiddleware, NegotiatedGZipMiddleware, TrailingSlashMiddleware
+from app.responses import ORJSONResponse
+from app.routers.dashboard import BLUEPRINT_PATH, DEV_MODE, prime_state
 from app.routers.dashboard import router as dashboard_router
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 STATIC_DIR = PROJECT_ROOT / "static"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the blueprint off the event loop (shared via Redis when configured),
+    # then derive the static payloads (traced paths, rendered dashboard,
+    # metrics body, ETags)
+    qn = await load_blueprint(BLUEPRINT_PATH)
+    prime_state(app.state, qn)
+
+    yield
+
+
 app = FastAPI(
     title="Sentinel Forge • Quantum Nexus Dashboard",
     description="Phase 2 Dashboard with Great Greg coordinate resolver and lattice dependency visualization",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+    redirect_slashes=False,
 )
 
+# Compress larger responses; routes that ship pre-compressed bodies set
+# Content-Encoding themselves and pass through untouched
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=500)
+
+# Answer conditional GETs for blueprint-derived routes with 304. Outside the
+# gzip layer so its ETag and Vary headers are the final ones.
+app.add_middleware(ETagMiddleware)
+
+# Outermost: strip trailing slashes before any routing or ETag lookup
+# (redirect_slashes=False above means no 307 round trip)
+app.add_middleware(TrailingSlashMiddleware)
+
 # Include dashboard routes
 app.include_router(dashboard_router)
 
+# In production /static is served by the reverse proxy (config/nginx/dashboard.conf);
+# the StaticFiles mount is a dev fallback unless QNF_SERVE_STATIC forces it.
+SERVE_STATIC = str(os.getenv("QNF_SERVE_STATIC", "1" if DEV_MODE else "0")).lower() in ("1", "true", "yes", "on")
+
 # Mount static files if directory exists
-if STATIC_DIR.exists():
+if SERVE_STATIC and STATIC_DIR.exists():
     app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
@@ -44,6 +86,7 @@ async def root():
             "dependency": "/api/dependency/{dep_id}",
             "diagonal_trace": "/api/lattice/diagonal",
             "lateral_trace": "/api/lattice/lateral",
+            "cache": "/api/cache",
         },
         "great_greg_formats": [
             "P1 (direct cell)",
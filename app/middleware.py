@@ -0,0 +1,122 @@
+# app/middleware.py
+"""
+HTTP middleware for the dashboard app.
+"""
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.responses import etag_matches
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an ``Accept-Encoding`` header allows gzip.
+
+    Codings are parsed with their q-values, so ``gzip;q=0`` refuses gzip
+    rather than matching as a substring; ``*`` covers gzip when it is not
+    listed itself.
+    """
+    gzip_q = star_q = None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q
+        elif coding == "*":
+            star_q = q
+    if gzip_q is None:
+        gzip_q = star_q
+    return bool(gzip_q)
+
+
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that negotiates with ``accepts_gzip``.
+
+    Starlette's version compresses whenever "gzip" appears anywhere in
+    ``Accept-Encoding``, including ``gzip;q=0``.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class ETagMiddleware(BaseHTTPMiddleware):
+    """
+    Conditional GET support for deterministic routes.
+
+    Reads ``app.state.etags`` (path -> (etag, max_age)), which is populated at
+    startup from the precomputed payloads. Matching ``If-None-Match`` requests
+    are answered with 304 before the route runs; other responses from those
+    paths get ``ETag`` and ``Cache-Control`` headers.
+
+    A request that accepts gzip may be answered with a gzip body, so it is
+    validated against a ``-gz`` variant of the ETag: a strong validator must
+    differ between content-codings, and ``Vary`` tells caches so.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if request.method not in ("GET", "HEAD"):
+            return await call_next(request)
+
+        etags: Dict[str, Tuple[str, int]] = getattr(request.app.state, "etags", None) or {}
+        entry = etags.get(request.url.path)
+        if entry is None:
+            return await call_next(request)
+
+        etag, max_age = entry
+        if accepts_gzip(request.headers.get("accept-encoding", "")):
+            etag = etag[:-1] + '-gz"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}", "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        response = await call_next(request)
+        if response.status_code == 200:
+            # Replaces (not appends to) any Vary the gzip layer already set
+            response.headers.update(headers)
+        return response
+
+
+class TrailingSlashMiddleware:
+    """
+    Canonicalize ``/path/`` to ``/path`` for idempotent requests.
+
+    Used with ``FastAPI(redirect_slashes=False)`` so a client that appends a
+    slash is routed directly instead of paying for a 307 round trip.
+    Implemented as plain ASGI because the path must change before routing.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["method"] in ("GET", "HEAD"):
+            path = scope["path"]
+            if len(path) > 1 and path.endswith("/"):
+                scope = dict(scope)
+                scope["path"] = path.rstrip("/") or "/"
+                raw_path = scope.get("raw_path")
+                if raw_path:
+                    scope["raw_path"] = raw_path.rstrip(b"/") or b"/"
+        await self.app(scope, receive, send)
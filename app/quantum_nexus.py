@@ -1,14 +1,21 @@
 # app/quantum_nexus.py
 from __future__ import annotations
 
+import mmap
+import pickle
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+try:  # libyaml-backed loader is ~10x faster; fall back to pure Python
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class GreatGreg:
     cell: str
     r: int
@@ -16,6 +23,9 @@ class GreatGreg:
     node: int
     label: str
 
+    def as_dict(self) -> Dict[str, Any]:
+        return {"cell": self.cell, "r": self.r, "c": self.c, "node": self.node, "label": self.label}
+
 
 class QuantumNexus:
     """
@@ -28,16 +38,54 @@ class QuantumNexus:
         self.bp = blueprint
         self._rc_map = (blueprint.get("great_greg_coordinates", {}) or {}).get("rc_map", {}) or {}
         self._deps = {d["id"]: d for d in (blueprint.get("dependencies") or []) if isinstance(d, dict) and "id" in d}
+        # Lazily built, shared plain-dict views of traced paths (the blueprint is immutable)
+        self._diagonal_dicts: Optional[List[Dict[str, Any]]] = None
+        self._lateral_dicts: Optional[List[Dict[str, Any]]] = None
+        self._dependency_dicts: Dict[str, List[Dict[str, Any]]] = {}
 
     @classmethod
     def from_yaml(cls, path: str | Path) -> "QuantumNexus":
-        p = Path(path)
-        data = yaml.safe_load(p.read_text(encoding="utf-8"))
+        return cls.from_yaml_bytes(Path(path).read_bytes())
+
+    @classmethod
+    def from_yaml_bytes(cls, raw: bytes) -> "QuantumNexus":
+        # PyYAML detects the encoding of byte input itself; no decode copy needed
+        return cls.from_dict(yaml.load(raw, Loader=_SafeLoader))
+
+    @staticmethod
+    def compiled_path(path: str | Path) -> Path:
+        """Location of the pickled sidecar written by scripts/compile_blueprint.py."""
+        return Path(path).with_suffix(".pickle")
+
+    @classmethod
+    def from_compiled(cls, path: str | Path) -> "QuantumNexus":
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return cls.from_dict(pickle.loads(mm))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "QuantumNexus":
+        """
+        Load a YAML blueprint, preferring its compiled sidecar when that is at
+        least as new as the YAML (skips YAML parsing entirely).
+        """
+        compiled = cls.compiled_path(path)
+        try:
+            if compiled.stat().st_mtime >= Path(path).stat().st_mtime:
+                return cls.from_compiled(compiled)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        return cls.from_yaml(path)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantumNexus":
         # Accept either top-level blueprint or nested under "quantum_nexus_blueprint"
         if "quantum_nexus_blueprint" in data:
             data = data["quantum_nexus_blueprint"]
         return cls(data)
 
+    def dependency_ids(self) -> List[str]:
+        return list(self._deps)
+
     def dependency(self, dep_id: str) -> Dict[str, Any]:
         if dep_id not in self._deps:
             raise KeyError(f"Dependency not found: {dep_id}")
@@ -79,4 +127,62 @@ class QuantumNexus:
             raise KeyError(f"No cell found for {ref} (node={node}, r={r}, c={c})")
 
         # default: treat as cell
-        return self.resolve_cell(ref)
\ No newline at end of file
+        return self.resolve_cell(ref)
+
+    def trace_path(self, path: List[Any]) -> List[GreatGreg]:
+        """
+        Resolve a dependency path into coordinates. Row-major paths are
+        nested lists of cells and are flattened in order.
+        """
+        cells: List[str] = []
+        for step in path or []:
+            if isinstance(step, list):
+                cells.extend(str(cell) for cell in step)
+            else:
+                cells.append(str(step))
+        return [self.resolve(cell) for cell in cells]
+
+    def diagonal_trace(self) -> List[GreatGreg]:
+        dep = self._find_dependency_by_type("diagonal_dependency")
+        return self.trace_path(dep.get("path", [])) if dep else []
+
+    def lateral_trace(self) -> List[GreatGreg]:
+        dep = self._find_dependency_by_type("lateral_row_major_dependency")
+        return self.trace_path(dep.get("path", [])) if dep else []
+
+    def diagonal_dicts(self) -> List[Dict[str, Any]]:
+        """``diagonal_trace()`` as plain dicts, built once and shared by reference."""
+        if self._diagonal_dicts is None:
+            self._diagonal_dicts = [coord.as_dict() for coord in self.diagonal_trace()]
+        return self._diagonal_dicts
+
+    def lateral_dicts(self) -> List[Dict[str, Any]]:
+        """``lateral_trace()`` as plain dicts, built once and shared by reference."""
+        if self._lateral_dicts is None:
+            self._lateral_dicts = [coord.as_dict() for coord in self.lateral_trace()]
+        return self._lateral_dicts
+
+    def dependency_dicts(self, dep_id: str) -> List[Dict[str, Any]]:
+        """Traced path of ``dep_id`` as plain dicts; unknown ids raise KeyError."""
+        dicts = self._dependency_dicts.get(dep_id)
+        if dicts is None:
+            path = self.dependency(dep_id).get("path", [])
+            dicts = self._dependency_dicts[dep_id] = [coord.as_dict() for coord in self.trace_path(path)]
+        return dicts
+
+    def to_api_response(self, ref: str) -> Dict[str, Any]:
+        coord = self.resolve(ref)
+        return {
+            "cell": coord.cell,
+            "row": coord.r,
+            "column": coord.c,
+            "node": coord.node,
+            "node_id": f"Node_{coord.node}",
+            "label": coord.label,
+        }
+
+    def _find_dependency_by_type(self, dep_type: str) -> Optional[Dict[str, Any]]:
+        for dep in self._deps.values():
+            if dep.get("type") == dep_type:
+                return dep
+        return None
@@ -0,0 +1,24 @@
+# app/responses.py
+"""
+Response classes shared by the dashboard app.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Pre-serialized ``bytes`` bodies are passed through untouched so routes can
+    serve payloads that were encoded once at startup.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -5,50 +5,79 @@ Maps FastAPI routes to lattice dependencies per Phase 2 blueprint hooks.
 """
 from __future__ import annotations
 
+import gzip
+import hashlib
+import os
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, Request, HTTPException
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache, Template
 
+from app import cache
+from app.middleware import accepts_gzip
 from app.quantum_nexus import QuantumNexus
+from app.responses import ORJSONResponse
 
-router = APIRouter(tags=["dashboard"])
+# Route payloads are built from the trusted blueprint, so handlers declare
+# response_model=None: FastAPI would otherwise infer a model from the return
+# annotation and re-validate every nested dict on each request.
+router = APIRouter(tags=["dashboard"], default_response_class=ORJSONResponse)
 
-# Resolve templates directory relative to project root
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+# Resolve templates directory relative to project root (absolute, computed once)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 TEMPLATES_DIR = PROJECT_ROOT / "templates"
 BLUEPRINT_PATH = PROJECT_ROOT / "data" / "quantum_nexus_blueprint.yaml"
 
-templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# Templates only change between deploys; outside dev, skip the per-render
+# mtime check and keep every compiled template resident.
+DEV_MODE = str(os.getenv("QNF_ENV", "dev")).lower() not in ("prod", "production")
+
+# Cache-Control max-age (seconds) for routes whose content is fixed by the blueprint
+STATIC_MAX_AGE = 3600
+METRICS_MAX_AGE = 5
+# Past max-age /api/metrics keeps serving its last payload while it refreshes
+METRICS_STALE_AGE = 30
+
+GZIP_HEADERS = {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
 
-# Load blueprint once at import
-QN = QuantumNexus.from_yaml(BLUEPRINT_PATH)
+DASHBOARD_TEMPLATE = "quantum_dashboard.html"
+
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+templates.env.auto_reload = DEV_MODE
+templates.env.cache_size = 400
 
 
-@router.get("/api/metrics", response_model=dict)
-async def api_metrics() -> Dict[str, Any]:
+def _bytecode_cache() -> FileSystemBytecodeCache:
     """
-    Quantum Nexus metrics endpoint.
-    
-    dependency: dep_AllFiles_L2R_to_Z1
-    domains: [memory_zones, cognitive_lenses, system_health]
+    On-disk cache of compiled templates so restarts skip Jinja's parser.
+
+    QNF_JINJA_CACHE_DIR overrides Jinja's default per-user temp directory.
     """
-    dep = QN.dependency("dep_AllFiles_L2R_to_Z1")
-
-    # Build metrics response with lattice context
-    metrics = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "dependency": {
-            "id": dep["id"],
-            "type": dep.get("type"),
-            "from": dep.get("from"),
-            "to": dep.get("to"),
-            "terminus_label": dep.get("terminus_label"),
-            "origin_label": dep.get("origin_label"),
-        },
+    directory = os.getenv("QNF_JINJA_CACHE_DIR")
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+    return FileSystemBytecodeCache(directory=directory or None, pattern="%s.cache")
+
+
+templates.env.bytecode_cache = _bytecode_cache()
+
+
+# Projection of dep_AllFiles_L2R_to_Z1 embedded in /api/metrics
+METRICS_DEPENDENCY_FIELDS = ("id", "type", "from", "to", "terminus_label", "origin_label")
+
+
+def build_metrics_static(qn: QuantumNexus) -> Dict[str, Any]:
+    """Everything in the /api/metrics payload except the timestamp."""
+    dep = qn.dependency("dep_AllFiles_L2R_to_Z1")
+    return {
+        "dependency": {key: dep.get(key) for key in METRICS_DEPENDENCY_FIELDS},
         "domains": {
             "memory_zones": {
                 "active": 0.85,        # >0.7 entropy
@@ -68,16 +97,145 @@ async def api_metrics() -> Dict[str, Any]:
             },
         },
         "great_greg": {
-            "origin": QN.resolve("A1").__dict__,
-            "terminus": QN.resolve("Z1").__dict__,
+            "origin": qn.resolve("A1").as_dict(),
+            "terminus": qn.resolve("Z1").as_dict(),
         },
         "path": dep.get("path"),  # row-major path A1 → ... → Z1
     }
-    return metrics
 
 
-@router.get("/api/resolve/{ref}")
-async def api_resolve(ref: str) -> Dict[str, Any]:
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _diagonal_response(qn: QuantumNexus) -> Dict[str, Any]:
+    return {
+        "dependency_id": "dep_A1_to_V1",
+        "path": qn.diagonal_dicts(),
+        "description": "Prime Truth (A1) → Meta Research focal point (V1)"
+    }
+
+
+def _lateral_response(qn: QuantumNexus) -> Dict[str, Any]:
+    return {
+        "dependency_id": "dep_AllFiles_L2R_to_Z1",
+        "path": qn.lateral_dicts(),
+        "description": "Origin (A1) → Terminus (Z1) row-major traversal"
+    }
+
+
+def _dependency_response(qn: QuantumNexus, dep_id: str) -> Dict[str, Any]:
+    return {
+        "dependency": qn.dependency(dep_id),
+        "traced_path": qn.dependency_dicts(dep_id),
+    }
+
+
+def build_etags(state: Any) -> Dict[str, Tuple[str, int]]:
+    """
+    ETag and max-age for every route whose body is fixed by the blueprint,
+    hashed from the pre-serialized bodies on ``state``.
+
+    /api/metrics is keyed on its static portion only; the timestamp is
+    allowed to go stale for METRICS_MAX_AGE seconds.
+    """
+    etags = {
+        "/api/metrics": (_etag(state.metrics_static_json), METRICS_MAX_AGE),
+        "/api/lattice/diagonal": (_etag(state.diagonal_json), STATIC_MAX_AGE),
+        "/api/lattice/lateral": (_etag(state.lateral_json), STATIC_MAX_AGE),
+        "/dashboard": (_etag(state.dashboard_html), STATIC_MAX_AGE),
+    }
+    for dep_id, body in state.dependency_json.items():
+        etags[f"/api/dependency/{dep_id}"] = (_etag(body), STATIC_MAX_AGE)
+    return etags
+
+
+def prime_state(state: Any, qn: QuantumNexus) -> None:
+    """
+    Attach the blueprint and its derived payloads to ``app.state``.
+
+    The blueprint never mutates once loaded, so every route body (serialized
+    once; /api/metrics only prepends the timestamp), the rendered dashboard
+    and their ETags are computed here, leaving handlers with no per-request
+    work beyond a lookup. The lateral trace is the largest payload and is
+    also kept gzip-compressed.
+    """
+    state.qn = qn
+    state.diagonal_json = orjson.dumps(_diagonal_response(qn))
+    state.dependency_json = {
+        dep_id: orjson.dumps(_dependency_response(qn, dep_id)) for dep_id in qn.dependency_ids()
+    }
+    state.lateral_json = orjson.dumps(_lateral_response(qn))
+    state.lateral_gzip = gzip.compress(state.lateral_json, compresslevel=9, mtime=0)
+    state.metrics_static_json = orjson.dumps(build_metrics_static(qn))
+    state.metrics_cache = _metrics_cache(state.metrics_static_json)
+    state.dashboard_template = templates.get_template(DASHBOARD_TEMPLATE)
+    state.dashboard_html = render_dashboard(qn, state.dashboard_template)
+    state.etags = build_etags(state)
+
+
+def _metrics_cache(static_json: bytes) -> cache.StaleWhileRevalidate:
+    # The builder is where live system_health probes plug in; under SWR a slow
+    # probe never stalls a poll that still has a usable payload.
+    async def build() -> bytes:
+        return _metrics_body(static_json, _iso_now())
+
+    return cache.StaleWhileRevalidate(build, expire=METRICS_MAX_AGE, stale=METRICS_STALE_AGE)
+
+
+def render_dashboard(qn: QuantumNexus, template: Optional[Template] = None) -> bytes:
+    """
+    Render the dashboard page once.
+
+    The template only uses blueprint-derived values (it never touches
+    ``request``), so the HTML is identical for every request. Rendering the
+    compiled ``Template`` directly skips TemplateResponse's context merge and
+    environment lookup.
+    """
+    template = template or templates.get_template(DASHBOARD_TEMPLATE)
+    html = template.render(
+        dependency=qn.dependency("dep_A1_to_V1"),
+        diagonal_path=qn.dependency_dicts("dep_A1_to_V1"),   # A1 → H1 → O1 → V1
+    )
+    return html.encode("utf-8")
+
+
+# [iso_string, epoch_second]: the metrics timestamp has 1s resolution, so the
+# string is formatted at most once per second however often dashboards poll.
+_ts_cache = ["", 0]
+
+
+def _iso_now() -> str:
+    t = int(time.time())
+    if t != _ts_cache[1]:
+        _ts_cache[0] = datetime.fromtimestamp(t, timezone.utc).isoformat()
+        _ts_cache[1] = t
+    return _ts_cache[0]
+
+
+@lru_cache(maxsize=1024)
+def _resolve_json(qn: QuantumNexus, ref: str) -> bytes:
+    """Serialized resolver response; unknown refs raise KeyError and are not cached."""
+    return orjson.dumps(qn.to_api_response(ref))
+
+
+def _metrics_body(static_json: bytes, timestamp: str) -> bytes:
+    return b'{"timestamp":' + orjson.dumps(timestamp) + b"," + static_json[1:]
+
+
+@router.get("/api/metrics", response_model=None)
+async def api_metrics(request: Request) -> ORJSONResponse:
+    """
+    Quantum Nexus metrics endpoint.
+    
+    dependency: dep_AllFiles_L2R_to_Z1
+    domains: [memory_zones, cognitive_lenses, system_health]
+    """
+    return ORJSONResponse(await request.app.state.metrics_cache.get())
+
+
+@router.get("/api/resolve/{ref}", response_model=None)
+async def api_resolve(ref: str, request: Request) -> ORJSONResponse:
     """
     Great Greg coordinate resolver endpoint.
     
@@ -87,52 +245,47 @@ async def api_resolve(ref: str) -> Dict[str, Any]:
       - /api/resolve/Node_3.R3C4
     """
     try:
-        return QN.to_api_response(ref)
+        return ORJSONResponse(_resolve_json(request.app.state.qn, ref))
     except KeyError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
-@router.get("/api/dependency/{dep_id}")
-async def api_dependency(dep_id: str) -> Dict[str, Any]:
+@router.get("/api/dependency/{dep_id}", response_model=None)
+async def api_dependency(dep_id: str, request: Request) -> ORJSONResponse:
     """
     Get dependency configuration and traced path.
     """
-    try:
-        dep = QN.dependency(dep_id)
-        path = dep.get("path", [])
-        traced = QN.trace_path(path)
-        return {
-            "dependency": dep,
-            "traced_path": [coord.__dict__ for coord in traced],
-        }
-    except KeyError as e:
-        raise HTTPException(status_code=404, detail=str(e))
+    body = request.app.state.dependency_json.get(dep_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"Dependency not found: {dep_id}")
+    return ORJSONResponse(body)
 
 
-@router.get("/api/lattice/diagonal")
-async def api_diagonal_trace() -> Dict[str, Any]:
+@router.get("/api/lattice/diagonal", response_model=None)
+async def api_diagonal_trace(request: Request) -> ORJSONResponse:
     """
     Return the diagonal dependency path (A1 → H1 → O1 → V1).
     """
-    path = QN.diagonal_trace()
-    return {
-        "dependency_id": "dep_A1_to_V1",
-        "path": [coord.__dict__ for coord in path],
-        "description": "Prime Truth (A1) → Meta Research focal point (V1)"
-    }
+    return ORJSONResponse(request.app.state.diagonal_json)
 
 
-@router.get("/api/lattice/lateral")
-async def api_lateral_trace() -> Dict[str, Any]:
+@router.get("/api/lattice/lateral", response_model=None)
+async def api_lateral_trace(request: Request) -> ORJSONResponse:
     """
     Return the full lateral row-major path (A1 → Z1).
     """
-    path = QN.lateral_trace()
-    return {
-        "dependency_id": "dep_AllFiles_L2R_to_Z1",
-        "path": [coord.__dict__ for coord in path],
-        "description": "Origin (A1) → Terminus (Z1) row-major traversal"
-    }
+    state = request.app.state
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        return ORJSONResponse(state.lateral_gzip, headers=GZIP_HEADERS)
+    return ORJSONResponse(state.lateral_json)
+
+
+@router.get("/api/cache", response_model=None)
+async def api_cache() -> Dict[str, Any]:
+    """
+    Shared blueprint cache hit/miss counters for this worker.
+    """
+    return {"backend": "redis" if os.getenv("QNF_REDIS_URL") else "local", **cache.stats}
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
@@ -143,16 +296,4 @@ async def dashboard(request: Request) -> HTMLResponse:
     dependency: dep_A1_to_V1
     template: quantum_dashboard.html
     """
-    dep = QN.dependency("dep_A1_to_V1")
-
-    # Resolve the diagonal path cells into GreatGreg objects for display
-    diagonal = [QN.resolve_cell(cell).__dict__ for cell in dep.get("path", [])]
-
-    return templates.TemplateResponse(
-        "quantum_dashboard.html",
-        {
-            "request": request,
-            "dependency": dep,
-            "diagonal_path": diagonal,   # A1 → H1 → O1 → V1
-        },
-    )
+    return HTMLResponse(content=request.app.state.dashboard_html)
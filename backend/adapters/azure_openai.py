@@ -9,6 +9,8 @@ from azure.identity.aio import DefaultAzureCredential
 from backend.core.config import settings
 
 AIO_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+# One pooled client serves every request; keep warm TLS connections around
+AIO_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0)
 RETRIES = 2  # simple linear retry on 5xx/429
 
 @dataclass
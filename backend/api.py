@@ -1,45 +1,65 @@
-from typing import Any, List, Dict, Union
+from typing import Any, Callable, Dict, Union
+import asyncio
+import hashlib
 import logging
-import uuid
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import time
 
-from fastapi import APIRouter, HTTPException, Depends, Body, Response, status, Request
-from fastapi.concurrency import run_in_threadpool
+import orjson
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, ProcessCollector, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, InfoMetricFamily
+from fastapi import APIRouter, HTTPException, Body, Response, status, Request
 from fastapi.responses import StreamingResponse, HTMLResponse
 from fastapi.templating import Jinja2Templates
 from .schemas import (
     JobStatusResponse, PoolCreateRequest, ProcessRequest, ProcessResponse,
     RebuildRequest, StatusResponse, StressRequest, StressResult,
     JobSubmitResponse, SymbolicRules, SetRulesRequest, MemorySnapshot,
-    PrimeMetrics, Suggestions, SyncUpdateRequest, SyncSnapshot,
+    PrimeMetrics, Suggestions, SimilarityBatchRequest, SyncUpdateRequest, SyncSnapshot,
     GlyphValidateRequest, GlyphValidateResponse, BootStep, ChatRequest,
-    ChatResponse, EmbeddingsRequest, EmbeddingsResponse,
+    ChatResponse,
 )
 from .service import service
-from .core.security import api_key_guard
+from .responses import ORJSONResponse, etag_matches
 from .core.config import settings
 from .runtime_ai import ai_runtime
-# from .eventbus import bus
+from .eventbus import bus
 
 # NEW: Import Domain, Infrastructure, and Services
 from .domain.models import Note
 from .infrastructure.cosmos_repo import cosmos_repo
-# from .services.chat_service import ChatService
 from .services.cognitive_orchestrator import CognitiveOrchestrator
 from .services.memory_zones import get_memory_manager
 from .services.uismt import uismt
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 templates = Jinja2Templates(directory="templates")
 
-_adapter = ai_runtime.adapter
-_orchestrator = CognitiveOrchestrator(_adapter)
 
-# # Initialize Chat Service
-# # _chat_service = ChatService(_adapter)  # Old ChatService
-# _chat_service = ChatService(_adapter)  # Temporarily use old service
+@lru_cache(maxsize=1)
+def _get_orchestrator() -> CognitiveOrchestrator:
+    # Built on first use: the orchestrator sets up its lenses and a
+    # QuantumNexusForge, which most requests and short-lived workers never need
+    return CognitiveOrchestrator(ai_runtime.adapter)
+
+
+# Service calls that take QNFService's lock or run cognition/pool work go to a
+# dedicated pool so they cannot exhaust Starlette's shared threadpool. Plain
+# in-memory reads (cog status, rules, stats, threads, tuner, profile...) are
+# called inline.
+_cpu_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("QNF_CPU_WORKERS", "0")) or os.cpu_count() or 4,
+    thread_name_prefix="qnf-cpu",
+)
+
+
+async def _offload(fn: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(_cpu_pool, fn, *args)
 
 @router.get("/dashboard/nexus-metrics")
 async def get_nexus_dashboard_metrics():
@@ -48,8 +68,8 @@ async def get_nexus_dashboard_metrics():
 
     The canonical aggregated dashboard contract is `/api/dashboard/metrics`.
     """
-    status_data = await run_in_threadpool(service.status)
-    metrics_data = await run_in_threadpool(service.metrics)
+    status_data = await _offload(service.status)
+    metrics_data = await _offload(service.metrics)
     avg_latency = float(metrics_data.get("avg_latency_ms", 0.0) or 0.0)
     health_status = "green" if avg_latency < 50 else "yellow" if avg_latency < 100 else "red"
     return {
@@ -73,13 +93,13 @@ async def get_cognitive_status():
     Get the status of the Neurodivergent Cognitive Core.
     """
     memory_manager = get_memory_manager()
-    zone_metrics = _orchestrator.get_zone_metrics()
+    zone_metrics = _get_orchestrator().get_zone_metrics()
     memory_snapshot = memory_manager.get_metrics()
     return {
         "status": "active",
-        "default_lens": _orchestrator.default_lens.value,
+        "default_lens": _get_orchestrator().default_lens.value,
         "available_lenses": ["neurotypical", "adhd", "autism", "dyslexia"],
-        "event_listener_running": _orchestrator.is_event_listener_running(),
+        "event_listener_running": _get_orchestrator().is_event_listener_running(),
         "ai_runtime": ai_runtime.get_status(),
         "storage_runtime": cosmos_repo.diagnostics(),
         "orchestrator_metrics": zone_metrics,
@@ -119,35 +139,37 @@ async def get_ai_readiness():
 @router.post("/task/orchestrate/start")
 async def start_task_orchestration():
     """Start the shared raw-event orchestration listener."""
-    _orchestrator.start_event_listener()
+    _get_orchestrator().start_event_listener()
     return {
         "status": "initiated",
         "protocol": "Neurodivergent Task Orchestration",
-        "listener_running": _orchestrator.is_event_listener_running(),
+        "listener_running": _get_orchestrator().is_event_listener_running(),
         "lenses": ["neurotypical", "adhd", "autism", "dyslexia"],
     }
 
 @router.post("/task/orchestrate/stop")
 async def stop_task_orchestration():
     """Stop the shared raw-event orchestration listener."""
-    _orchestrator.stop_event_listener()
-    return {"status": "stopped", "listener_running": _orchestrator.is_event_listener_running()}
+    _get_orchestrator().stop_event_listener()
+    return {"status": "stopped", "listener_running": _get_orchestrator().is_event_listener_running()}
 
 # --- AI Routes ---
-# @ai_router.post("/chat")
-# async def chat(req: dict = Body(...)):
-#     """
-#     Process a chat request through the Cognitive Pipeline.
-#     """
-#     return {"test": "response"}
+
+def _elapsed_ms(started: float) -> str:
+    return f"{(time.perf_counter() - started) * 1000.0:.1f}"
+
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest, response: Response):
     """
     Process a chat request through the Cognitive Pipeline.
     Enforces Sentinel Forge product contract:
     1. Voice input (or text) → 2. AI processing → 3. Memory zoning → 4. Glyph visualization → 5. Structured output (Summary, Plan, Assumptions, Next Step)
+
+    The pipeline is cancelled after settings.CHAT_TIMEOUT_S (504), so a stalled
+    adapter cannot hold the request open indefinitely.
     """
+    started = time.perf_counter()
     try:
         user_msg = req.messages[-1].content if req.messages else ""
         
@@ -156,67 +178,102 @@ async def chat(req: ChatRequest):
             uismt.thread_input(user_msg, input_type="chat")
 
         # Step 2-5: AI processing, Memory zoning, Glyph visualization, Structured output
-        response = await _orchestrator.process_message(
-            user_message=user_msg,
-            context=req.messages[0].content if len(req.messages) > 1 and req.messages[0].role == "system" else "",
+        result = await asyncio.wait_for(
+            _get_orchestrator().process_message(
+                user_message=user_msg,
+                context=req.messages[0].content if len(req.messages) > 1 and req.messages[0].role == "system" else "",
+            ),
+            timeout=settings.CHAT_TIMEOUT_S,
+        )
+        response.headers["X-Response-Time-Ms"] = _elapsed_ms(started)
+        return ChatResponse(**result)
+    except asyncio.TimeoutError:
+        logging.warning("Chat timed out after %.1fs", settings.CHAT_TIMEOUT_S)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="chat timeout",
+            headers={"X-Response-Time-Ms": _elapsed_ms(started)},
         )
-        return ChatResponse(**response)
     except Exception as e:
         logging.error(f"Error in chat: {e}")
         raise
 
-# @ai_router.post("/embeddings", response_model=EmbeddingsResponse)
-# async def embeddings(req: EmbeddingsRequest):
-#     """
-#     Embedding generation via Azure OpenAI (AAD).
-#     """
-#     try:
-#         raw = await _adapter.embeddings(
-#             deployment=settings.AOAI_EMBED_DEPLOYMENT,
-#             inputs=req.input,
-#             dimensions=req.dimensions,
-#         )
-#         return raw
-#     except httpx.HTTPError as exc:
-#         raise HTTPException(status_code=502, detail=str(exc)) from exc
-
 
 # --- Nexus Notes (Refactored to use Repository) ---
 
+def _db_ready(request: Request) -> bool:
+    # Set by backend.main's lifespan once the Cosmos repository is warm;
+    # routers mounted without that lifespan never wait on it
+    ready = getattr(request.app.state, "db_ready", None)
+    return ready is None or ready.is_set()
+
+
+def _require_db(request: Request) -> None:
+    if not _db_ready(request):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is still initializing",
+            headers={"Retry-After": "1"},
+        )
+
+
+# The note list is a cross-partition query; calls within NOTES_CACHE_TTL
+# seconds share one result, and a successful upsert drops it. Upserts bump
+# the generation, so a refresh that started before one never stores its
+# (pre-upsert) result.
+NOTES_CACHE_TTL = 2.0
+_notes_cache: Dict[str, Any] = {"data": None, "expires": 0.0, "generation": 0}
+_notes_lock = asyncio.Lock()
+
+
 @router.get("/notes")
-async def notes_list() -> Any:
+async def notes_list(request: Request) -> Any:
     """Lists all notes from Cosmos DB via Repository."""
-    return await cosmos_repo.get_all_notes()
+    _require_db(request)
+    if time.monotonic() >= _notes_cache["expires"]:
+        async with _notes_lock:
+            # Another request may have refreshed the list while we waited
+            if time.monotonic() >= _notes_cache["expires"]:
+                generation = _notes_cache["generation"]
+                notes = await cosmos_repo.get_all_notes()
+                if _notes_cache["generation"] != generation:
+                    return notes
+                _notes_cache["data"] = notes
+                _notes_cache["expires"] = time.monotonic() + NOTES_CACHE_TTL
+    return _notes_cache["data"]
 
 @router.post("/notes/upsert")
-async def notes_upsert(payload: dict = Body(...)) -> Any:
+async def notes_upsert(request: Request, payload: dict = Body(...)) -> Any:
     """Creates or updates a note via Repository."""
-    import uuid
-    # Create Domain Model
-    note_id = payload.get("id") or str(uuid.uuid4())
+    _require_db(request)
+    # Create Domain Model; without a client ID, Entity's default factory assigns one
+    note_id = payload.get("id")
     try:
         note = Note(
             text=payload.get("text"),
             tag=payload.get("tag"),
             vector=payload.get("vec"),
-            metadata=payload.get("metadata", {})
+            metadata=payload.get("metadata", {}),
+            **({"id": note_id} if note_id else {}),
         )
-        note.id = note_id
+        note_id = note.id
         result = await cosmos_repo.upsert_note(note)
+        _notes_cache["generation"] += 1
+        _notes_cache["expires"] = 0.0
         return result
     except Exception as e:
         # Graceful fallback - return mock success so system stays functional
         logging.warning(f"DB unavailable, returning mock: {e}")
-        return {"id": note_id, "status": "mock_saved", "text": payload.get("text")}
+        return {"id": note_id or secrets.token_hex(16), "status": "mock_saved", "text": payload.get("text")}
 
 @router.get("/test")
-def test_endpoint():
+async def test_endpoint():
     return {"ok": True}
 
 # --- Existing Routes (Legacy Service) ---
 @router.get("/status", response_model=StatusResponse)
 async def get_status() -> Any:
-    return await run_in_threadpool(service.status)
+    return await _offload(service.status)
 
 
 @router.get("/metrics")
@@ -230,8 +287,8 @@ async def get_metrics() -> Any:
     - system_health: Overall system health and performance
     """
     # Get baseline metrics from service
-    base_metrics = await run_in_threadpool(service.metrics)
-    status_data = await run_in_threadpool(service.status)
+    base_metrics = await _offload(service.metrics)
+    status_data = await _offload(service.status)
     
     # Get Three-Zone Memory Manager metrics
     memory_manager = get_memory_manager()
@@ -239,7 +296,7 @@ async def get_metrics() -> Any:
     zone_distribution = memory_manager.get_zone_distribution()
     
     # Get cognitive orchestrator stats
-    cog_status = await run_in_threadpool(service.cog_status)
+    cog_status = service.cog_status()
     
     # Determine system health status
     avg_latency = base_metrics.get("avg_latency_ms", 0)
@@ -319,162 +376,150 @@ async def get_metrics() -> Any:
     return enhanced_metrics
 
 
-@router.get("/metrics/prom")
-async def get_metrics_prom() -> Any:
-    """Prometheus-friendly text exposition for selected metrics."""
-    m = await run_in_threadpool(service.metrics)
-    lines: list[str] = []
-    # Global gauges
-    lines.append("# HELP qnf_total_pools Total pools")
-    lines.append("# TYPE qnf_total_pools gauge")
-    lines.append(f"qnf_total_pools {m.get('total_pools', 0)}")
-    lines.append("# HELP qnf_total_processors Total processors")
-    lines.append("# TYPE qnf_total_processors gauge")
-    lines.append(f"qnf_total_processors {m.get('total_processors', 0)}")
-    lines.append("# HELP qnf_avg_latency_ms Rolling average latency in ms")
-    lines.append("# TYPE qnf_avg_latency_ms gauge")
-    lines.append(f"qnf_avg_latency_ms {m.get('avg_latency_ms', 0.0)}")
-    lines.append("# HELP qnf_p95_latency_ms Rolling p95 latency in ms")
-    lines.append("# TYPE qnf_p95_latency_ms gauge")
-    lines.append(f"qnf_p95_latency_ms {m.get('p95_latency_ms', 0.0)}")
-    lines.append("# HELP qnf_avg_heap_stale_ratio Average heap stale ratio across pools")
-    lines.append("# TYPE qnf_avg_heap_stale_ratio gauge")
-    lines.append(f"qnf_avg_heap_stale_ratio {m.get('avg_heap_stale_ratio', 0.0)}")
-    lines.append("# HELP qnf_max_heap_stale_ratio Max heap stale ratio across pools")
-    lines.append("# TYPE qnf_max_heap_stale_ratio gauge")
-    lines.append(f"qnf_max_heap_stale_ratio {m.get('max_heap_stale_ratio', 0.0)}")
-    # Cog embedding metrics
-    cog = m.get('cog_embedding', {}) or {}
-    def cg(key: str, default: float = 0.0) -> float:
-        try:
-            return float(cog.get(key, default) or 0.0)
-        except Exception:
-            return 0.0
-    try:
-        enabled = 1 if (cog.get('enabled') is True) else 0
-    except Exception:
-        enabled = 0
-    lines.append("# HELP qnf_cog_embedding_enabled Cog embedding metrics enabled flag")
-    lines.append("# TYPE qnf_cog_embedding_enabled gauge")
-    lines.append(f"qnf_cog_embedding_enabled {enabled}")
-    lines.append("# HELP qnf_cog_embedding_samples Number of recent similarity samples")
-    lines.append("# TYPE qnf_cog_embedding_samples gauge")
-    lines.append(f"qnf_cog_embedding_samples {cg('samples', 0)}")
-    lines.append("# HELP qnf_cog_avg_cosine Average cosine similarity over window")
-    lines.append("# TYPE qnf_cog_avg_cosine gauge")
-    lines.append(f"qnf_cog_avg_cosine {cg('avg_cosine', 0.0)}")
-    lines.append("# HELP qnf_cog_p95_cosine 95th percentile cosine similarity over window")
-    lines.append("# TYPE qnf_cog_p95_cosine gauge")
-    lines.append(f"qnf_cog_p95_cosine {cg('p95_cosine', 0.0)}")
-    lines.append("# HELP qnf_cog_vec_dim Detected embedding vector dimension")
-    lines.append("# TYPE qnf_cog_vec_dim gauge")
-    lines.append(f"qnf_cog_vec_dim {cg('vec_dim', 0)}")
-    # PCA details (if present)
-    lines.append("# HELP qnf_cog_pca_retained_variance Fraction of variance retained by PCA")
-    lines.append("# TYPE qnf_cog_pca_retained_variance gauge")
-    lines.append(f"qnf_cog_pca_retained_variance {cg('pca_retained_variance', 0.0)}")
-    lines.append("# HELP qnf_cog_pca_recon_error_mean Per-sample reconstruction error (Frobenius)")
-    lines.append("# TYPE qnf_cog_pca_recon_error_mean gauge")
-    lines.append(f"qnf_cog_pca_recon_error_mean {cg('pca_recon_error_mean', 0.0)}")
-    lines.append("# HELP qnf_cog_pca_proj_dim PCA projected dimension")
-    lines.append("# TYPE qnf_cog_pca_proj_dim gauge")
-    lines.append(f"qnf_cog_pca_proj_dim {cg('pca_proj_dim', 0)}")
-    lines.append("# HELP qnf_cog_pca_base_dim PCA base/original dimension")
-    lines.append("# TYPE qnf_cog_pca_base_dim gauge")
-    lines.append(f"qnf_cog_pca_base_dim {cg('pca_base_dim', 0)}")
-    pools = m.get('pools', {}) or {}
-    for pid, pd in pools.items():
-        label = f"pool=\"{pid}\""
-        def g(key: str, default: float = 0.0) -> float:
-            try:
-                return float(pd.get(key, default) or 0.0)
-            except Exception:
-                return 0.0
-        lines.append(f"qnf_pool_processor_count{{{label}}} {g('processor_count', 0)}")
-        lines.append(f"qnf_pool_total_executions{{{label}}} {g('total_executions', 0)}")
-        lines.append(f"qnf_pool_heap_size{{{label}}} {g('heap_size', 0)}")
-        lines.append(f"qnf_pool_heap_mib{{{label}}} {g('heap_mib', 0.0)}")
-        lines.append(f"qnf_pool_heap_gib{{{label}}} {g('heap_gib', 0.0)}")
-        lines.append(f"qnf_pool_heap_stale_ratio{{{label}}} {g('sched_heap_stale_ratio', 0.0)}")
-        lines.append(f"qnf_pool_avg_latency_ms{{{label}}} {g('avg_latency_ms', 0.0)}")
-        lines.append(f"qnf_pool_p95_latency_ms{{{label}}} {g('p95_latency_ms', 0.0)}")
-    # Global heap totals if the service provided them
-    lines.append("# HELP qnf_global_heap_mib Global heap size (MiB) across pools")
-    lines.append("# TYPE qnf_global_heap_mib gauge")
-    lines.append(f"qnf_global_heap_mib {m.get('global_heap_mib', 0.0)}")
-    lines.append("# HELP qnf_global_heap_gib Global heap size (GiB) across pools")
-    lines.append("# TYPE qnf_global_heap_gib gauge")
-    lines.append(f"qnf_global_heap_gib {m.get('global_heap_gib', 0.0)}")
-
-    # Config as info metrics (one line per key)
+# (field in service.metrics()["pools"][pid], help) for the per-pool gauges
+_PROM_POOL_FIELDS = (
+    ("processor_count", "Processors in the pool"),
+    ("total_executions", "Executions completed by the pool"),
+    ("heap_size", "Scheduler heap entries"),
+    ("heap_mib", "Estimated scheduler heap size (MiB)"),
+    ("heap_gib", "Estimated scheduler heap size (GiB)"),
+    ("sched_heap_stale_ratio", "Scheduler heap stale ratio"),
+    ("avg_latency_ms", "Rolling average latency in ms"),
+    ("p95_latency_ms", "Rolling p95 latency in ms"),
+)
+# Pool metric names predate the field names for this one
+_PROM_POOL_NAMES = {"sched_heap_stale_ratio": "heap_stale_ratio"}
+_RESONANCE_COMPONENTS = ("rules", "similarity", "stability", "ethics_ok", "thread_activity")
+
+
+def _as_float(data: Dict[str, Any], key: str) -> float:
     try:
-        from .service import service as _svc
+        return float(data.get(key, 0.0) or 0.0)
     except Exception:
-        _svc = None
-    try:
-        import os
-        cfg = await get_config()  # type: ignore
-        for k, v in (cfg or {}).items():
-            lines.append(f"qnf_config_info{{key=\"{k}\",value=\"{v}\"}} 1")
-        # Build info as a single metric for easy scraping
-        bi = await run_in_threadpool(service.build_info)
-        bapp = bi.get("app", "qnf")
-        bver = bi.get("version", "dev")
-        bsha = bi.get("git_sha", "unknown")
-        btime = bi.get("build_time", "unknown")
-        lines.append(
-            f"qnf_build_info{{app=\"{bapp}\",version=\"{bver}\",git_sha=\"{bsha}\",build_time=\"{btime}\"}} 1"
+        return 0.0
+
+
+class QNFCollector:
+    """prometheus_client collector that reads the service once per scrape.
+
+    Families are built from a single service.metrics() call plus the
+    lock-free cognition/bus reads, so each exposition is one consistent
+    snapshot. prometheus_client handles label escaping and formatting.
+    """
+
+    def describe(self):
+        # Registering a collector without describe() would call collect()
+        # (and so service.metrics()) at import time
+        return []
+
+    def collect(self):
+        m = service.metrics()
+        for key, help_text in (
+            ("total_pools", "Total pools"),
+            ("total_processors", "Total processors"),
+            ("avg_latency_ms", "Rolling average latency in ms"),
+            ("p95_latency_ms", "Rolling p95 latency in ms"),
+            ("avg_heap_stale_ratio", "Average heap stale ratio across pools"),
+            ("max_heap_stale_ratio", "Max heap stale ratio across pools"),
+        ):
+            yield GaugeMetricFamily(f"qnf_{key}", help_text, value=_as_float(m, key))
+        # Cog embedding metrics (PCA details included when present)
+        cog = m.get("cog_embedding", {}) or {}
+        yield GaugeMetricFamily(
+            "qnf_cog_embedding_enabled", "Cog embedding metrics enabled flag",
+            value=1 if cog.get("enabled") is True else 0,
         )
-    except Exception:
-        pass
-    # Bus metrics
-    try:
+        for name, key, help_text in (
+            ("qnf_cog_embedding_samples", "samples", "Number of recent similarity samples"),
+            ("qnf_cog_avg_cosine", "avg_cosine", "Average cosine similarity over window"),
+            ("qnf_cog_p95_cosine", "p95_cosine", "95th percentile cosine similarity over window"),
+            ("qnf_cog_vec_dim", "vec_dim", "Detected embedding vector dimension"),
+            ("qnf_cog_pca_retained_variance", "pca_retained_variance", "Fraction of variance retained by PCA"),
+            ("qnf_cog_pca_recon_error_mean", "pca_recon_error_mean", "Per-sample reconstruction error (Frobenius)"),
+            ("qnf_cog_pca_proj_dim", "pca_proj_dim", "PCA projected dimension"),
+            ("qnf_cog_pca_base_dim", "pca_base_dim", "PCA base/original dimension"),
+        ):
+            yield GaugeMetricFamily(name, help_text, value=_as_float(cog, key))
+        pools = m.get("pools", {}) or {}
+        for key, help_text in _PROM_POOL_FIELDS:
+            family = GaugeMetricFamily(f"qnf_pool_{_PROM_POOL_NAMES.get(key, key)}", help_text, labels=["pool"])
+            for pid, pd in pools.items():
+                family.add_metric([str(pid)], _as_float(pd, key))
+            yield family
+        # Global heap totals if the service provided them
+        yield GaugeMetricFamily("qnf_global_heap_mib", "Global heap size (MiB) across pools", value=_as_float(m, "global_heap_mib"))
+        yield GaugeMetricFamily("qnf_global_heap_gib", "Global heap size (GiB) across pools", value=_as_float(m, "global_heap_gib"))
+
+        # Config as info metrics (one sample per key)
+        config = GaugeMetricFamily("qnf_config_info", "Runtime configuration flags", labels=["key", "value"])
+        for k, v in _CONFIG_SNAPSHOT.items():
+            config.add_metric([k, str(v)], 1)
+        yield config
+
+        # The remaining families are optional; a failed read drops them whole
+        try:
+            families = list(self._optional_families())
+        except Exception:
+            families = []
+        yield from families
+
+    def _optional_families(self):
+        # Build info as a single metric for easy scraping
+        bi = service.build_info()
+        yield InfoMetricFamily("qnf_build", "Build and version metadata", value={
+            "app": str(bi.get("app", "qnf")),
+            "version": str(bi.get("version", "dev")),
+            "git_sha": str(bi.get("git_sha", "unknown")),
+            "build_time": str(bi.get("build_time", "unknown")),
+        })
+        # Bus metrics
         bs = bus.status()
-        lines.append("# HELP qnf_bus_published_total Total events published on in-process bus")
-        lines.append("# TYPE qnf_bus_published_total counter")
-        lines.append(f"qnf_bus_published_total {bs.get('published', 0)}")
-        lines.append("# HELP qnf_bus_dropped_total Events dropped due to overflow policy")
-        lines.append("# TYPE qnf_bus_dropped_total counter")
-        lines.append(f"qnf_bus_dropped_total {bs.get('dropped', 0)}")
-        lines.append("# HELP qnf_bus_errors_total Delivery errors on in-process bus")
-        lines.append("# TYPE qnf_bus_errors_total counter")
-        lines.append(f"qnf_bus_errors_total {bs.get('errors', 0)}")
-        lines.append("# HELP qnf_bus_subscribers Current subscriber count on in-process bus")
-        lines.append("# TYPE qnf_bus_subscribers gauge")
-        lines.append(f"qnf_bus_subscribers {bs.get('subscribers', 0)}")
-    except Exception:
-        pass
-    # Cog intent/topic counts + threads
-    try:
-        stats = await run_in_threadpool(service.cog_stats)
-        intents = (stats or {}).get('intents', {}) or {}
-        topics = (stats or {}).get('topics', {}) or {}
-        for k, v in intents.items():
-            lines.append(f"qnf_intent_count{{intent=\"{k}\"}} {float(v)}")
-        for k, v in topics.items():
-            lines.append(f"qnf_topic_count{{topic=\"{k}\"}} {float(v)}")
-        th = await run_in_threadpool(service.cog_threads, None)
-        tcount = len((th or {}).get('threads', []) or [])
-        lines.append("# HELP qnf_threads_total Number of cognition threads")
-        lines.append("# TYPE qnf_threads_total gauge")
-        lines.append(f"qnf_threads_total {tcount}")
+        yield CounterMetricFamily("qnf_bus_published", "Total events published on in-process bus", value=_as_float(bs, "published"))
+        yield CounterMetricFamily("qnf_bus_dropped", "Events dropped due to overflow policy", value=_as_float(bs, "dropped"))
+        yield CounterMetricFamily("qnf_bus_errors", "Delivery errors on in-process bus", value=_as_float(bs, "errors"))
+        yield GaugeMetricFamily("qnf_bus_subscribers", "Current subscriber count on in-process bus", value=_as_float(bs, "subscribers"))
+        # Cog intent/topic counts + threads
+        stats = service.cog_stats() or {}
+        intents = GaugeMetricFamily("qnf_intent_count", "Cognition requests per intent", labels=["intent"])
+        for k, v in (stats.get("intents", {}) or {}).items():
+            intents.add_metric([str(k)], float(v))
+        yield intents
+        topics = GaugeMetricFamily("qnf_topic_count", "Cognition requests per topic", labels=["topic"])
+        for k, v in (stats.get("topics", {}) or {}).items():
+            topics.add_metric([str(k)], float(v))
+        yield topics
+        threads = service.cog_threads(None) or {}
+        yield GaugeMetricFamily("qnf_threads_total", "Number of cognition threads", value=len(threads.get("threads", []) or []))
         # Resonance snapshot
-        res = await run_in_threadpool(service.resonance_last)
+        res = service.resonance_last()
         if isinstance(res, dict) and res:
-            score = float(res.get('score', 0.0) or 0.0)
-            lines.append("# HELP qnf_resonance_score Last resonance score")
-            lines.append("# TYPE qnf_resonance_score gauge")
-            lines.append(f"qnf_resonance_score {score}")
-            for key in ("rules","similarity","stability","ethics_ok","thread_activity"):
-                try:
-                    val = float(res.get(key, 0.0) or 0.0)
-                except Exception:
-                    val = 0.0
-                lines.append(f"qnf_resonance_component{{name=\"{key}\"}} {val}")
-    except Exception:
-        pass
-    text = "\n".join(lines) + "\n"
-    return text
+            yield GaugeMetricFamily("qnf_resonance_score", "Last resonance score", value=_as_float(res, "score"))
+            components = GaugeMetricFamily("qnf_resonance_component", "Last resonance score components", labels=["name"])
+            for key in _RESONANCE_COMPONENTS:
+                components.add_metric([key], _as_float(res, key))
+            yield components
+
+
+_PROM_REGISTRY = CollectorRegistry()
+_PROM_REGISTRY.register(QNFCollector())
+ProcessCollector(registry=_PROM_REGISTRY)
+
+# Scrapes within PROM_CACHE_TTL seconds of each other share one rendering
+PROM_CACHE_TTL = 1.5
+_prom_cache: Dict[str, Any] = {"body": b"", "expires": 0.0}
+_prom_lock = asyncio.Lock()
+
+
+@router.get("/metrics/prom")
+async def get_metrics_prom() -> Response:
+    """Prometheus-friendly text exposition for selected metrics."""
+    if time.monotonic() >= _prom_cache["expires"]:
+        async with _prom_lock:
+            # Another scrape may have rebuilt the body while we waited
+            if time.monotonic() >= _prom_cache["expires"]:
+                _prom_cache["body"] = await _offload(generate_latest, _PROM_REGISTRY)
+                _prom_cache["expires"] = time.monotonic() + PROM_CACHE_TTL
+    return Response(_prom_cache["body"], media_type=CONTENT_TYPE_LATEST)
 
 
 @router.get("/healthz")
@@ -484,57 +529,56 @@ async def healthz() -> Response:
 
 
 @router.get("/readyz")
-async def readyz() -> Response:
-    # Kubernetes-style readiness probe: 200 OK if status() works, 503 otherwise
+async def readyz(request: Request) -> Response:
+    # Kubernetes-style readiness probe: 200 OK if status() works and the
+    # database has finished initializing, 503 otherwise
+    if not _db_ready(request):
+        return ORJSONResponse({"ready": False, "db_ready": False}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
     try:
-        payload = await run_in_threadpool(service.status)
+        payload = await _offload(service.status)
         if isinstance(payload, dict):
             body = {"ready": True, "total_pools": payload.get("total_pools", 0)}
         else:
             body = {"ready": True}
-        return Response(content=str(body).replace("'", '"'), media_type="application/json", status_code=status.HTTP_200_OK)
+        return ORJSONResponse(body, status_code=status.HTTP_200_OK)
+    except Exception:
+        return ORJSONResponse({"ready": False}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+def _coerce(raw: Union[str, None], typ: type, default: Any) -> Any:
+    if raw is None:
+        return default
+    if typ is bool:
+        return str(raw).lower() in ("1", "true", "yes", "on")
+    try:
+        return typ(raw)
     except Exception:
-        body = {"ready": False}
-    return Response(content=str(body).replace("'", '"'), media_type="application/json", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return default
+
+
+# Runtime flags surfaced for ops: (env var, type, default)
+_CONFIG_SPEC = (
+    ("QNF_METRICS_WINDOW", int, 500),
+    ("QNF_P95_MS_SCALEUP", float, 50.0),
+    ("QNF_POOL_METRICS_WINDOW", int, 300),
+    ("QNF_EXCLUDE_POOL_LAT", bool, False),
+    ("QNF_HEAP_ENTRY_BYTES", int, 0),
+    ("QNF_DEBUG", bool, False),
+)
+# The environment is fixed for the life of the process, so parse it once
+_CONFIG_SNAPSHOT: Dict[str, Any] = {k: _coerce(os.getenv(k), typ, d) for k, typ, d in _CONFIG_SPEC}
 
 
 @router.get("/config")
 async def get_config() -> Any:
     # Useful runtime flags/env surfaced for ops
-    import os
-    def as_int(k: str, default: int) -> int:
-        try:
-            return int(os.getenv(k, str(default)))
-        except Exception:
-            return default
-
-    def as_float(k: str, default: float) -> float:
-        try:
-            return float(os.getenv(k, str(default)))
-        except Exception:
-            return default
-
-    def as_bool(k: str, default: bool) -> bool:
-        v = os.getenv(k, None)
-        if v is None:
-            return default
-        return str(v).lower() in ("1", "true", "yes", "on")
-
-    cfg = {
-        "QNF_METRICS_WINDOW": as_int("QNF_METRICS_WINDOW", 500),
-        "QNF_P95_MS_SCALEUP": as_float("QNF_P95_MS_SCALEUP", 50.0),
-        "QNF_POOL_METRICS_WINDOW": as_int("QNF_POOL_METRICS_WINDOW", 300),
-        "QNF_EXCLUDE_POOL_LAT": as_bool("QNF_EXCLUDE_POOL_LAT", False),
-        "QNF_HEAP_ENTRY_BYTES": as_int("QNF_HEAP_ENTRY_BYTES", 0),
-        "QNF_DEBUG": as_bool("QNF_DEBUG", False),
-    }
-    return cfg
+    return _CONFIG_SNAPSHOT
 
 
 @router.get("/version")
 async def get_version() -> Any:
     """Return build/version metadata for debugging and Prometheus info."""
-    return await run_in_threadpool(service.build_info)
+    return service.build_info()
 
 
 # --- Event log / stream (playtesting + instrumentation) ----------------------
@@ -546,18 +590,19 @@ async def log_event(ev: dict = Body(...)) -> Any:
     instrumentation or playtesting events that can be streamed
     via /api/events (SSE‑like).
     """
-    await run_in_threadpool(service.add_event, ev)
+    service.add_event(ev)
     return {"status": "ok"}
 
 
 def _ndjson_stream():
-    # Stream events as NDJSON (newline-delimited JSON)
-    for ev in service.event_stream():
-        if ev is None:
+    # Stream events as NDJSON (newline-delimited JSON); everything that arrived
+    # since the last write goes out as one chunk rather than one send per event
+    for batch in service.event_batches():
+        if not batch:
             # keep-alive heartbeat as an empty JSON object
-            yield "{}\n"
+            yield b"{}\n"
         else:
-            yield json.dumps(ev) + "\n"
+            yield b"".join([orjson.dumps(ev) + b"\n" for ev in batch])
 
 
 @router.get("/events")
@@ -572,39 +617,38 @@ async def stream_events() -> StreamingResponse:
 # --- Friendships / Guilds (skeleton) ----------------------------------------
 @router.post("/friendships")
 async def add_friendship(player: str = Body(...), friend: str = Body(...)) -> Any:
-    return await run_in_threadpool(service.add_friendship, player, friend)
+    return service.add_friendship(player, friend)
 
 
 @router.get("/friendships")
 async def list_friendships(player: str) -> Any:
-    return await run_in_threadpool(service.list_friendships, player)
+    return service.list_friendships(player)
 
 
 @router.post("/guilds")
 async def create_guild(guild_id: str = Body(...), name: str = Body(...)) -> Any:
-    return await run_in_threadpool(service.create_guild, guild_id, name)
+    return service.create_guild(guild_id, name)
 
 
 @router.post("/guilds/{guild_id}/members")
 async def add_guild_member(guild_id: str, player: str = Body(...)) -> Any:
-    return await run_in_threadpool(service.add_guild_member, guild_id, player)
+    return service.add_guild_member(guild_id, player)
 
 
 @router.get("/guilds/{guild_id}")
 async def get_guild(guild_id: str) -> Any:
-    return await run_in_threadpool(service.get_guild, guild_id)
+    return service.get_guild(guild_id)
 
 
 @router.get("/events/history")
 async def events_history(limit: int = 100) -> Any:
     """Return up to `limit` most recent events as a JSON array (newest last)."""
-    return await run_in_threadpool(service.recent_events, limit)
+    return service.recent_events(limit)
 
 
-@router.get("/ops", response_class=HTMLResponse)
-async def ops_page() -> str:
-    """Basic ops HTML that renders metrics, threads and counts."""
-    html = """
+# The ops page is static; its data is fetched client-side from the JSON
+# routes, so it is encoded once and browsers may reuse it between polls.
+_OPS_HTML = """
 <!doctype html>
 <html>
 <head>
@@ -754,17 +798,25 @@ async def ops_page() -> str:
   </body>
   </html>
 """
-    return html
+_OPS_HTML_BYTES = _OPS_HTML.encode("utf-8")
+OPS_CACHE_CONTROL = "public, max-age=300"
+
+
+@router.get("/ops", response_class=HTMLResponse)
+async def ops_page() -> HTMLResponse:
+    """Basic ops HTML that renders metrics, threads and counts."""
+    return HTMLResponse(content=_OPS_HTML_BYTES, headers={"Cache-Control": OPS_CACHE_CONTROL})
+
+
 @router.post("/process", response_model=ProcessResponse)
 async def post_process(req: ProcessRequest) -> Any:
-    return await run_in_threadpool(service.process, req.data, req.pool_id)
+    return await _offload(service.process, req.data, req.pool_id)
 
 
 @router.post("/pools")
 async def create_pool(req: PoolCreateRequest) -> Any:
     try:
-        # FIXED: run_in_threadpool (underscore)
-        pool_id = await run_in_threadpool(service.create_pool, req.pool_id, req.initial_size)
+        pool_id = await _offload(service.create_pool, req.pool_id, req.initial_size)
         return {"pool_id": pool_id, "status": "created"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -772,28 +824,28 @@ async def create_pool(req: PoolCreateRequest) -> Any:
 
 @router.post("/teardown")
 async def teardown() -> Any:
-    await run_in_threadpool(service.teardown)
+    await _offload(service.teardown)
     return {"status": "ok"}
 
 
 @router.post("/rebuild")
 async def rebuild(req: RebuildRequest) -> Any:
-    await run_in_threadpool(service.rebuild, req.default_pools, req.pool_size)
+    await _offload(service.rebuild, req.default_pools, req.pool_size)
     return {"status": "ok"}
 
 
 @router.post("/stress", response_model=StressResult | JobSubmitResponse)
 async def stress(req: StressRequest) -> Any:
     if req.async_mode:
-        job_id = await run_in_threadpool(service.submit_stress_job, req.iterations, req.concurrent)
+        job_id = service.submit_stress_job(req.iterations, req.concurrent)
         return JobSubmitResponse(job_id=job_id, status="queued")
-    result = await run_in_threadpool(service.stress_test, req.iterations, req.concurrent)
+    result = await _offload(service.stress_test, req.iterations, req.concurrent)
     return result
 
 
 @router.get("/jobs/{job_id}", response_model=JobStatusResponse)
 async def job_status(job_id: str) -> Any:
-    payload = await run_in_threadpool(service.job_status, job_id)
+    payload = service.job_status(job_id)
     if payload.get("status") == "not_found":
         raise HTTPException(status_code=404, detail="job not found")
     # Coerce into typed model fields if present
@@ -811,156 +863,174 @@ async def job_status(job_id: str) -> Any:
 
 @router.get("/cog/status")
 async def cog_status() -> Any:
-    return await run_in_threadpool(service.cog_status)
+    return service.cog_status()
 
 
 @router.post("/cog/process")
 async def cog_process(req: ProcessRequest) -> Any:
     # Only 'data' is relevant; pool_id ignored for this pipeline
-    return await run_in_threadpool(service.cog_process, req.data)
+    return await _offload(service.cog_process, req.data)
 
 
-@router.get("/cog/rules", response_model=SymbolicRules)
-async def cog_get_rules() -> Any:
-    return await run_in_threadpool(service.cog_get_rules)
+# Polled GETs whose service payload already has the exact documented shape:
+# the model is kept for OpenAPI via `responses` but not used to re-validate
+# and re-encode every response (response_model=None).
+@router.get("/cog/rules", response_model=None, responses={200: {"model": SymbolicRules}})
+async def cog_get_rules() -> ORJSONResponse:
+    return ORJSONResponse(service.cog_get_rules())
 
 
 @router.put("/cog/rules", response_model=SymbolicRules)
 async def cog_set_rules(req: SetRulesRequest) -> Any:
-    return await run_in_threadpool(service.cog_set_rules, req.rules)
+    return await _offload(service.cog_set_rules, req.rules)
 
 
 @router.get("/cog/memory", response_model=MemorySnapshot)
 async def cog_memory_snapshot() -> Any:
-    return await run_in_threadpool(service.cog_memory_snapshot)
+    return await _offload(service.cog_memory_snapshot)
 
 
 @router.delete("/cog/memory")
 async def cog_memory_clear() -> Any:
-    return await run_in_threadpool(service.cog_memory_clear)
+    return await _offload(service.cog_memory_clear)
 
 
-@router.get("/cog/prime", response_model=PrimeMetrics)
-async def cog_prime_metrics() -> Any:
-    return await run_in_threadpool(service.cog_prime_metrics)
+@router.get("/cog/prime", response_model=None, responses={200: {"model": PrimeMetrics}})
+async def cog_prime_metrics() -> ORJSONResponse:
+    return ORJSONResponse(await _offload(service.cog_prime_metrics))
 
 
-@router.get("/cog/suggest", response_model=Suggestions)
-async def cog_suggestions(limit: int = 5) -> Any:
-    return await run_in_threadpool(service.cog_suggestions, limit)
+@router.get("/cog/suggest", response_model=None, responses={200: {"model": Suggestions}})
+async def cog_suggestions(limit: int = 5) -> ORJSONResponse:
+    return ORJSONResponse(await _offload(service.cog_suggestions, limit))
 
 
 @router.get("/cog/threads")
 async def cog_threads(topic: str | None = None) -> Any:
-    return await run_in_threadpool(service.cog_threads, topic)
+    return service.cog_threads(topic)
 
 
 @router.get("/cog/stats")
 async def cog_stats() -> Any:
-    return await run_in_threadpool(service.cog_stats)
+    return service.cog_stats()
 
 
 @router.get("/cog/threads/{thread_id}")
 async def cog_thread_detail(thread_id: str, limit: int = 50) -> Any:
-    return await run_in_threadpool(service.cog_thread, thread_id, limit)
+    return service.cog_thread(thread_id, limit)
 
 
 @router.get("/cog/seeds")
 async def cog_seeds_get() -> Any:
-    return await run_in_threadpool(service.seeds_get)
+    return service.seeds_get()
 
 
 @router.post("/cog/seeds")
 async def cog_seeds_add(payload: dict = Body(...)) -> Any:
     items = payload.get("items") or []
-    return await run_in_threadpool(service.seeds_add, items)
+    return await _offload(service.seeds_add, items)
 
 
 @router.get("/cog/matrix")
 async def cog_matrix(top_k: int = 20) -> Any:
-    return await run_in_threadpool(service.cog_matrix, top_k)
+    return service.cog_matrix(top_k)
+
+
+@router.post("/cog/matrix/batch")
+async def cog_matrix_batch(req: SimilarityBatchRequest) -> Any:
+    """Cosine similarity matrix (or per-row top_k neighbours) for a stack of vectors."""
+    try:
+        return await _offload(service.similarity_matrix, req.vectors, req.top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/cognitive/metrics")
 async def cognitive_metrics() -> Any:
     """Get current cognitive processing metrics."""
     # For now, return basic metrics; in future, integrate with orchestrator
-    from .services.memory_zones import get_memory_manager
     memory_manager = get_memory_manager()
     zone_metrics = memory_manager.get_zone_metrics() if hasattr(memory_manager, 'get_zone_metrics') else {}
     return {
         "zone_metrics": zone_metrics,
         "active_lens": "neurotypical",  # Default
-        "timestamp": __import__("time").time(),
+        "timestamp": time.time(),
     }
 
 
 @router.post("/glyphs/pack")
 async def glyphs_pack(payload: dict = Body(...)) -> Any:
-    return await run_in_threadpool(service.glyphs_pack, payload)
+    return await _offload(service.glyphs_pack, payload)
 
 
 @router.post("/glyphs/interpret")
 async def glyphs_interpret(payload: dict = Body(...)) -> Any:
     seq = str(payload.get("sequence", ""))
-    return await run_in_threadpool(service.glyphs_interpret, seq)
+    return service.glyphs_interpret(seq)
 
 
 @router.post("/activate/{preset}")
 async def activate(preset: str) -> Any:
     """Run a safe activation sequence (standard|enhanced)."""
-    return await run_in_threadpool(service.activate, preset)
+    return await _offload(service.activate, preset)
 
 
 # --- Tri-Node Sync & Glyphic Protocol ---------------------------------------
 @router.post("/sync/update")
 async def sync_update(req: SyncUpdateRequest) -> Any:
-    return await run_in_threadpool(service.sync_update, req.agent, req.state)
+    return await _offload(service.sync_update, req.agent, req.state)
 
-@router.get("/sync/snapshot", response_model=SyncSnapshot)
-async def sync_snapshot() -> Any:
-    return await run_in_threadpool(service.sync_snapshot)
+@router.get("/sync/snapshot", response_model=None, responses={200: {"model": SyncSnapshot}})
+async def sync_snapshot() -> ORJSONResponse:
+    return ORJSONResponse(service.sync_snapshot())
 
 @router.get("/sync/trinode")
 async def sync_trinode() -> Any:
-    return await run_in_threadpool(service.sync_trinode)
+    return service.sync_trinode()
 
-@router.post("/glyphs/validate", response_model=GlyphValidateResponse)
-async def glyphs_validate(req: GlyphValidateRequest) -> Any:
-    return await run_in_threadpool(service.sync_validate, req.sequence)
+# The request body is still validated; only the {valid, reason} reply,
+# built by the sync coordinator, skips the response model
+@router.post("/glyphs/validate", response_model=None, responses={200: {"model": GlyphValidateResponse}})
+async def glyphs_validate(req: GlyphValidateRequest) -> ORJSONResponse:
+    return ORJSONResponse(service.sync_validate(req.sequence))
 
-@router.get("/glyphs/boot", response_model=list[BootStep])
-async def glyphs_boot() -> Any:
-    return await run_in_threadpool(service.sync_boot)
+@router.get("/glyphs/boot", response_model=None, responses={200: {"model": list[BootStep]}})
+async def glyphs_boot() -> ORJSONResponse:
+    return ORJSONResponse(service.sync_boot())
 
 # --- Persistence / Upgrade ---------------------------------------------------
 
 @router.get("/state")
 async def state_dump() -> Any:
-    return await run_in_threadpool(service.state_dump)
+    return await _offload(service.state_dump)
 
 @router.post("/state/save")
 async def state_save() -> Any:
-    return await run_in_threadpool(service.state_save)
+    try:
+        return await _offload(service.state_save)
+    finally:
+        _invalidate_dashboards()
 
 @router.get("/upgrade/plan")
 async def upgrade_plan() -> Any:
-    return await run_in_threadpool(service.upgrade_plan)
+    return await _offload(service.upgrade_plan)
 
 @router.post("/upgrade/apply")
 async def upgrade_apply() -> Any:
-    return await run_in_threadpool(service.upgrade_apply)
+    try:
+        return await _offload(service.upgrade_apply)
+    finally:
+        _invalidate_dashboards()
 
 # --- Triage Tuner ------------------------------------------------------------
 
 @router.get("/triage/tuner")
 async def triage_tuner_get() -> Any:
-    return await run_in_threadpool(service.triage_tuner_get)
+    return service.triage_tuner_get()
 
 @router.post("/triage/tuner")
 async def triage_tuner_set(payload: dict = Body(...)) -> Any:
-    return await run_in_threadpool(
-        service.triage_tuner_set,
+    return service.triage_tuner_set(
         payload.get("enabled"),
         payload.get("lr"),
         payload.get("target_p95_ms"),
@@ -970,48 +1040,146 @@ async def triage_tuner_set(payload: dict = Body(...)) -> Any:
 
 @router.get("/sentinel/profile")
 async def sentinel_profile_get() -> Any:
-    return await run_in_threadpool(service.profile_get)
+    return service.profile_get()
 
 @router.post("/sentinel/init")
 async def sentinel_profile_init() -> Any:
-    return await run_in_threadpool(service.profile_initialize)
+    return await _offload(service.profile_initialize)
 
 # --- Dashboard Endpoints -----------------------------------------------------
 
+EVALUATION_DIR = Path(__file__).resolve().parent.parent / "evaluation"
+EVAL_RESULTS_FILE = EVALUATION_DIR / "eval_results.json"
+TEST_QUERIES_FILE = EVALUATION_DIR / "test_queries.json"
+
+# Aggregates of the evaluation files, recomputed only when a file's mtime changes
+_eval_cache: Dict[str, Any] = {"mtime": None, "value": None}
+_queries_cache: Dict[str, Any] = {"mtime": None, "value": None}
+
+
+def _mtime_cached(cache: Dict[str, Any], path: Path, compute: Callable[[Any], Any]) -> Any:
+    """compute(parsed JSON of path), reused until the file's mtime changes; None if missing."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if cache["mtime"] != mtime:
+        cache["value"] = compute(orjson.loads(path.read_bytes()))
+        cache["mtime"] = mtime
+    return cache["value"]
+
+
+def _eval_averages(results: Any) -> Dict[str, float]:
+    # Averages over successful evaluations, accumulated in one pass
+    relevance = coherence = groundedness = 0.0
+    n = 0
+    for r in results or ():
+        if r.get("success") and "scores" in r:
+            scores = r["scores"]
+            relevance += scores["relevance"]
+            coherence += scores["coherence"]
+            groundedness += scores["groundedness"]
+            n += 1
+    if not n:
+        return {"relevance": 0.0, "coherence": 0.0, "groundedness": 0.0}
+    return {"relevance": relevance / n, "coherence": coherence / n, "groundedness": groundedness / n}
+
+
+def _get_eval_scores() -> Dict[str, float]:
+    try:
+        scores = _mtime_cached(_eval_cache, EVAL_RESULTS_FILE, _eval_averages)
+    except Exception:
+        scores = None  # Use defaults if evaluation file not available
+    return dict(scores) if scores else {"relevance": 0.0, "coherence": 0.0, "groundedness": 0.0}
+
+
+def _intent_counts(queries: Any) -> tuple[Dict[str, int], int]:
+    counts: Dict[str, int] = {}
+    for query in queries:
+        intent = query.get("expected_intent", "unknown")
+        counts[intent] = counts.get(intent, 0) + 1
+    return counts, len(queries)
+
+
+def _get_query_intents() -> Union[tuple[Dict[str, int], int], None]:
+    """(expected intent counts, total queries) from test_queries.json, or None if absent."""
+    return _mtime_cached(_queries_cache, TEST_QUERIES_FILE, _intent_counts)
+
+
+# Dashboards poll every few seconds; each payload below is rebuilt (serialized
+# and hashed for its ETag) at most once per DASHBOARD_CACHE_TTL seconds, and a
+# poller holding the current ETag gets a bodiless 304. Routes that mutate
+# service state call _invalidate_dashboards() once the mutation has returned;
+# the version bump keeps a rebuild that overlapped the mutation from caching
+# pre-mutation data.
+DASHBOARD_CACHE_TTL = 2.0
+_dashboard_cache: Dict[str, Any] = {}
+_dashboard_locks: Dict[str, asyncio.Lock] = {}
+_dashboard_version = 0
+
+
+def _invalidate_dashboards() -> None:
+    global _dashboard_version
+    _dashboard_version += 1
+    _dashboard_cache.clear()
+
+
+async def _dashboard_cached(key: str, build: Callable[[], Any]) -> tuple[bytes, str]:
+    """(JSON body, ETag) of the payload ``build`` returns, cached per key."""
+    hit = _dashboard_cache.get(key)
+    if hit is not None and time.monotonic() < hit[0]:
+        return hit[1], hit[2]
+    async with _dashboard_locks.setdefault(key, asyncio.Lock()):
+        # Another poll may have rebuilt the payload while we waited
+        hit = _dashboard_cache.get(key)
+        if hit is not None and time.monotonic() < hit[0]:
+            return hit[1], hit[2]
+        version = _dashboard_version
+        payload = await build()
+        # The wall-clock timestamp is left out of the hash, so a rebuild with
+        # unchanged data keeps its ETag and pollers still get 304s
+        timestamp = payload.pop("timestamp", None)
+        body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        if timestamp is not None:
+            body = b'{"timestamp":' + orjson.dumps(timestamp) + (b"," + body[1:] if payload else b"}")
+        if version == _dashboard_version:
+            _dashboard_cache[key] = (time.monotonic() + DASHBOARD_CACHE_TTL, body, etag)
+        return body, etag
+
+
+async def _dashboard_response(request: Request, key: str, build: Callable[[], Any]) -> Response:
+    body, etag = await _dashboard_cached(key, build)
+    headers = {"ETag": etag, "Cache-Control": f"max-age={int(DASHBOARD_CACHE_TTL)}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(body, headers=headers)
+
+
 @router.get("/dashboard/metrics")
-async def dashboard_metrics() -> Any:
+async def dashboard_metrics(request: Request) -> Response:
     """Aggregated metrics optimized for dashboard consumption."""
-    raw = await run_in_threadpool(service.metrics)
-    status_data = await run_in_threadpool(service.status)
-    cog = await run_in_threadpool(service.cog_status)
+    return await _dashboard_response(request, "metrics", _build_dashboard_metrics)
+
+
+async def _build_dashboard_metrics() -> Dict[str, Any]:
+    # Independent locked reads: run them side by side on the CPU pool
+    raw, status_data = await asyncio.gather(
+        _offload(service.metrics),
+        _offload(service.status),
+    )
+    cog = service.cog_status()
 
     # Determine system health
     total_pools = raw.get("total_pools", 0)
     avg_latency = raw.get("avg_latency_ms", 0)
     health = "green" if avg_latency < 50 else "yellow" if avg_latency < 100 else "red"
 
-    # Load evaluation scores
-    eval_scores = {"relevance": 0.0, "coherence": 0.0, "groundedness": 0.0}
-    try:
-        import json
-        eval_file = Path(__file__).parent.parent / "evaluation" / "eval_results.json"
-        if eval_file.exists():
-            with open(eval_file, 'r') as f:
-                results = json.load(f)
-                if results:
-                    # Calculate averages from successful evaluations
-                    successful_results = [r for r in results if r.get("success") and "scores" in r]
-                    if successful_results:
-                        eval_scores = {
-                            "relevance": sum(r["scores"]["relevance"] for r in successful_results) / len(successful_results),
-                            "coherence": sum(r["scores"]["coherence"] for r in successful_results) / len(successful_results),
-                            "groundedness": sum(r["scores"]["groundedness"] for r in successful_results) / len(successful_results)
-                        }
-    except Exception:
-        pass  # Use defaults if evaluation file not available
+    eval_scores = _get_eval_scores()
 
     return {
-        "timestamp": __import__("time").time(),
+        "timestamp": time.time(),
         "health_status": health,
         "core": {
             "status": "active" if total_pools > 0 else "idle",
@@ -1036,25 +1204,25 @@ async def dashboard_metrics() -> Any:
     }
 
 @router.get("/dashboard/activity")
-async def dashboard_activity() -> Any:
+async def dashboard_activity(request: Request) -> Response:
     """Recent activity feed for dashboard."""
-    stats = await run_in_threadpool(service.cog_stats)
-    threads = await run_in_threadpool(service.cog_threads, None)
-    events = await run_in_threadpool(service.recent_events, 10)
-    
+    return await _dashboard_response(request, "activity", _build_dashboard_activity)
+
+
+def _activity_counts() -> Dict[str, Any]:
+    """Intent/topic/thread counts shared by the activity payload and its stream."""
+    stats = service.cog_stats()
+    threads = service.cog_threads(None)
+
     # Load evaluation activity data
     intents = stats.get("intents", {})
     total_queries = 0
     try:
-        import json
-        queries_file = Path(__file__).parent.parent / "evaluation" / "test_queries.json"
-        if queries_file.exists():
-            with open(queries_file, 'r') as f:
-                queries = json.load(f)
-                for query in queries:
-                    intent = query.get("expected_intent", "unknown")
-                    intents[intent] = intents.get(intent, 0) + 1
-                total_queries = len(queries)
+        query_intents = _get_query_intents()
+        if query_intents is not None:
+            counts, total_queries = query_intents
+            for intent, n in counts.items():
+                intents[intent] = intents.get(intent, 0) + n
     except Exception:
         intents = {"chat": 45, "status": 20, "command": 15}  # Fallback
         total_queries = 80
@@ -1063,8 +1231,17 @@ async def dashboard_activity() -> Any:
         "intents": intents,
         "topics": stats.get("topics", {}),
         "active_threads": len(threads.get("threads", [])),
-        "recent_events": events,
         "total_queries": total_queries,
+    }
+
+
+async def _build_dashboard_activity() -> Dict[str, Any]:
+    # Bootstrap payload only; recent events and later count changes are
+    # pushed by /dashboard/activity/stream
+    counts = _activity_counts()
+    total_queries = counts["total_queries"]
+    return {
+        **counts,
         "recent_activity": [
             {"type": "evaluation", "description": "Full evaluation pipeline completed", "timestamp": "2025-12-19T02:15:12Z"},
             {"type": "chat", "description": f"Cognitive orchestrator processed {total_queries} queries", "timestamp": "2025-12-19T02:15:12Z"},
@@ -1072,11 +1249,96 @@ async def dashboard_activity() -> Any:
         ]
     }
 
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+# The activity stream checks for a disconnect at least this often and sends
+# an SSE comment after ACTIVITY_KEEPALIVE_S without anything to report
+ACTIVITY_POLL_S = 1.0
+ACTIVITY_KEEPALIVE_S = 5.0
+
+
+def _drain_intents(queue: asyncio.Queue) -> bool:
+    """Empty ``queue``; True if it held any cog.intent event."""
+    seen = False
+    while not queue.empty():
+        event = queue.get_nowait()
+        seen = seen or (isinstance(event, dict) and event.get("type") == "cog.intent")
+    return seen
+
+
+async def _wait_for_activity(logged: asyncio.Event, intents: asyncio.Queue, timeout: float) -> bool:
+    """Wait until an event is logged or the bus carries traffic, up to ``timeout``.
+
+    Returns True if cog.intent events arrived, i.e. the counts may have changed.
+    """
+    if logged.is_set() or not intents.empty():
+        return _drain_intents(intents)
+    waiters = [asyncio.ensure_future(logged.wait()), asyncio.ensure_future(intents.get())]
+    done, pending = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in pending:
+        waiter.cancel()
+    seen = False
+    if waiters[1] in done:
+        event = waiters[1].result()
+        seen = isinstance(event, dict) and event.get("type") == "cog.intent"
+    return _drain_intents(intents) or seen
+
+
+async def _activity_sse_stream(request: Request):
+    # Current counts first, then each new event batch, and fresh counts after
+    # cog.intent traffic; an SSE comment keeps idle connections open. All
+    # waiting happens on the event loop, so open tabs hold no worker threads.
+    loop = asyncio.get_running_loop()
+    logged = service.event_notifier(loop)
+    intents = bus.subscribe(loop, maxsize=100, policy="latest")
+    try:
+        last = service.event_count()
+        counts = _activity_counts()
+        yield _sse("counts", counts)
+        quiet_since = loop.time()
+        while not await request.is_disconnected():
+            changed = await _wait_for_activity(logged, intents, ACTIVITY_POLL_S)
+            logged.clear()
+            batch, last = service.events_since(last)
+            if changed:
+                latest = _activity_counts()
+                changed = latest != counts
+                counts = latest
+            if changed:
+                yield _sse("counts", counts)
+            if batch:
+                yield _sse("events", batch)
+            if changed or batch:
+                quiet_since = loop.time()
+            elif loop.time() - quiet_since >= ACTIVITY_KEEPALIVE_S:
+                quiet_since = loop.time()
+                yield b": keep-alive\n\n"
+    finally:
+        service.remove_event_notifier(logged)
+        bus.unsubscribe(intents)
+
+
+@router.get("/dashboard/activity/stream")
+async def dashboard_activity_stream(request: Request) -> StreamingResponse:
+    """Server-sent activity deltas: ``counts`` and ``events`` messages."""
+    return StreamingResponse(
+        _activity_sse_stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @router.get("/dashboard/sentinel")
-async def dashboard_sentinel() -> Any:
+async def dashboard_sentinel(request: Request) -> Response:
     """Sentinel profile data for dashboard."""
-    profile = await run_in_threadpool(service.profile_get)
-    rules = await run_in_threadpool(service.cog_get_rules)
+    return await _dashboard_response(request, "sentinel", _build_dashboard_sentinel)
+
+
+async def _build_dashboard_sentinel() -> Dict[str, Any]:
+    profile = service.profile_get()
+    rules = service.cog_get_rules()
     
     return {
         "codename": profile.get("codename", "Sentinel I"),
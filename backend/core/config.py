@@ -27,6 +27,8 @@ class Settings(BaseSettings):
 
     # --- Performance ---
     RATE_LIMIT_QPS: float = 10.0
+    CHAT_TIMEOUT_S: float = 30.0  # /api/chat answers 504 past this
+    THREAD_POOL_SIZE: int = 64  # anyio worker threads for sync routes; capped at min(256, 8 * CPUs)
 
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -1,18 +1,20 @@
-from typing import Optional, List, Dict, Any, Set
-from pydantic import BaseModel, Field, ConfigDict
-from uuid import UUID, uuid4
-from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List, Dict, Any, FrozenSet, Set
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime, timezone
 from enum import Enum
-import uuid
-from dataclasses import dataclass
+from functools import partial
+import secrets
+
+# Default factories bound once, so building an entity runs no lambda frames
+_now_utc = partial(datetime.now, timezone.utc)
+# 128 random bits as 32 hex chars; cheaper than formatting a uuid4
+_new_id = partial(secrets.token_hex, 16)
 
 
 class Entity(BaseModel):
     """Base class for all domain entities."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    id: str = Field(default_factory=_new_id)
+    created_at: datetime = Field(default_factory=_now_utc)
     
     # Strict mode: ignore extra fields passed during initialization
     model_config = ConfigDict(extra="ignore")
@@ -65,15 +67,30 @@ class GlyphMatch(BaseModel):
     confidence: float
     matched_seeds: List[str]
     applied_rules: Dict[str, str]
-    model_config = ConfigDict(extra="ignore")
+    # Built once per match by GlyphProcessor and only read afterwards
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+# Tag sets come from a small rule vocabulary, so equal sets are shared
+# across metadata instances; the table is capped to stay bounded.
+_TAG_SETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+_TAG_SETS_MAX = 1024
 
 
 class SymbolicMetadata(BaseModel):
     """Metadata generated from symbolic processing."""
     matched_glyphs: List[GlyphMatch]
     dominant_topic: Optional[str] = None
-    symbolic_tags: Set[str] = Field(default_factory=set)
-    model_config = ConfigDict(extra="ignore")
+    symbolic_tags: FrozenSet[str] = frozenset()
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    @field_validator("symbolic_tags")
+    @classmethod
+    def _intern_tags(cls, tags: FrozenSet[str]) -> FrozenSet[str]:
+        shared = _TAG_SETS.get(tags)
+        if shared is None and len(_TAG_SETS) < _TAG_SETS_MAX:
+            shared = _TAG_SETS.setdefault(tags, tags)
+        return shared if shared is not None else tags
 
 
 class Note(Entity):
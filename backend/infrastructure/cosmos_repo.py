@@ -16,6 +16,9 @@ class CosmosDBRepository:
     """
     _client = None
     _container_proxy = None
+    # Shared aiohttp session behind the Cosmos transport, so every query
+    # reuses pooled keep-alive connections instead of paying TCP/TLS setup
+    _session = None
 
     @classmethod
     async def initialize(cls):
@@ -32,8 +35,17 @@ class CosmosDBRepository:
             return
 
         try:
+            import aiohttp
+            from azure.core.pipeline.transport import AioHttpTransport
             from azure.cosmos.aio import CosmosClient
-            cls._client = CosmosClient(settings.COSMOS_ENDPOINT, credential=settings.COSMOS_KEY)
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+            )
+            cls._client = CosmosClient(
+                settings.COSMOS_ENDPOINT,
+                credential=settings.COSMOS_KEY,
+                transport=AioHttpTransport(session=cls._session, session_owner=False),
+            )
             database = cls._client.get_database_client(settings.COSMOS_DATABASE_NAME)
             cls._container_proxy = database.get_container_client(settings.COSMOS_CONTAINER_NAME)
             logger.info(f"✅ Cosmos DB Repository initialized: {settings.COSMOS_CONTAINER_NAME}")
@@ -45,6 +57,9 @@ class CosmosDBRepository:
     async def close(cls):
         if cls._client:
             await cls._client.close()
+        if cls._session:
+            await cls._session.close()
+            cls._session = None
 
     @classmethod
     async def upsert_note(cls, note: Note) -> Optional[Dict[str, Any]]:
@@ -1,9 +1,13 @@
 import os
 import logging
 from contextlib import asynccontextmanager
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from .api import router as api_router
+from .core.config import settings
+from .responses import ORJSONResponse
 from .ws_api import router as ws_router
 from .infrastructure.cosmos_repo import CosmosDBRepository
 from .runtime_ai import ai_runtime
@@ -20,11 +24,32 @@ if os.name == 'nt':
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("sentinel-middleware")
 
+async def _warm_db(ready: asyncio.Event) -> None:
+    # Initialize Cosmos DB Repository (will use Mock DB mode if unavailable)
+    try:
+        await CosmosDBRepository.initialize()
+        logger.info("Cosmos DB Repository initialized.")
+    except Exception:
+        logger.exception("Cosmos DB Repository initialization failed.")
+    finally:
+        # Notes routes fall back to mock storage either way; stop refusing them
+        ready.set()
+
+
+def _thread_pool_size() -> int:
+    # More threads than this just thrash on the GIL
+    return max(1, min(settings.THREAD_POOL_SIZE, 256, 8 * (os.cpu_count() or 1)))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize Cosmos DB Repository (will use Mock DB mode if unavailable)
-    await CosmosDBRepository.initialize()
-    logger.info("Cosmos DB Repository initialized.")
+    # Sync routes and run_in_threadpool share anyio's limiter (40 by default)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = _thread_pool_size()
+
+    # Cosmos metadata fetches can take seconds; accept traffic meanwhile and
+    # let /api/readyz and the notes routes report 503 until the repo is warm
+    app.state.db_ready = asyncio.Event()
+    db_warmup = asyncio.create_task(_warm_db(app.state.db_ready))
 
     ai_status = await ai_runtime.probe()
     if ai_status["verified_live_access"]:
@@ -40,20 +65,28 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup on shutdown
+    db_warmup.cancel()
     await CosmosDBRepository.close()
     await ai_runtime.aclose()
 
-app = FastAPI(title="Neurodivergent AI Middleware", lifespan=lifespan)
+# The API router already defaults to ORJSONResponse; this covers app-level routes
+app = FastAPI(title="Neurodivergent AI Middleware", default_response_class=ORJSONResponse, lifespan=lifespan)
 
-# Add CORS
+# Add CORS. Methods and headers are listed explicitly (everything the API
+# and dashboards send), and browsers may reuse a preflight for a day.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "PUT", "DELETE", "OPTIONS"),
+    allow_headers=("Content-Type", "Authorization", "X-API-Key"),
+    max_age=86400,
 )
 
+# Prometheus text and JSON lists repeat the same names on every line; level 1
+# gets most of the size win for a fraction of the CPU of the default level
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # NOTE: Old middleware for request size, rate limiting, and API key are removed.
 # New implementation uses dependency injection (`api_key_guard`) and Pydantic settings.
 
@@ -2,16 +2,32 @@ import random
 import uuid
 from typing import List, Dict, Any
 
+import numpy as np
+
+# Filled with the first 20 characters of the last user message
+_CHAT_TEMPLATES = (
+    "[MOCK] I received your data: '{0}...'. Processing complete.",
+    "[MOCK] The Sentinel system is online. Simulated response to: '{0}...'",
+    "[MOCK] Analysis: Nominal. Input '{0}...' recorded in memory lattice.",
+    "[MOCK] Shannon Prime acknowledges your query: '{0}...'",
+)
+
 class MockOpenAIAdapter:
     """
     Simulates Azure OpenAI responses for development without API keys.
     """
     def __init__(self, http_client=None, token_provider=None):
-        pass
+        # Per-adapter generators rather than the shared module-level ones
+        self._random = random.Random()
+        self._rng = np.random.default_rng()
 
     async def chat(self, deployment: str, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """Returns a simulated chat completion."""
-        last_user_msg = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "...")
+        # The last message is almost always the user's; only scan back otherwise
+        if messages and messages[-1]["role"] == "user":
+            last_user_msg = messages[-1]["content"]
+        else:
+            last_user_msg = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "...")
         
         # varied responses to make it feel alive
         if "DREAMER" in last_user_msg:
@@ -26,13 +42,7 @@ class MockOpenAIAdapter:
                 "✨ *Concept generated via Metatron's Cube lattice.*"
             )
         else:
-            responses = [
-                f"[MOCK] I received your data: '{last_user_msg[:20]}...'. Processing complete.",
-                f"[MOCK] The Sentinel system is online. Simulated response to: '{last_user_msg[:20]}...'",
-                f"[MOCK] Analysis: Nominal. Input '{last_user_msg[:20]}...' recorded in memory lattice.",
-                f"[MOCK] Shannon Prime acknowledges your query: '{last_user_msg[:20]}...'"
-            ]
-            content = random.choice(responses)
+            content = self._random.choice(_CHAT_TEMPLATES).format(last_user_msg[:20])
         
         return {
             "id": f"chatcmpl-{uuid.uuid4()}",
@@ -54,15 +64,12 @@ class MockOpenAIAdapter:
         if isinstance(inputs, str):
             inputs = [inputs]
             
-        data = []
-        for i, _ in enumerate(inputs):
-            # Generate a random normalized vector
-            vec = [random.random() for _ in range(dimensions)]
-            data.append({
-                "object": "embedding",
-                "index": i,
-                "embedding": vec
-            })
+        # One C-level fill for the whole batch instead of a Python loop per value
+        vectors = self._rng.random((len(inputs), dimensions), dtype=np.float32).tolist()
+        data = [
+            {"object": "embedding", "index": i, "embedding": vec}
+            for i, vec in enumerate(vectors)
+        ]
             
         return {
             "object": "list",
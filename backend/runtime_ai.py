@@ -7,7 +7,7 @@ from urllib.parse import urlparse
 
 import httpx
 
-from backend.adapters.azure_openai import AIO_TIMEOUT, AzureCognitiveTokenProvider, AzureOpenAIAdapter
+from backend.adapters.azure_openai import AIO_LIMITS, AIO_TIMEOUT, AzureCognitiveTokenProvider, AzureOpenAIAdapter
 from backend.core.config import settings
 from backend.mock_adapter import MockOpenAIAdapter
 
@@ -50,7 +50,7 @@ class AIRuntime:
             self._auth_detail = "AOAI_ENDPOINT is missing, so live Azure scoring is unavailable."
             return
 
-        self._http_client = httpx.AsyncClient(timeout=AIO_TIMEOUT)
+        self._http_client = httpx.AsyncClient(timeout=AIO_TIMEOUT, limits=AIO_LIMITS)
         self._selected_provider = "azure_openai"
         self._endpoint_host = urlparse(settings.AOAI_ENDPOINT).netloc
 
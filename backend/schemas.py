@@ -92,6 +92,11 @@ class Suggestions(BaseModel):
     suggestions: list[dict]
 
 
+class SimilarityBatchRequest(BaseModel):
+    vectors: conlist(List[float], min_length=1, max_length=5000)
+    top_k: Optional[int] = Field(default=None, ge=1, description="Return only each row's top_k neighbours")
+
+
 # --- Sync / Glyphic protocol ---
 
 
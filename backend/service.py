@@ -1,9 +1,18 @@
+import asyncio
+import hashlib
 import threading
 import os
+import queue
+import re
 import time
 import uuid
-from typing import Any, Dict, Optional
-from collections import deque
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Optional, Pattern, Tuple
+
+import numpy as np
 
 from quantum_nexus_forge_v5_2_enhanced import QuantumNexusForge
 from sentinel_cognition import SentinelCognitionGraph
@@ -14,43 +23,262 @@ from .eventbus import bus
 from .storage import JSONStore
 from .llm import get_llm, LLMError
 
+# Event ring capacity; a power of two so slots are picked with a mask
+EVENT_RING_SIZE = 1024
+_EVENT_RING_MASK = EVENT_RING_SIZE - 1
+
+# Entries kept per topic thread; older ones fall off the front
+THREAD_ITEMS_MAX = 200
+
+# Seconds the background writer waits after a change so bursts share one save
+PERSIST_DEBOUNCE_S = 0.5
+# Delta-log records after which the writer folds the log into a new snapshot
+COMPACT_EVERY = 500
+
+# Job table stripes; a power of two so a stripe is picked with a mask
+JOB_SHARDS = 16
+_JOB_SHARD_MASK = JOB_SHARDS - 1
+
+# Text embeddings kept by notes_upsert; the oldest entry is evicted first
+EMBED_CACHE_MAX = 4096
+
+
+def _compile_seed_phrases(seeds: Any) -> Optional[Tuple[Pattern[str], Dict[str, str]]]:
+    """
+    One alternation matching every multi-word seed as whole whitespace-
+    separated tokens, plus a map from the space-normalized match back to the
+    seed. None when every seed is a single word.
+    """
+    phrases = {" ".join(seed.split()): seed for seed in seeds if len(seed.split()) > 1}
+    if not phrases:
+        return None
+    # Longest first so a phrase wins over any phrase it starts with
+    alternation = "|".join(
+        r"\s+".join(map(re.escape, phrase.split())) for phrase in sorted(phrases, key=len, reverse=True)
+    )
+    return re.compile(rf"(?<!\S)(?:{alternation})(?!\S)"), phrases
+
+
+def _match_seeds(
+    text: str, words: frozenset, phrases: Optional[Tuple[Pattern[str], Dict[str, str]]]
+) -> frozenset:
+    """Seeds occurring in lower-cased ``text``: single words, then phrases."""
+    hits = words.intersection(text.split()) if words else frozenset()
+    if phrases is not None:
+        pattern, by_phrase = phrases
+        found = {by_phrase[" ".join(m.group().split())] for m in pattern.finditer(text)}
+        if found:
+            hits = hits | found
+    return hits
+
+
+# cog_process signatures, LRU by (blake2b(text), intent, topics). Keying on
+# a digest keeps arbitrarily large prompts out of the cache.
+SIGNATURE_CACHE_MAX = 4096
+_signature_cache: "OrderedDict[Tuple[bytes, str, Tuple[str, ...]], Tuple[int, ...]]" = OrderedDict()
+_signature_lock = threading.Lock()
+
+
+def _signature(text: str, intent: str, topics: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Memoized _glyphic_signature for cog_process; repeated prompts skip the per-char loop."""
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), intent, topics)
+    with _signature_lock:
+        sig = _signature_cache.get(key)
+        if sig is not None:
+            _signature_cache.move_to_end(key)
+            return sig
+    sig = _glyphic_signature({"text": text, "intent": intent, "topics": list(topics)})
+    with _signature_lock:
+        _signature_cache[key] = sig
+        if len(_signature_cache) > SIGNATURE_CACHE_MAX:
+            _signature_cache.popitem(last=False)
+    return sig
+
+
+def _insort_unique(items: list, value: Any) -> None:
+    """Insert ``value`` into sorted ``items`` unless it is already present."""
+    i = bisect_left(items, value)
+    if i == len(items) or items[i] != value:
+        items.insert(i, value)
+
+
+# metrics()["triage_tuner"] while the tuner is off; shared, treat as read-only
+_TUNER_DISABLED: Dict[str, Any] = {"enabled": False}
+
+# cog_process route hints by lower-cased intent; shared, treat as read-only
+_STRESS_ROUTE: Dict[str, Any] = {"action": "stress_test", "target": "local"}
+_UPGRADE_ROUTE: Dict[str, Any] = {"action": "upgrade", "target": "llm"}
+_ROUTE_TABLE: Dict[str, Dict[str, Any]] = {
+    "help": {"action": "help", "target": "local"},
+    "status": {"action": "status", "target": "local"},
+    "stress": _STRESS_ROUTE,
+    "benchmark": _STRESS_ROUTE,
+    "upgrade": _UPGRADE_ROUTE,
+    "update": _UPGRADE_ROUTE,
+}
+_DEFAULT_ROUTE: Dict[str, Any] = {"action": "process", "target": "local"}
+
+# glyphs_interpret: "->", "→" and "—" all separate nodes; names and glyphs
+# normalize to the canonical node (keys are upper-cased input)
+_GLYPH_SPLIT = re.compile(r"->|→|—")
+_GLYPH_NORM = {
+    "APEX": "APEX", "🜂": "APEX", "FIRE": "APEX",
+    "CORE": "CORE", "♾": "CORE",
+    "EMIT": "EMIT", "🚀": "EMIT",
+    "ROOT": "ROOT", "🌳": "ROOT",
+    "CUBE": "CUBE", "🧊": "CUBE",
+}
+
+
+def _matrix_dict(names: list[str], cooc: np.ndarray) -> Dict[str, Dict[str, int]]:
+    """Co-occurrence counts as {topic: {other: count}}, non-zero cells only."""
+    out: Dict[str, Dict[str, int]] = {}
+    for i, j in zip(*np.nonzero(cooc)):
+        out.setdefault(names[i], {})[names[j]] = int(cooc[i, j])
+    return out
+
+
+def _seed_boost(confidence: float, n_hits: int) -> float:
+    """Confidence after matching ``n_hits`` seeds: +0.1 each, at most +0.2."""
+    return min(1.0, confidence + min(0.2, 0.1 * n_hits))
+
+
+def _resonance(meta: Dict[str, Any], thread_len: int) -> Dict[str, float]:
+    """Resonance score and its components for one cog_process result."""
+    refs = meta.get("reflective_refs") or ()
+    similarity = float(refs[0].get("score", 0.0)) if refs and isinstance(refs[0], dict) else 0.0
+    stability = float((meta.get("shannon_prime") or {}).get("stability", 0.0) or 0.0)
+    ethics_ok = 0.0 if any((meta.get("ethics") or {}).values()) else 1.0
+    thread_activity = min(1.0, thread_len / 50.0)
+    # The "rules" component is reserved and always 0
+    score = (similarity + stability + ethics_ok + thread_activity) / 5.0
+    return {
+        "score": score,
+        "rules": 0.0,
+        "similarity": similarity,
+        "stability": stability,
+        "ethics_ok": ethics_ok,
+        "thread_activity": thread_activity,
+    }
+
 
 class QNFService:
     """Middle layer wrapping QuantumNexusForge with thread-safety and jobs."""
 
     def __init__(self) -> None:
         self._qnf = QuantumNexusForge()
-        self._lock = threading.RLock()
-        self._jobs: Dict[str, Dict[str, Any]] = {}
-        self._jobs_lock = threading.Lock()
+        # One lock per independent piece of state so handlers touching disjoint
+        # data don't serialize. None of them is held while taking another,
+        # except _cog_lock -> _seeds_lock (glyphs_pack); keep that order.
+        self._qnf_lock = threading.RLock()
+        self._friend_lock = threading.Lock()
+        self._guild_lock = threading.Lock()
+        self._threads_lock = threading.Lock()  # threads, topic routing, intent/topic counts
+        self._seeds_lock = threading.Lock()  # seeds and topic aliases
+        self._cog_lock = threading.Lock()  # read-modify-write of cognition rules
+        # Seqlock-published status: writers (under _qnf_lock) make the sequence
+        # odd, swap in a fresh status dict, then make it even again. Readers
+        # never take _qnf_lock, so scrapes don't queue behind a rebuild or a
+        # stress test. Treat the published dict as read-only.
+        self._status_seq = 0
+        self._status_snapshot: Dict[str, Any] = self._qnf.status()
+        # Env-derived settings, resolved once instead of on every scrape
+        self._build_info: Dict[str, str] = {
+            "app": os.getenv("QNF_APP", "qnf"),
+            "version": os.getenv("QNF_VERSION", "dev"),
+            "git_sha": os.getenv("QNF_GIT_SHA", "unknown"),
+            "build_time": os.getenv("QNF_BUILD_TIME", "unknown"),
+        }
+        self._pool_builds: Dict[str, Dict[str, Any]] = {}
+        # Optional conversion: estimated bytes per heap entry
+        try:
+            self._entry_bytes = int(os.getenv("QNF_HEAP_ENTRY_BYTES", "0"))
+        except Exception:
+            self._entry_bytes = 0
+        # Jobs are striped by hash(job_id): each stripe holds its job dicts,
+        # the futures of jobs still pending, and the lock guarding both, so
+        # status polls for different jobs rarely contend
+        self._job_shards: list[Tuple[Dict[str, Dict[str, Any]], Dict[str, Future], threading.Lock]] = [
+            ({}, {}, threading.Lock()) for _ in range(JOB_SHARDS)
+        ]
+        # Async stress jobs run on a small shared pool; stress_test serializes
+        # on _qnf_lock anyway, so extra workers would only queue there
+        try:
+            stress_workers = max(1, int(os.getenv("QNF_STRESS_WORKERS", "2")))
+        except Exception:
+            stress_workers = 2
+        self._stress_executor = ThreadPoolExecutor(max_workers=stress_workers, thread_name_prefix="qnf-stress")
         # --- Event Stream (playtesting / instrumentation) -------------------
-        self._event_queue: deque = deque(maxlen=1000)
-        self._event_cv = threading.Condition()
+        # Fixed ring indexed by a monotonically increasing write index.
+        # Publishers serialize on _event_pub_lock only to order slot writes;
+        # subscribers read without it. Each publish swaps in a fresh
+        # _event_wake and sets the old one, waking every waiting subscriber
+        # without anyone having to clear() a shared Event.
+        self._event_ring: list = [None] * EVENT_RING_SIZE
+        self._event_widx = 0
+        self._event_pub_lock = threading.Lock()
+        self._event_wake = threading.Event()
+        # asyncio.Events (with their loops) set on every publish, for async
+        # consumers that must not block a thread waiting; copy-on-write
+        self._event_notifiers: Tuple[Tuple[asyncio.AbstractEventLoop, asyncio.Event], ...] = ()
         # --- Simple friendships / guilds (in‑memory skeleton) --------------
-        self._friendships: Dict[str, set] = {}
+        # Friend lists and guild members are kept sorted on insert, so reads
+        # are a plain copy rather than a sort
+        self._friendships: Dict[str, list[str]] = {}
         self._guilds: Dict[str, Dict[str, Any]] = {}
         # Cognitive graph based on the provided blueprint
         self._cog = SentinelCognitionGraph()
         # Persistence
         self._store = JSONStore()
-        self._load_state_if_present()
+        # In-memory state is authoritative and a daemon thread persists it.
+        # cog_process queues one numbered delta per message, which the writer
+        # appends to the store's log; seeds/glyph changes ask for a full
+        # snapshot. Snapshots record the last delta they include (log_seq),
+        # so replay on load skips deltas the snapshot already covers.
+        self._persist_dirty = threading.Event()
+        self._persist_full = False
+        self._last_persisted: Optional[Dict[str, Any]] = None
+        self._delta_seq = 0  # under _threads_lock
+        self._pending_deltas: list[Dict[str, Any]] = []  # under _threads_lock
+        self._log_len = 0  # under _persist_lock
+        # Serializes every store write (save/append/truncate). Without it a
+        # snapshot taken on a request thread could truncate deltas the writer
+        # appended after that snapshot was built.
+        self._persist_lock = threading.Lock()
+        threading.Thread(target=self._persist_loop, name="qnf-persist", daemon=True).start()
+        # cog.intent events are handed to a dispatcher thread so the bus fanout
+        # (one call per subscriber) stays off the request path. Events still
+        # queued at shutdown are dropped.
+        self._publish_q: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        threading.Thread(target=self._publish_loop, name="qnf-publish", daemon=True).start()
         # --- Nexus Notes (centroid embeddings) -----------------------------
         self._notes: Dict[str, Dict[str, Any]] = {}
+        # Embeddings keyed by blake2b(model id, text); insertion-ordered for eviction
+        self._embed_cache: Dict[bytes, list[float]] = {}
         # --- Threads / Routing ----------------------------------------------
         # Topic threads keyed by thread_id; simple mapping topic->thread_id
         self._threads: Dict[str, Dict[str, Any]] = {}
         self._topic_to_thread: Dict[str, str] = {}
         self._intent_counts: Dict[str, int] = {}
         self._topic_counts: Dict[str, int] = {}
-        self._persist_counter: int = 0
         # Seeds and topic matrix (memory/reflex)
         self._seeds: set[str] = set()
-        self._topic_matrix: Dict[str, Dict[str, int]] = {}
+        # Read-only copies of _seeds/_topic_alias republished on every change,
+        # so cog_process matches seeds without taking _seeds_lock
+        self._seed_view: frozenset[str] = frozenset()
+        self._seed_phrases: Optional[Tuple[Pattern[str], Dict[str, str]]] = None
+        self._alias_view: Dict[str, str] = {}
+        # Topic co-occurrence (under _threads_lock): topic names are interned
+        # to row/column ids of one square count matrix, doubled as topics appear
+        self._topic_id: Dict[str, int] = {}
+        self._topic_name: list[str] = []
+        self._cooc = np.zeros((16, 16), dtype=np.int32)
         # Last resonance snapshot
         self._last_resonance: Dict[str, Any] = {}
         # Topic alias mapping (seed/keyword -> canonical topic label)
         self._topic_alias: Dict[str, str] = {}
         # --- Triage tuner (SGD scaffold) -----------------------------------
+        self._tuner_enabled = False  # mirrors _tuner["enabled"] for the metrics() fast path
         self._tuner = {
             "enabled": False,
             "lr": 0.1,
@@ -65,53 +293,70 @@ class QNFService:
             self._cog.set_profile(self._profile)
         except Exception:
             pass
+        # Restore persisted state over the defaults above
+        self._load_state_if_present()
 
     # Core operations
     def process(self, data: Any, pool_id: Optional[str] = None) -> Dict[str, Any]:
-        with self._lock:
-            return self._qnf.process(data, pool_id)
+        with self._qnf_lock:
+            try:
+                return self._qnf.process(data, pool_id)
+            finally:
+                self._publish_status()
+
+    def _publish_status(self) -> None:
+        # Caller holds self._qnf_lock
+        self._status_seq += 1
+        try:
+            self._status_snapshot = self._qnf.status()
+        finally:
+            self._status_seq += 1
 
     def status(self) -> Dict[str, Any]:
-        # Status reads can be done without the global lock, but keep simple and safe
-        with self._lock:
-            return self._qnf.status()
+        """Latest published status snapshot; lock-free, shared, read-only."""
+        while True:
+            seq = self._status_seq
+            snap = self._status_snapshot
+            if seq % 2 == 0 and seq == self._status_seq:
+                return snap
+            time.sleep(0)  # writer mid-publish; yield and retry
 
     def metrics(self) -> Dict[str, Any]:
         """Return a compact metrics payload useful for ops/monitoring."""
-        with self._lock:
-            st = self._qnf.status()
+        st = self.status()
         pools = st.get("pool_status", {})
-        pool_metrics: Dict[str, Any] = {}
-        # Optional conversion: estimated bytes per heap entry
-        try:
-            entry_bytes = int(os.getenv("QNF_HEAP_ENTRY_BYTES", "0"))
-        except Exception:
-            entry_bytes = 0
-        global_total_bytes = 0.0
-        for pid, pdata in pools.items():
-            entries = pdata.get("heap_size")
-            # derive MiB/GiB if possible
-            heap_mib = 0.0
-            heap_gib = 0.0
-            try:
-                if isinstance(entries, (int, float)) and entry_bytes > 0:
-                    total_bytes = float(entries) * float(entry_bytes)
-                    heap_mib = total_bytes / (1024.0 ** 2)
-                    heap_gib = total_bytes / (1024.0 ** 3)
-                    global_total_bytes += total_bytes
-            except Exception:
-                pass
-            pool_metrics[pid] = {
+        entry_bytes = self._entry_bytes
+        pool_items = list(pools.items())
+        n = len(pool_items)
+        # Optional conversion to MiB/GiB from an estimated bytes-per-entry;
+        # non-numeric heap sizes count as zero
+        if entry_bytes > 0 and n:
+            entries = np.fromiter(
+                (p.get("heap_size") if isinstance(p.get("heap_size"), (int, float)) else 0 for _, p in pool_items),
+                dtype=np.float64,
+                count=n,
+            )
+            pool_bytes = entries * float(entry_bytes)
+            heap_mib = (pool_bytes / (1024.0 ** 2)).tolist()
+            heap_gib = (pool_bytes / (1024.0 ** 3)).tolist()
+            global_total_bytes = float(pool_bytes.sum())
+        else:
+            heap_mib = heap_gib = [0.0] * n
+            global_total_bytes = 0.0
+        pool_metrics: Dict[str, Any] = {
+            pid: {
                 "processor_count": pdata.get("processor_count"),
                 "total_executions": pdata.get("total_executions"),
-                "heap_size": entries,
-                "heap_mib": heap_mib,
-                "heap_gib": heap_gib,
+                "heap_size": pdata.get("heap_size"),
+                "heap_mib": mib,
+                "heap_gib": gib,
                 "sched_heap_stale_ratio": pdata.get("sched_heap_stale_ratio"),
                 "avg_latency_ms": pdata.get("avg_latency_ms"),
                 "p95_latency_ms": pdata.get("p95_latency_ms"),
                 "build": self._per_pool_build(pid),
             }
+            for (pid, pdata), mib, gib in zip(pool_items, heap_mib, heap_gib)
+        }
         global_heap_mib = global_total_bytes / (1024.0 ** 2) if global_total_bytes > 0 else 0.0
         global_heap_gib = global_total_bytes / (1024.0 ** 3) if global_total_bytes > 0 else 0.0
         # Cognition embedding metrics (lightweight; optional)
@@ -120,8 +365,10 @@ class QNFService:
         except Exception:
             cog_embed = {"enabled": False}
         # Online triage tuner step (if enabled)
-        try:
-            if self._tuner.get("enabled") is True:
+        if not self._tuner_enabled:
+            tuner_state = _TUNER_DISABLED
+        else:
+            try:
                 p95 = float(st.get("p95_latency_ms", 0.0) or 0.0)
                 target = float(self._tuner.get("target_p95_ms", 50.0))
                 lr = float(self._tuner.get("lr", 0.1))
@@ -141,10 +388,8 @@ class QNFService:
                     "threshold_ms": new_thr,
                     "lr": lr,
                 }
-            else:
-                tuner_state = {"enabled": False}
-        except Exception:
-            tuner_state = {"enabled": False}
+            except Exception:
+                tuner_state = _TUNER_DISABLED
         return {
             "total_pools": st.get("total_pools"),
             "total_processors": st.get("total_processors"),
@@ -162,202 +407,240 @@ class QNFService:
     # --- Build / Version ----------------------------------------------------
     def build_info(self) -> Dict[str, Any]:
         """Return basic build/version metadata for Prometheus info metrics
-        and debugging. Values are read from env with sensible defaults.
+        and debugging. Values are read from env (once, at startup) with
+        sensible defaults.
         """
-        import os
-
-        def _get(name: str, default: str) -> str:
-            return os.getenv(name, default)
-
-        return {
-            "app": _get("QNF_APP", "qnf"),
-            "version": _get("QNF_VERSION", "dev"),
-            "git_sha": _get("QNF_GIT_SHA", "unknown"),
-            "build_time": _get("QNF_BUILD_TIME", "unknown"),
-        }
+        return dict(self._build_info)
 
     # --- Per‑pool build -----------------------------------------------------
     def _per_pool_build(self, pool_id: str) -> Dict[str, Any]:
-        import os
-
-        # Support two naming schemes for env vars:
-        #  1) QNF_{POOLID}_<VAR>
-        #  2) QNF_POOL_{POOLID}_<VAR>
-        pid = pool_id.upper()
-        prefixes = [f"QNF_{pid}_", f"QNF_POOL_{pid}_"]
-
-        def _get(var: str, default: str) -> str:
-            for p in prefixes:
-                val = os.getenv(f"{p}{var}")
-                if val is not None:
-                    return val
-            return default
-
-        return {
-            "version": _get("VERSION", "dev"),
-            "git_sha": _get("GIT_SHA", "unknown"),
-            "build_time": _get("BUILD_TIME", "unknown"),
-        }
+        # Env is fixed for the process lifetime, so each pool's lookup runs
+        # once; the cache is dropped when pools are rebuilt or torn down
+        build = self._pool_builds.get(pool_id)
+        if build is None:
+            # Support two naming schemes for env vars:
+            #  1) QNF_{POOLID}_<VAR>
+            #  2) QNF_POOL_{POOLID}_<VAR>
+            pid = pool_id.upper()
+            prefixes = [f"QNF_{pid}_", f"QNF_POOL_{pid}_"]
+
+            def _get(var: str, default: str) -> str:
+                for p in prefixes:
+                    val = os.getenv(f"{p}{var}")
+                    if val is not None:
+                        return val
+                return default
+
+            build = self._pool_builds[pool_id] = {
+                "version": _get("VERSION", "dev"),
+                "git_sha": _get("GIT_SHA", "unknown"),
+                "build_time": _get("BUILD_TIME", "unknown"),
+            }
+        return build
 
     # --- Event Stream API ---------------------------------------------------
     def add_event(self, payload: Dict[str, Any]) -> None:
-        with self._event_cv:
-            self._event_queue.append(payload)
-            self._event_cv.notify_all()
+        with self._event_pub_lock:
+            idx = self._event_widx
+            self._event_ring[idx & _EVENT_RING_MASK] = payload
+            self._event_widx = idx + 1
+            wake, self._event_wake = self._event_wake, threading.Event()
+            notifiers = self._event_notifiers
+        wake.set()
+        for loop, notify in notifiers:
+            try:
+                loop.call_soon_threadsafe(notify.set)
+            except RuntimeError:
+                pass  # loop closed; its consumer unregisters on the way out
+
+    def _events_between(self, lo: int, hi: int) -> list[Dict[str, Any]]:
+        """Events with write index in [lo, hi), minus any already overwritten."""
+        lo = max(lo, hi - EVENT_RING_SIZE, 0)
+        ring = self._event_ring
+        batch = [ring[i & _EVENT_RING_MASK] for i in range(lo, hi)]
+        # Publishers may have lapped the oldest slots while we copied
+        lapped = self._event_widx - EVENT_RING_SIZE - lo
+        return batch[lapped:] if lapped > 0 else batch
 
     def event_stream(self):
-        last_idx = 0
+        for batch in self.event_batches():
+            if not batch:
+                # keep idle loop but don't synthesize fake SSE events here
+                # the API layer will handle batching/keepalive for NDJSON
+                yield None
+            yield from batch
+
+    def event_notifier(self, loop: asyncio.AbstractEventLoop) -> asyncio.Event:
+        """An asyncio.Event on ``loop`` that is set after each add_event.
+
+        The consumer clears it before reading event_count(); pass it to
+        remove_event_notifier() when done.
+        """
+        notify = asyncio.Event()
+        with self._event_pub_lock:
+            self._event_notifiers = self._event_notifiers + ((loop, notify),)
+        return notify
+
+    def remove_event_notifier(self, notify: asyncio.Event) -> None:
+        with self._event_pub_lock:
+            self._event_notifiers = tuple(n for n in self._event_notifiers if n[1] is not notify)
+
+    def events_since(self, start: int) -> Tuple[list[Dict[str, Any]], int]:
+        """(events published since ``start``, current event_count()) without waiting."""
+        hi = self._event_widx
+        return self._events_between(start, hi), hi
+
+    def event_count(self) -> int:
+        """Events published so far; pass it to event_batches() to skip them."""
+        return self._event_widx
+
+    def event_batches(self, start: int = 0):
+        """Yield every event that arrived since the previous batch, as a list.
+
+        An empty list means the 5s wait elapsed with nothing new. A consumer
+        that falls more than EVENT_RING_SIZE events behind skips the ones
+        that were overwritten.
+        """
+        last_idx = start
         while True:
-            with self._event_cv:
-                while last_idx >= len(self._event_queue):
-                    self._event_cv.wait(timeout=5)
-                    # keep idle loop but don't synthesize fake SSE events here
-                    # the API layer will handle batching/keepalive for NDJSON
-                    if last_idx >= len(self._event_queue):
-                        yield None
-                # emit new items
-                items = list(self._event_queue)[last_idx:]
-                last_idx = len(self._event_queue)
-            for ev in items:
-                yield ev
+            # Grab the wake handle before checking the index so a publish in
+            # between still sets the Event we wait on.
+            wake = self._event_wake
+            if last_idx >= self._event_widx:
+                wake.wait(timeout=5)
+            hi = self._event_widx
+            batch = self._events_between(last_idx, hi)
+            last_idx = hi
+            yield batch
 
     # --- Friendships / Guilds (skeleton) -----------------------------------
     def add_friendship(self, player: str, friend: str) -> Dict[str, Any]:
-        self._friendships.setdefault(player, set()).add(friend)
-        self._friendships.setdefault(friend, set()).add(player)
+        with self._friend_lock:
+            _insort_unique(self._friendships.setdefault(player, []), friend)
+            _insort_unique(self._friendships.setdefault(friend, []), player)
         return {"player": player, "friend": friend}
 
     def list_friendships(self, player: str) -> Dict[str, Any]:
-        return {"player": player, "friends": sorted(self._friendships.get(player, set()))}
+        with self._friend_lock:
+            friends = list(self._friendships.get(player, ()))
+        return {"player": player, "friends": friends}
 
     def create_guild(self, guild_id: str, name: str) -> Dict[str, Any]:
-        if guild_id in self._guilds:
-            return self._guilds[guild_id]
-        self._guilds[guild_id] = {"id": guild_id, "name": name, "members": set()}
-        return self._guilds[guild_id]
+        with self._guild_lock:
+            g = self._guilds.setdefault(guild_id, {"id": guild_id, "name": name, "members": []})
+            return {"id": g["id"], "name": g["name"], "members": list(g["members"])}
 
     def add_guild_member(self, guild_id: str, player: str) -> Dict[str, Any]:
-        g = self._guilds.setdefault(guild_id, {"id": guild_id, "name": guild_id, "members": set()})
-        g["members"].add(player)
-        return {"guild": guild_id, "members": sorted(g["members"])}
+        with self._guild_lock:
+            g = self._guilds.setdefault(guild_id, {"id": guild_id, "name": guild_id, "members": []})
+            _insort_unique(g["members"], player)
+            members = list(g["members"])
+        return {"guild": guild_id, "members": members}
 
     def get_guild(self, guild_id: str) -> Dict[str, Any]:
-        g = self._guilds.get(guild_id)
-        if not g:
-            return {"id": guild_id, "name": guild_id, "members": []}
-        return {"id": g["id"], "name": g["name"], "members": sorted(g["members"])}
+        with self._guild_lock:
+            g = self._guilds.get(guild_id)
+            if not g:
+                return {"id": guild_id, "name": guild_id, "members": []}
+            return {"id": g["id"], "name": g["name"], "members": list(g["members"])}
 
     # --- Events history ------------------------------------------------------
     def recent_events(self, limit: int = 100) -> list[Dict[str, Any]]:
         """Return up to `limit` most recent events (newest last)."""
         if limit <= 0:
             return []
-        data = list(self._event_queue)
-        if len(data) <= limit:
-            return data
-        return data[-limit:]
+        hi = self._event_widx
+        return self._events_between(hi - limit, hi)
 
     def create_pool(self, pool_id: str, initial_size: int = 3) -> str:
-        with self._lock:
-            return self._qnf.create_pool(pool_id, initial_size)
+        with self._qnf_lock:
+            try:
+                return self._qnf.create_pool(pool_id, initial_size)
+            finally:
+                self._publish_status()
 
     def teardown(self) -> None:
-        with self._lock:
-            self._qnf.teardown_complete()
+        with self._qnf_lock:
+            try:
+                self._qnf.teardown_complete()
+            finally:
+                self._pool_builds.clear()
+                self._publish_status()
 
     def rebuild(self, default_pools: int = 2, pool_size: int = 5) -> None:
-        with self._lock:
-            self._qnf.rebuild_from_foundation(
-                {"default_pools": default_pools, "pool_size": pool_size}
-            )
+        with self._qnf_lock:
+            try:
+                self._qnf.rebuild_from_foundation(
+                    {"default_pools": default_pools, "pool_size": pool_size}
+                )
+            finally:
+                self._pool_builds.clear()
+                self._publish_status()
 
     # Cognitive Graph operations
     def cog_process(self, data: Any) -> Dict[str, Any]:
         result = self._cog.process(data)
         # Publish a lightweight cognition event for dashboards
         try:
-            meta = result.metadata or {}
-            intent = (meta.get("intent") or {}).get("label", "unknown")
-            confidence = float(meta.get("confidence", 0.0) or 0.0)
-            topics = meta.get("topics", []) or []
+            if result.metadata is None:
+                result.metadata = {}
+            # Read each metadata field once; everything below uses the locals
+            meta = result.metadata
+            intent_info = meta.get("intent") or {}
+            intent = intent_info.get("label", "unknown")
+            confidence = float(meta.get("confidence") or 0.0)
+            topics = meta.get("topics") or []
             # Seed/alias integration: boost small confidence and add alias topics for matched seeds
+            seeds, phrases, aliases = self._seed_view, self._seed_phrases, self._alias_view
+            text = str(data)
             try:
-                words = set(str(data).lower().split())
-                hits = words & self._seeds
+                hits = _match_seeds(text.lower(), seeds, phrases)
                 if hits:
-                    # small additive boost up to +0.2
-                    boost = min(0.2, 0.1 * len(hits))
-                    confidence = min(1.0, confidence + boost)
-                    meta.setdefault("intent", {}).update({"score": confidence})
-                    meta["seeds"] = sorted(hits)
-                    if "seeded" not in topics:
+                    confidence = _seed_boost(confidence, len(hits))
+                    meta.setdefault("intent", intent_info)["score"] = confidence
+                    seed_list = meta["seeds"] = sorted(hits)
+                    # Membership via a set: many hits often share one alias
+                    seen = set(topics)
+                    if "seeded" not in seen:
                         topics.append("seeded")
+                        seen.add("seeded")
                     # add alias topics mapped to matched seeds
-                    for s in hits:
-                        alias = self._topic_alias.get(s)
-                        if alias and alias not in topics:
+                    for s in seed_list:
+                        alias = aliases.get(s)
+                        if alias and alias not in seen:
                             topics.append(alias)
+                            seen.add(alias)
             except Exception:
                 pass
             # normalize topics through alias map
-            try:
-                topics = [self._topic_alias.get(t, t) for t in topics]
-            except Exception:
-                pass
-            bus.publish({
+            if aliases:
+                try:
+                    topics = [aliases.get(t, t) for t in topics]
+                except Exception:
+                    pass
+            self._publish_q.put_nowait({
                 "type": "cog.intent",
                 "data": {"intent": intent, "confidence": confidence, "topics": topics},
             })
-            # Update stats
-            self._intent_counts[intent] = self._intent_counts.get(intent, 0) + 1
-            for t in topics:
-                self._topic_counts[t] = self._topic_counts.get(t, 0) + 1
-            # Threading: append to a thread for the first topic (or 'general')
-            top_topic = topics[0] if topics else "general"
-            thread_id = self._topic_to_thread.get(top_topic)
-            if not thread_id:
-                thread_id = f"thr_{uuid.uuid4().hex[:8]}"
-                self._topic_to_thread[top_topic] = thread_id
-                self._threads[thread_id] = {"id": thread_id, "topic": top_topic, "items": [], "created": time.time(), "updated": time.time()}
-            sig = _glyphic_signature({"text": str(data), "intent": intent, "topics": topics})
-            entry = {"ts": time.time(), "text": str(data), "intent": intent, "confidence": confidence, "sigil": list(sig)}
-            thr = self._threads.get(thread_id)
-            if thr is not None:
-                items = thr.get("items", [])
-                items.append(entry)
-                if len(items) > 200:
-                    del items[: len(items) - 200]
-                thr["items"] = items
-                thr["updated"] = time.time()
+            sig = _signature(text, intent, tuple(topics))
+            entry = {"ts": time.time(), "text": text, "intent": intent, "confidence": confidence, "sigil": list(sig)}
+            with self._threads_lock:
+                thread_id, thread_items = self._record_entry(intent, topics, entry)
+                self._delta_seq += 1
+                self._pending_deltas.append({
+                    "seq": self._delta_seq,
+                    "tid": thread_id,
+                    "intent": intent,
+                    "topics": topics,
+                    "entry": entry,
+                })
+            self._persist_dirty.set()
             # Routing hint (no side effects; informational only)
-            route = self._route_hint(intent=intent, topics=topics, confidence=confidence)
-            result.metadata["route"] = route
-            # Opportunistic persistence every 10 updates
-            self._persist_counter = (self._persist_counter + 1) % 10
-            if self._persist_counter == 0:
-                self._persist_runtime_state()
+            meta["route"] = self._route_hint(intent=intent, topics=topics, confidence=confidence)
             # Compute resonance snapshot
             try:
-                rule_comp = 0.0
-                refs = meta.get("reflective_refs", []) or []
-                sim_comp = float(refs[0].get("score", 0.0)) if refs and isinstance(refs[0], dict) else 0.0
-                sp = meta.get("shannon_prime", {}) or {}
-                stability = float(sp.get("stability", 0.0) or 0.0)
-                emo = meta.get("emotion", {}) or {}
-                valence = abs(float(emo.get("valence", 0.0) or 0.0))
-                eth = meta.get("ethics", {}) or {}
-                ethics_ok = 0 if any(bool(v) for v in eth.values()) else 1
-                thread_activity = min(1.0, len(thr.get("items", [])) / 50.0) if thr else 0.0
-                components = {
-                    "rules": rule_comp,
-                    "similarity": sim_comp,
-                    "stability": stability,
-                    "ethics_ok": float(ethics_ok),
-                    "thread_activity": thread_activity,
-                }
-                score = sum(components.values()) / len(components)
-                self._last_resonance = {"score": score, **components}
-                result.metadata["resonance"] = dict(self._last_resonance)
+                self._last_resonance = _resonance(meta, thread_items)
+                meta["resonance"] = dict(self._last_resonance)
             except Exception:
                 pass
         except Exception:
@@ -370,65 +653,166 @@ class QNFService:
             "metadata": result.metadata,
         }
 
+    def _record_entry(
+        self, intent: str, topics: list[str], entry: Dict[str, Any], thread_id: Optional[str] = None
+    ) -> Tuple[str, int]:
+        """Count one processed message and append it to its topic thread.
+
+        Caller holds self._threads_lock. Also used to replay the delta log,
+        which passes the original ``thread_id``. Returns the thread id and
+        its new length.
+        """
+        self._intent_counts[intent] = self._intent_counts.get(intent, 0) + 1
+        for t in topics:
+            self._topic_counts[t] = self._topic_counts.get(t, 0) + 1
+        self._count_cooccurrence(topics)
+        # Threading: append to a thread for the first topic (or 'general')
+        top_topic = topics[0] if topics else "general"
+        thread_id = thread_id or self._topic_to_thread.get(top_topic) or f"thr_{uuid.uuid4().hex[:8]}"
+        ts = entry.get("ts") or time.time()
+        thr = self._threads.get(thread_id)
+        if thr is None:
+            self._topic_to_thread.setdefault(top_topic, thread_id)
+            thr = self._threads[thread_id] = {
+                "id": thread_id, "topic": top_topic, "items": deque(maxlen=THREAD_ITEMS_MAX), "created": ts, "updated": ts,
+            }
+        thr["items"].append(entry)
+        thr["updated"] = ts
+        return thread_id, len(thr["items"])
+
     # --- Routing / Threads API ---------------------------------------------
     def _route_hint(self, *, intent: str, topics: list[str], confidence: float) -> Dict[str, Any]:
-        intent = (intent or "").lower()
-        if intent in ("help",):
-            return {"action": "help", "target": "local"}
-        if intent in ("status",):
-            return {"action": "status", "target": "local"}
-        if intent in ("stress", "benchmark"):
-            return {"action": "stress_test", "target": "local"}
-        if intent in ("upgrade", "update"):
-            return {"action": "upgrade", "target": "llm"}
-        return {"action": "process", "target": "local"}
+        return _ROUTE_TABLE.get((intent or "").lower(), _DEFAULT_ROUTE)
 
     def cog_threads(self, topic: Optional[str] = None) -> Dict[str, Any]:
         out = []
-        for tid, th in self._threads.items():
-            if topic and th.get("topic") != topic:
-                continue
-            out.append({
-                "id": tid,
-                "topic": th.get("topic"),
-                "count": len(th.get("items", [])),
-                "created": th.get("created"),
-                "updated": th.get("updated"),
-            })
+        with self._threads_lock:
+            for tid, th in self._threads.items():
+                if topic and th.get("topic") != topic:
+                    continue
+                out.append({
+                    "id": tid,
+                    "topic": th.get("topic"),
+                    "count": len(th.get("items", [])),
+                    "created": th.get("created"),
+                    "updated": th.get("updated"),
+                })
         out.sort(key=lambda x: x.get("updated", 0.0), reverse=True)
         return {"threads": out}
 
     def cog_stats(self) -> Dict[str, Any]:
-        return {"intents": dict(self._intent_counts), "topics": dict(self._topic_counts)}
+        with self._threads_lock:
+            return {"intents": dict(self._intent_counts), "topics": dict(self._topic_counts)}
 
     def cog_thread(self, thread_id: str, limit: int = 50) -> Dict[str, Any]:
-        thr = self._threads.get(thread_id)
-        if not thr:
-            return {"id": thread_id, "topic": None, "items": []}
-        items = list(thr.get("items", []))
-        if limit > 0 and len(items) > limit:
-            items = items[-limit:]
+        with self._threads_lock:
+            thr = self._threads.get(thread_id)
+            if not thr:
+                return {"id": thread_id, "topic": None, "items": []}
+            items = thr["items"]
+            if 0 < limit < len(items):
+                # Walk back from the tail: O(limit), not a copy of the whole window
+                items = list(islice(reversed(items), limit))[::-1]
+            else:
+                items = list(items)
         return {"id": thread_id, "topic": thr.get("topic"), "items": items}
 
+    def _publish_seeds(self) -> None:
+        # Caller holds self._seeds_lock
+        self._seed_view = frozenset(seed for seed in self._seeds if len(seed.split()) == 1)
+        self._seed_phrases = _compile_seed_phrases(self._seeds)
+        self._alias_view = dict(self._topic_alias)
+
     def seeds_get(self) -> Dict[str, Any]:
-        return {"seeds": sorted(self._seeds)}
+        with self._seeds_lock:
+            return {"seeds": sorted(self._seeds)}
 
     def seeds_add(self, items: list[str]) -> Dict[str, Any]:
         if not isinstance(items, list):
             return self.seeds_get()
-        for x in items:
-            if isinstance(x, str) and x.strip():
-                self._seeds.add(x.strip().lower())
+        with self._seeds_lock:
+            for x in items:
+                if isinstance(x, str) and x.strip():
+                    self._seeds.add(x.strip().lower())
+            self._publish_seeds()
         self._persist_runtime_state()
         return self.seeds_get()
 
+    def _intern_topics(self, topics: Any) -> list[int]:
+        # Caller holds self._threads_lock
+        ids = []
+        for topic in topics:
+            i = self._topic_id.get(topic)
+            if i is None:
+                i = self._topic_id[topic] = len(self._topic_name)
+                self._topic_name.append(topic)
+                n = len(self._cooc)
+                if i >= n:
+                    self._cooc = np.pad(self._cooc, ((0, n), (0, n)))
+            ids.append(i)
+        return ids
+
+    def _count_cooccurrence(self, topics: list[str]) -> None:
+        # Caller holds self._threads_lock
+        ids = np.array(self._intern_topics(dict.fromkeys(topics)), dtype=np.intp)
+        if len(ids) > 1:
+            self._cooc[np.ix_(ids, ids)] += 1
+            self._cooc[ids, ids] -= 1  # a topic doesn't co-occur with itself
+
+    def _cooc_snapshot(self) -> Tuple[list[str], np.ndarray]:
+        # Caller holds self._threads_lock
+        names = list(self._topic_name)
+        return names, self._cooc[: len(names), : len(names)].copy()
+
     def cog_matrix(self, top_k: int = 20) -> Dict[str, Any]:
+        with self._threads_lock:
+            names, cooc = self._cooc_snapshot()
         out: Dict[str, Any] = {}
-        for topic, counts in self._topic_matrix.items():
-            pairs = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:top_k]
-            out[topic] = pairs
+        for i in np.flatnonzero(cooc.any(axis=1)):
+            row = cooc[i]
+            k = min(top_k, int(np.count_nonzero(row)))
+            if k <= 0:
+                out[names[i]] = []
+                continue
+            # Partial sort: only the k largest cells get ordered
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top], kind="stable")]
+            out[names[i]] = [(names[j], int(row[j])) for j in top]
         return {"matrix": out}
 
+    def similarity_matrix(self, vectors: list[list[float]], top_k: Optional[int] = None) -> Dict[str, Any]:
+        """Pairwise cosine similarity of `vectors` as one normalized matrix product.
+
+        With `top_k`, only each row's best `top_k` neighbours (itself excluded)
+        are returned instead of the full N x N matrix.
+        """
+        try:
+            m = np.asarray(vectors, dtype=np.float32)
+        except ValueError:
+            raise ValueError("vectors must all have the same dimension")
+        if m.ndim != 2 or m.shape[1] == 0:
+            raise ValueError("vectors must be a non-empty list of equal-length vectors")
+        n = m.shape[0]
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        m /= np.where(norms == 0.0, 1.0, norms)
+        sim = np.clip(m @ m.T, -1.0, 1.0)
+        if top_k is None:
+            return {"size": n, "matrix": sim.tolist()}
+        k = min(top_k, n - 1)
+        if k <= 0:
+            return {"size": n, "neighbors": [[] for _ in range(n)]}
+        np.fill_diagonal(sim, -np.inf)
+        idx = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(sim, idx, axis=1)
+        order = np.argsort(-scores, axis=1)
+        idx = np.take_along_axis(idx, order, axis=1)
+        scores = np.take_along_axis(scores, order, axis=1)
+        neighbors = [
+            [{"index": j, "score": s} for j, s in zip(row_idx, row_scores)]
+            for row_idx, row_scores in zip(idx.tolist(), scores.tolist())
+        ]
+        return {"size": n, "neighbors": neighbors}
+
     def resonance_last(self) -> Dict[str, Any]:
         return dict(self._last_resonance)
 
@@ -436,43 +820,45 @@ class QNFService:
         shapes = payload.get("shapes") if isinstance(payload, dict) else None
         if not isinstance(shapes, dict):
             shapes = payload if isinstance(payload, dict) else {}
-        cur_rules = self._cog.get_rules()
         added = {"seeds": 0, "aliases": 0, "rules": 0}
-        for name, cfg in (shapes or {}).items():
-            if not isinstance(cfg, dict):
-                continue
-            topic = cfg.get("topic")
-            seeds = cfg.get("seeds") or []
-            rules = cfg.get("rules") or {}
-            # seeds
-            for s in seeds:
-                if isinstance(s, str) and s.strip():
-                    token = s.strip().lower()
-                    if token not in self._seeds:
-                        added["seeds"] += 1
-                    self._seeds.add(token)
-                    if isinstance(topic, str) and topic:
-                        self._topic_alias[token] = topic
-            # alias the shape name itself
-            if isinstance(topic, str) and topic:
-                self._topic_alias[str(name).lower()] = topic
-                added["aliases"] += 1
-            # rules
-            if isinstance(rules, dict):
-                for rk, rv in rules.items():
-                    rk = str(rk)
-                    rv = str(rv)
-                    if rk not in cur_rules:
-                        added["rules"] += 1
-                    cur_rules[rk] = rv
-        self._cog.set_rules(cur_rules)
+        with self._cog_lock, self._seeds_lock:
+            cur_rules = self._cog.get_rules()
+            for name, cfg in (shapes or {}).items():
+                if not isinstance(cfg, dict):
+                    continue
+                topic = cfg.get("topic")
+                seeds = cfg.get("seeds") or []
+                rules = cfg.get("rules") or {}
+                # seeds
+                for s in seeds:
+                    if isinstance(s, str) and s.strip():
+                        token = s.strip().lower()
+                        if token not in self._seeds:
+                            added["seeds"] += 1
+                        self._seeds.add(token)
+                        if isinstance(topic, str) and topic:
+                            self._topic_alias[token] = topic
+                # alias the shape name itself
+                if isinstance(topic, str) and topic:
+                    self._topic_alias[str(name).lower()] = topic
+                    added["aliases"] += 1
+                # rules
+                if isinstance(rules, dict):
+                    for rk, rv in rules.items():
+                        rk = str(rk)
+                        rv = str(rv)
+                        if rk not in cur_rules:
+                            added["rules"] += 1
+                        cur_rules[rk] = rv
+            self._cog.set_rules(cur_rules)
+            self._publish_seeds()
+            totals = {
+                "total_seeds": len(self._seeds),
+                "total_aliases": len(self._topic_alias),
+                "total_rules": len(cur_rules),
+            }
         self._persist_runtime_state()
-        return {
-            "total_seeds": len(self._seeds),
-            "total_aliases": len(self._topic_alias),
-            "total_rules": len(cur_rules),
-            "added": added,
-        }
+        return {**totals, "added": added}
 
     def glyphs_interpret(self, sequence: str) -> Dict[str, Any]:
         """Parse a simple glyph/node sequence and suggest a route and topics.
@@ -482,19 +868,15 @@ class QNFService:
         """
         if not isinstance(sequence, str):
             return {"tokens": [], "route": {"action": "process", "target": "local"}, "topics": []}
-        raw = sequence.replace("→", "->").replace("—", "->")
-        parts = [p.strip() for p in raw.split("->") if p.strip()]
-        norm_map = {
-            "APEX": "APEX", "🜂": "APEX", "FIRE": "APEX",
-            "CORE": "CORE", "♾": "CORE",
-            "EMIT": "EMIT", "🚀": "EMIT",
-            "ROOT": "ROOT", "🌳": "ROOT",
-            "CUBE": "CUBE", "🧊": "CUBE",
-        }
-        tokens: list[str] = [norm_map.get(p.upper(), p.upper()) for p in parts]
+        tokens: list[str] = []
+        for part in _GLYPH_SPLIT.split(sequence):
+            part = part.strip().upper()
+            if part:
+                tokens.append(_GLYPH_NORM.get(part, part))
+        aliases = self._alias_view
         topics: list[str] = []
         for t in tokens:
-            alias = self._topic_alias.get(t.lower()) or self._topic_alias.get(t)
+            alias = aliases.get(t.lower()) or aliases.get(t)
             if alias and alias not in topics:
                 topics.append(alias)
         action = "process"
@@ -508,7 +890,8 @@ class QNFService:
         return {"tokens": tokens, "topics": topics, "route": {"action": action, "target": target}}
 
     def aliases_get(self) -> Dict[str, Any]:
-        return {"aliases": dict(self._topic_alias)}
+        with self._seeds_lock:
+            return {"aliases": dict(self._topic_alias)}
 
     # --- Activation Presets -------------------------------------------------
     def activate(self, preset: str) -> Dict[str, Any]:
@@ -563,6 +946,12 @@ class QNFService:
             "use_pca": "Set QNF_USE_NUMPY=1 and QNF_USE_PCA=1 then restart to enable PCA metrics",
             "emb_dim": "Optionally set QNF_EMB_DIM (e.g., 32)",
         }
+        with self._threads_lock:
+            cog_state = {
+                "threads": len(self._threads),
+                "intents": dict(self._intent_counts),
+                "topics": dict(self._topic_counts),
+            }
         return {
             "preset": preset,
             "pools": pools,
@@ -570,9 +959,7 @@ class QNFService:
             "seeds": len(seeds),
             "rules_upgraded": upgraded,
             "hints": hints,
-            "threads": len(self._threads),
-            "intents": dict(self._intent_counts),
-            "topics": dict(self._topic_counts),
+            **cog_state,
         }
 
     def cog_status(self) -> Dict[str, Any]:
@@ -582,8 +969,9 @@ class QNFService:
         return {"rules": self._cog.get_rules()}
 
     def cog_set_rules(self, rules: Dict[str, str]) -> Dict[str, Any]:
-        self._cog.set_rules(rules)
-        return {"status": "ok", "rules": self._cog.get_rules()}
+        with self._cog_lock:
+            self._cog.set_rules(rules)
+            return {"status": "ok", "rules": self._cog.get_rules()}
 
     def cog_memory_snapshot(self) -> Dict[str, Any]:
         return self._cog.memory_snapshot()
@@ -634,8 +1022,6 @@ class QNFService:
         seeds = state.get("seeds")
         matrix = state.get("matrix")
         aliases = state.get("aliases")
-        threads = state.get("threads")
-        stats = state.get("stats")
         if isinstance(rules, dict):
             self._cog.set_rules(rules)
         if isinstance(memory, list):
@@ -649,6 +1035,8 @@ class QNFService:
         # Restore threads, stats, seeds and matrix if present
         try:
             if isinstance(threads, dict):
+                for th in threads.values():
+                    th["items"] = deque(th.get("items") or (), maxlen=THREAD_ITEMS_MAX)
                 self._threads = threads
                 self._topic_to_thread.clear()
                 for tid, th in threads.items():
@@ -665,37 +1053,107 @@ class QNFService:
             if isinstance(seeds, list):
                 self._seeds = {str(x).lower() for x in seeds}
             if isinstance(matrix, dict):
-                self._topic_matrix = {str(k): {str(kk): int(vv) for kk, vv in (v or {}).items()} for k, v in matrix.items()}
+                for topic, counts in matrix.items():
+                    for other, count in (counts or {}).items():
+                        i, j = self._intern_topics((str(topic), str(other)))
+                        self._cooc[i, j] = int(count)
             if isinstance(aliases, dict):
                 self._topic_alias = {str(k).lower(): str(v) for k, v in aliases.items()}
+            self._publish_seeds()
         except Exception:
             pass
+        # Replay messages logged after the snapshot was written
+        log_seq = int(state.get("log_seq", 0) or 0)
+        with self._threads_lock:
+            self._delta_seq = log_seq
+            for rec in self._store.replay():
+                try:
+                    seq = int(rec["seq"])
+                    if seq <= log_seq:
+                        continue
+                    self._record_entry(str(rec["intent"]), list(rec.get("topics") or []), rec["entry"], rec.get("tid"))
+                    self._delta_seq = max(self._delta_seq, seq)
+                    self._log_len += 1
+                except Exception:
+                    continue
+
+    def _runtime_state(self) -> Dict[str, Any]:
+        """Copy of threads, stats, seeds and aliases, safe to serialize unlocked."""
+        with self._threads_lock:
+            threads = {tid: {**th, "items": list(th.get("items", []))} for tid, th in self._threads.items()}
+            stats = {"intents": dict(self._intent_counts), "topics": dict(self._topic_counts)}
+            names, cooc = self._cooc_snapshot()
+            log_seq = self._delta_seq
+        with self._seeds_lock:
+            seeds = sorted(self._seeds)
+            aliases = dict(self._topic_alias)
+        return {
+            "threads": threads,
+            "stats": stats,
+            "seeds": seeds,
+            "matrix": _matrix_dict(names, cooc),
+            "aliases": aliases,
+            "log_seq": log_seq,
+        }
 
-    def state_save(self) -> Dict[str, Any]:
-        snapshot = {
+    def _full_state(self) -> Dict[str, Any]:
+        return {
             "rules": self._cog.get_rules(),
             "memory": self._cog.memory_snapshot().get("top_preview", []),
             "profile": self._profile,
-            "threads": self._threads,
-            "stats": {"intents": self._intent_counts, "topics": self._topic_counts},
-            "seeds": sorted(self._seeds),
-            "matrix": self._topic_matrix,
-            "aliases": self._topic_alias,
+            **self._runtime_state(),
         }
-        self._store.save(snapshot)
+
+    def _compact(self) -> None:
+        """Write a full snapshot and drop the delta log it now covers."""
+        with self._persist_lock:
+            snapshot = self._full_state()
+            if snapshot != self._last_persisted:
+                self._store.save(snapshot)
+                self._last_persisted = snapshot
+            self._store.truncate_log()
+            self._log_len = 0
+            # Deltas recorded after the snapshot stay queued for the writer
+            log_seq = snapshot["log_seq"]
+            with self._threads_lock:
+                self._pending_deltas = [d for d in self._pending_deltas if d["seq"] > log_seq]
+
+    def state_save(self) -> Dict[str, Any]:
+        self._compact()
         return {"status": "ok", "saved": True}
 
     def _persist_runtime_state(self) -> None:
-        """Persist threads and stats opportunistically."""
-        try:
-            base = self._store.load() or {}
-            base["threads"] = self._threads
-            base["stats"] = {"intents": self._intent_counts, "topics": self._topic_counts}
-            base["seeds"] = sorted(self._seeds)
-            base["matrix"] = self._topic_matrix
-            self._store.save(base)
-        except Exception:
-            pass
+        """Schedule a background snapshot; returns immediately."""
+        self._persist_full = True
+        self._persist_dirty.set()
+
+    def _persist_loop(self) -> None:
+        while True:
+            self._persist_dirty.wait()
+            # Let a burst of updates settle, then write them all at once
+            time.sleep(PERSIST_DEBOUNCE_S)
+            self._persist_dirty.clear()
+            try:
+                if self._persist_full or self._log_len + len(self._pending_deltas) > COMPACT_EVERY:
+                    self._persist_full = False
+                    self._compact()
+                    continue
+                with self._persist_lock:
+                    with self._threads_lock:
+                        deltas, self._pending_deltas = self._pending_deltas, []
+                    if deltas:
+                        self._store.append(deltas)
+                        self._log_len += len(deltas)
+            except Exception:
+                pass
+
+    def _publish_loop(self) -> None:
+        while True:
+            payload = self._publish_q.get()
+            try:
+                bus.publish(payload)
+            except Exception:
+                pass
 
     def state_dump(self) -> Dict[str, Any]:
         base = self._store.load() or {}
@@ -709,15 +1167,12 @@ class QNFService:
 
     def upgrade_apply(self) -> Dict[str, Any]:
         # Merge suggestions into rules; later we can add tunables for pools, etc.
-        current = self._cog.get_rules()
-        for pair in self._cog.metatron_suggestions(limit=50):
-            current.setdefault(pair["pattern"], pair["tag"])
-        self._cog.set_rules(current)
-        self._store.save({
-            "rules": current,
-            "memory": self._cog.memory_snapshot().get("top_preview", []),
-            "profile": self._profile,
-        })
+        with self._cog_lock:
+            current = self._cog.get_rules()
+            for pair in self._cog.metatron_suggestions(limit=50):
+                current.setdefault(pair["pattern"], pair["tag"])
+            self._cog.set_rules(current)
+        self._compact()
         bus.publish({"type": "upgrade.apply", "data": {"rules_count": len(current)}})
         return {"status": "ok", "rules_count": len(current)}
 
@@ -742,7 +1197,7 @@ class QNFService:
                 "id": nid,
                 "tag": note.get("tag"),
                 "count": note.get("count", 0),
-                "vec_dim": len(vec) if isinstance(vec, list) else 0,
+                "vec_dim": len(vec) if vec is not None else 0,
             })
         return sorted(out, key=lambda x: x.get("id", ""))
 
@@ -752,30 +1207,99 @@ class QNFService:
         if vec is None and text is None:
             raise ValueError("either vec or text must be provided")
         if vec is None and text is not None:
-            # Compute embedding via cognitive overlay
-            a = QuantumAtom(data=text)
-            e = self._cog.sp.cno.execute(a)  # type: ignore[attr-defined]
-            vec = e.metadata.get("neural_vec")
-            if not isinstance(vec, list):
-                raise ValueError("could not compute embedding from text")
+            vec = self._embed_text(text)
+        w = float(weight) if weight > 0 else 1.0
+        v = np.asarray(vec, dtype=np.float32)
+        return self._fold_note(note_id, w * v, w, tag)
+
+    def notes_upsert_many(self, items: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+        """Upsert several notes in one call.
+
+        Items take the ``notes_upsert`` arguments (``id``, ``text`` or ``vec``,
+        ``weight``, ``tag``). Each distinct text is embedded once, and all
+        vectors for the same note fold into its centroid as one weighted mean.
+        Every item is validated before any note changes. Returns one result
+        per note, in first-seen order.
+        """
+        groups: Dict[str, Dict[str, Any]] = {}
+        embedded: Dict[str, list[float]] = {}
+        for item in items:
+            note_id = item.get("id")
+            if not note_id:
+                raise ValueError("note_id is required")
+            vec, text = item.get("vec"), item.get("text")
+            if vec is None:
+                if text is None:
+                    raise ValueError("either vec or text must be provided")
+                vec = embedded.get(text)
+                if vec is None:
+                    vec = embedded[text] = self._embed_text(text)
+            try:
+                weight = float(item.get("weight") or 1.0)  # missing or null -> 1.0
+            except (TypeError, ValueError):
+                raise ValueError("weight must be a number") from None
+            group = groups.setdefault(note_id, {"vecs": [], "weights": [], "tag": None})
+            group["vecs"].append(vec)
+            group["weights"].append(weight if weight > 0 else 1.0)
+            if item.get("tag") is not None:
+                group["tag"] = item["tag"]
+
+        updates = []
+        for note_id, group in groups.items():
+            stacked = np.asarray(group["vecs"], dtype=np.float32)  # ragged input raises
+            c = (self._notes.get(note_id) or {}).get("centroid")
+            if stacked.ndim != 2 or (c is not None and c.size and c.shape != stacked.shape[1:]):
+                raise ValueError("vector dimension mismatch")
+            weights = np.asarray(group["weights"], dtype=np.float32)
+            updates.append((note_id, weights @ stacked, float(weights.sum()), group["tag"]))
+        return [self._fold_note(*update) for update in updates]
+
+    def _fold_note(self, note_id: str, weighted_sum: np.ndarray, w: float, tag: Optional[str]) -> Dict[str, Any]:
+        """Fold ``weighted_sum`` (total weight ``w``) into the note's centroid."""
         note = self._notes.get(note_id, {"centroid": None, "count": 0, "tag": None})
-        c = note.get("centroid")
+        # Centroids are float32 arrays, updated in place as a running weighted mean
+        c: Optional[np.ndarray] = note.get("centroid")
         n = int(note.get("count", 0))
-        w = float(weight) if weight > 0 else 1.0
-        if not isinstance(c, list) or not c:
-            new_c = list(vec or [])
+        if c is None or not c.size:
+            c = weighted_sum / np.float32(w)
             new_n = int(w)
         else:
-            if len(c) != len(vec or []):
+            if c.shape != weighted_sum.shape:
                 raise ValueError("vector dimension mismatch")
-            new_c = [ (n*cv + w*vv) / (n + w) for cv, vv in zip(c, vec or []) ]
+            c *= n
+            c += weighted_sum
+            c *= 1.0 / (n + w)
             new_n = int(n + w)
         if tag is not None:
             note["tag"] = tag
-        note["centroid"] = new_c
+        note["centroid"] = c
         note["count"] = new_n
         self._notes[note_id] = note
-        return {"id": note_id, "tag": note.get("tag"), "count": new_n, "vec_dim": len(new_c)}
+        return {"id": note_id, "tag": note.get("tag"), "count": new_n, "vec_dim": len(c)}
+
+    def _embed_text(self, text: str) -> list[float]:
+        """Embedding of ``text`` from the cognitive overlay, cached by content."""
+        cno = self._cog.sp.cno  # type: ignore[attr-defined]
+        # The overlay's output depends on its id and QNF_EMB_DIM, so both
+        # namespace the key; switching either never reuses a stale vector
+        model_id = f"{cno.id}:{os.getenv('QNF_EMB_DIM', '16')}"
+        key = hashlib.blake2b(
+            model_id.encode() + b"\0" + text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        vec = self._embed_cache.get(key)
+        if vec is not None:
+            return vec
+        e = cno.execute(QuantumAtom(data=text))
+        vec = e.metadata.get("neural_vec")
+        if not isinstance(vec, list):
+            raise ValueError("could not compute embedding from text")
+        if len(self._embed_cache) >= EMBED_CACHE_MAX:
+            try:
+                del self._embed_cache[next(iter(self._embed_cache))]
+            except (KeyError, StopIteration, RuntimeError):
+                pass  # another thread evicted first
+        self._embed_cache[key] = vec
+        return vec
 
     # --- Triage tuner controls ---------------------------------------------
     def triage_tuner_get(self) -> Dict[str, Any]:
@@ -783,7 +1307,7 @@ class QNFService:
 
     def triage_tuner_set(self, enabled: Optional[bool] = None, lr: Optional[float] = None, target_p95_ms: Optional[float] = None) -> Dict[str, Any]:
         if enabled is not None:
-            self._tuner["enabled"] = bool(enabled)
+            self._tuner["enabled"] = self._tuner_enabled = bool(enabled)
         if lr is not None:
             self._tuner["lr"] = float(max(0.0, lr))
         if target_p95_ms is not None:
@@ -807,44 +1331,68 @@ class QNFService:
 
     # Stress testing
     def stress_test(self, iterations: int, concurrent: bool) -> Dict[str, Any]:
-        with self._lock:
-            return self._qnf.stress_test(iterations=iterations, concurrent=concurrent)
+        with self._qnf_lock:
+            try:
+                return self._qnf.stress_test(iterations=iterations, concurrent=concurrent)
+            finally:
+                self._publish_status()
 
     # Background jobs (for async stress tests)
     def submit_stress_job(self, iterations: int, concurrent: bool) -> str:
         job_id = f"job_{uuid.uuid4().hex[:8]}"
-        with self._jobs_lock:
-            self._jobs[job_id] = {"status": "queued", "created": time.time()}
+        jobs, futures, lock = self._job_shard(job_id)
+        with lock:
+            jobs[job_id] = {"status": "queued", "created": time.time()}
+            future = futures[job_id] = self._stress_executor.submit(
+                self._run_stress_job, job_id, iterations, concurrent
+            )
+        future.add_done_callback(lambda f: self._finish_job(job_id, f))
+        return job_id
 
-        def _run() -> None:
-            self._update_job(job_id, status="running")
-            try:
-                result = self.stress_test(iterations=iterations, concurrent=concurrent)
-                self._update_job(job_id, status="completed", result=result)
-            except Exception as exc:  # pragma: no cover
-                self._update_job(job_id, status="failed", error=str(exc))
+    def _job_shard(self, job_id: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Future], threading.Lock]:
+        return self._job_shards[hash(job_id) & _JOB_SHARD_MASK]
+
+    def _run_stress_job(self, job_id: str, iterations: int, concurrent: bool) -> Dict[str, Any]:
+        self._update_job(job_id, status="running")
+        return self.stress_test(iterations=iterations, concurrent=concurrent)
+
+    def _finish_job(self, job_id: str, future: Future) -> None:
+        _, futures, lock = self._job_shard(job_id)
+        with lock:
+            futures.pop(job_id, None)
+        if future.cancelled():
+            self._update_job(job_id, status="cancelled")
+        elif future.exception() is not None:
+            self._update_job(job_id, status="failed", error=str(future.exception()))
+        else:
+            self._update_job(job_id, status="completed", result=future.result())
 
-        thread = threading.Thread(target=_run, daemon=True)
-        thread.start()
-        return job_id
+    def cancel_job(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet; running jobs are left alone."""
+        _, futures, lock = self._job_shard(job_id)
+        with lock:
+            future = futures.get(job_id)
+        return future is not None and future.cancel()
 
     def _update_job(
         self, job_id: str, *, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None
     ) -> None:
-        with self._jobs_lock:
-            payload: Dict[str, Any] = self._jobs.get(job_id, {})
+        jobs, _, lock = self._job_shard(job_id)
+        with lock:
+            payload: Dict[str, Any] = jobs.get(job_id, {})
             payload.update({"status": status, "updated": time.time()})
             if result is not None:
                 payload["result"] = result
             if error is not None:
                 payload["error"] = error
-            self._jobs[job_id] = payload
+            jobs[job_id] = payload
 
     def job_status(self, job_id: str) -> Dict[str, Any]:
-        with self._jobs_lock:
-            if job_id not in self._jobs:
+        jobs, _, lock = self._job_shard(job_id)
+        with lock:
+            if job_id not in jobs:
                 return {"status": "not_found", "job_id": job_id}
-            payload = dict(self._jobs[job_id])
+            payload = dict(jobs[job_id])
             payload["job_id"] = job_id
             return payload
 
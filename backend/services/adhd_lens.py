@@ -93,9 +93,9 @@ class ADHDLens:
 
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        # Simple sentence splitting (can be enhanced)
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        return [s.strip() for s in sentences if s.strip()]
+        # The split consumes all whitespace between sentences and the text is
+        # stripped first, so pieces never need re-stripping; only "" is dropped
+        return [s for s in _SENTENCE_BREAK_RE.split(text.strip()) if s]
 
     def _create_chunks(self, sentences: List[str]) -> List[str]:
         """Group sentences into word-count-limited chunks."""
@@ -144,14 +144,7 @@ class ADHDLens:
 
     def _enhance_action_words(self, text: str) -> str:
         """Enhance action-oriented words with emphasis."""
-        enhanced = text
-
-        for word in self.ACTION_WORDS:
-            # Add emphasis to action words (case-insensitive)
-            pattern = r'\b' + re.escape(word) + r'\b'
-            enhanced = re.sub(pattern, f"**{word.upper()}**", enhanced, flags=re.IGNORECASE)
-
-        return enhanced
+        return _ACTION_RE.sub(_emphasize, text)
 
     def reset(self) -> None:
         """Reset lens state for new processing session."""
@@ -167,6 +160,19 @@ class ADHDLens:
         }
 
 
+# Whitespace after sentence-ending punctuation
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+
+# All action words in one case-insensitive alternation, compiled once
+_ACTION_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, ADHDLens.ACTION_WORDS)) + r")\b", re.IGNORECASE
+)
+
+
+def _emphasize(match: "re.Match[str]") -> str:
+    return f"**{match.group(1).upper()}**"
+
+
 # --- Convenience Functions ---
 
 def create_adhd_lens() -> ADHDLens:
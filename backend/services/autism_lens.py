@@ -16,6 +16,15 @@ from typing import List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Bullet markers run together on one line get split onto their own lines
+_INLINE_BULLET_RE = re.compile(r"\s+(?=[*-]\s)")
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+_DEFINITION_RE = re.compile(
+    r"(?P<sentence>(?:^|(?<=[.!?])\s*)(?:A|An|The)?\s*(?P<term>[A-Za-z][A-Za-z0-9_]*)\s+"
+    r"(?P<verb>is|means)\s+(?P<definition>[^.]+)\.)",
+    re.IGNORECASE,
+)
+
 
 class AutismLens:
     """
@@ -31,6 +40,7 @@ class AutismLens:
     CATEGORY_MARKERS = ["📂", "🏷️", "🔍", "📊", "🔗"]
     RELATIONSHIP_INDICATORS = ["→", "↔", "⊂", "⊃", "∋"]
     NON_DEFINITION_TERMS = {"first", "second", "third", "next", "then", "finally"}
+    MAX_DETAILS = 3
     STRUCTURE_PATTERNS = [
         r"^(\d+\.|\-|\•)\s*",
         r"^(First|Second|Third|Next|Then|Finally)\b",
@@ -51,29 +61,31 @@ class AutismLens:
         if not context or not context.strip():
             return context
 
-        normalized = re.sub(r"\s+(?=[*-]\s)", "\n", context.strip())
-        lines = [line.strip() for line in normalized.splitlines() if line.strip()]
+        normalized = _INLINE_BULLET_RE.sub("\n", context.strip())
+        lines = [line for line in map(str.strip, normalized.splitlines()) if line]
         first_line_sentences = self._split_into_sentences(lines[0]) if lines else []
         main_point = first_line_sentences[0] if first_line_sentences else ""
 
         definitions = self._extract_definitions(normalized)
         definition_sentences = {item["source_sentence"] for item in definitions.values()}
 
+        # One pass over the lines that stops once enough details are found;
+        # later lines are never split into sentences
         details: List[str] = []
-        for sentence in first_line_sentences[1:]:
-            if sentence not in definition_sentences:
-                details.append(sentence)
-
-        for line in lines[1:]:
-            if line.startswith(("- ", "* ")):
+        for index, line in enumerate(lines):
+            if len(details) >= self.MAX_DETAILS:
+                break
+            if index == 0:
+                candidates = first_line_sentences[1:]
+            elif line.startswith(("- ", "* ")):
                 details.append(line)
                 continue
-            for sentence in self._split_into_sentences(line):
+            else:
+                candidates = self._split_into_sentences(line)
+            for sentence in candidates:
                 if sentence not in definition_sentences:
                     details.append(sentence)
-
-        if len(details) > 3:
-            details = details[:3]
+        del details[self.MAX_DETAILS:]
 
         transformed_parts = [
             "### 🎯 Main Point",
@@ -104,20 +116,16 @@ class AutismLens:
         return "\n\n".join(transformed_parts)
 
     def _split_into_sentences(self, text: str) -> List[str]:
-        return [part.strip() for part in re.split(r"(?<=[.!?])\s+", text.strip()) if part.strip()]
+        return [part for part in _SENTENCE_BREAK_RE.split(text.strip()) if part]
 
     def _extract_definitions(self, text: str) -> Dict[str, Dict[str, str]]:
-        pattern = re.compile(
-            r"(?P<sentence>(?:^|(?<=[.!?])\s*)(?:A|An|The)?\s*(?P<term>[A-Za-z][A-Za-z0-9_]*)\s+"
-            r"(?P<verb>is|means)\s+(?P<definition>[^.]+)\.)",
-            re.IGNORECASE,
-        )
         definitions: Dict[str, Dict[str, str]] = {}
-        for match in pattern.finditer(text):
+        for match in _DEFINITION_RE.finditer(text):
             term = match.group("term")
-            if term.lower() in self.NON_DEFINITION_TERMS:
+            key = term.lower()
+            if key in self.NON_DEFINITION_TERMS:
                 continue
-            definitions[term.lower()] = {
+            definitions[key] = {
                 "term": term,
                 "definition": match.group("definition"),
                 "source_sentence": match.group("sentence").strip(),
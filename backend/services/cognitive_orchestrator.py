@@ -15,6 +15,7 @@ Architecture:
 from __future__ import annotations
 
 import logging
+import time
 from typing import Dict, Any, Optional, List
 import asyncio
 
@@ -296,7 +297,6 @@ class CognitiveOrchestrator(ChatService):
 
 **Next Step:** Review output and provide feedback for refinement.
 """
-            import time
             response = {
                 "id": f"chat-{int(time.time())}",
                 "model": "sentinel-forge-cognitive",
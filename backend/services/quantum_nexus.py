@@ -6,6 +6,11 @@ from typing import Any, Dict, List
 
 import yaml
 
+try:  # libyaml-backed loader is ~10x faster; fall back to pure Python
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
 
 @dataclass(frozen=True)
 class GreatGreg:
@@ -39,7 +44,7 @@ class QuantumNexus:
     @classmethod
     def from_yaml(cls, path: str | Path) -> "QuantumNexus":
         p = Path(path)
-        data = yaml.safe_load(p.read_text(encoding="utf-8"))
+        data = yaml.load(p.read_text(encoding="utf-8"), Loader=_SafeLoader)
         if "quantum_nexus_blueprint" in data:
             data = data["quantum_nexus_blueprint"]
         return cls(data)
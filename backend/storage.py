@@ -1,14 +1,33 @@
-import json
 import os
 import threading
-from typing import Any, Dict
+from collections import deque
+from typing import Any, Dict, List
+
+import orjson
+
+# Snapshots stay indented for humans; numpy values and non-str keys are
+# serialized instead of failing the whole save
+_SNAPSHOT_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_DELTA_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset, deque)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 class JSONStore:
-    """Thread-safe JSON persistence for minimal state (rules, memory, etc.)."""
+    """Thread-safe JSON persistence for minimal state (rules, memory, etc.).
+
+    Besides the snapshot at ``path``, small updates can be appended to a
+    JSON-lines delta log next to it (``state.jsonl``) and folded into the
+    next snapshot by the caller.
+    """
 
     def __init__(self, path: str = "data/state.json") -> None:
         self.path = path
+        self.log_path = os.path.splitext(path)[0] + ".jsonl"
         self._lock = threading.Lock()
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
 
@@ -17,15 +36,46 @@ class JSONStore:
             if not os.path.exists(self.path):
                 return {}
             try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                with open(self.path, "rb") as f:
+                    return orjson.loads(f.read())
             except Exception:
                 return {}
 
     def save(self, payload: Dict[str, Any]) -> None:
+        body = orjson.dumps(payload, default=_default, option=_SNAPSHOT_OPTS)
         with self._lock:
             tmp = self.path + ".tmp"
-            with open(tmp, "w", encoding="utf-8") as f:
-                json.dump(payload, f, ensure_ascii=False, indent=2)
+            with open(tmp, "wb") as f:
+                f.write(body)
             os.replace(tmp, self.path)
 
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the delta log, one JSON object per line."""
+        if not records:
+            return
+        lines = b"".join(orjson.dumps(r, default=_default, option=_DELTA_OPTS) for r in records)
+        with self._lock:
+            with open(self.log_path, "ab") as f:
+                f.write(lines)
+
+    def replay(self) -> List[Dict[str, Any]]:
+        """Records in the delta log, oldest first; a torn last line is skipped."""
+        with self._lock:
+            if not os.path.exists(self.log_path):
+                return []
+            with open(self.log_path, "rb") as f:
+                raw = f.read().splitlines()
+        records = []
+        for line in raw:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+        return records
+
+    def truncate_log(self) -> None:
+        with self._lock:
+            try:
+                os.remove(self.log_path)
+            except FileNotFoundError:
+                pass
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect  # type: ignore[reportMissingImports]
@@ -59,7 +60,7 @@ async def ws_cognitive(websocket: WebSocket) -> Any:
             "data": {
                 "zone_metrics": zone_metrics,
                 "active_lens": "neurotypical",  # Placeholder for dynamic lens state
-                "timestamp": __import__("time").time(),
+                "timestamp": time.time(),
             }
         }
         await websocket.send_json(initial_state)
@@ -130,7 +131,7 @@ async def websocket_metrics(websocket: WebSocket):
         await websocket.send_json({
             "type": "metrics.initial_state",
             "data": initial_metrics,
-            "timestamp": __import__("time").time(),
+            "timestamp": time.time(),
         })
 
         # Listen for and forward relevant real-time events
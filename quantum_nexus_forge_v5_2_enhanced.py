@@ -12,6 +12,8 @@ import uuid
 import sys
 import os
 import heapq
+import math
+from bisect import bisect_left, insort
 from collections import deque
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -490,28 +492,51 @@ class DynamicPool(DynamicPoolBase):
 class RollingStats:
     """Rolling window statistics for latencies.
 
-    Uses a fixed-size deque; provides mean and simple quantiles on demand.
+    Uses a fixed-size deque plus a running sum and a sorted copy of the
+    window, kept up to date on add(), so mean and quantiles are O(1) reads.
+    process() checks p95 after every execution and status() reads it for
+    every pool, which previously re-sorted the window each time.
     """
 
     def __init__(self, window: int = 500) -> None:
         self.window = max(10, int(window))
         self._data: deque[float] = deque(maxlen=self.window)
+        self._sorted: List[float] = []
+        self._sum = 0.0
+        self._adds = 0
+        # process() runs on several threads during concurrent stress tests
+        self._lock = threading.Lock()
 
     def add(self, value: float) -> None:
-        self._data.append(value)
+        value = float(value)
+        with self._lock:
+            if len(self._data) == self.window:
+                old = self._data[0]
+                self._sum -= old
+                del self._sorted[bisect_left(self._sorted, old)]
+            self._data.append(value)
+            insort(self._sorted, value)
+            self._adds += 1
+            if self._adds % self.window == 0:
+                # Re-derive the sum once per window so rounding cannot drift
+                self._sum = math.fsum(self._data)
+            else:
+                self._sum += value
 
     def mean(self) -> float:
-        if not self._data:
-            return 0.0
-        return sum(self._data) / len(self._data)
+        with self._lock:
+            if not self._data:
+                return 0.0
+            return self._sum / len(self._data)
 
     def percentile(self, p: float) -> float:
-        if not self._data:
-            return 0.0
-        # simple nth-order statistic on a copy (small window); p in [0,100]
-        arr = sorted(self._data)
-        k = max(0, min(len(arr) - 1, int(round((p / 100.0) * (len(arr) - 1)))))
-        return float(arr[k])
+        with self._lock:
+            arr = self._sorted
+            if not arr:
+                return 0.0
+            # simple nth-order statistic; p in [0,100]
+            k = max(0, min(len(arr) - 1, int(round((p / 100.0) * (len(arr) - 1)))))
+            return float(arr[k])
 
     def status(self) -> Dict[str, Any]:
         """Return simple statistics about the rolling window."""
@@ -0,0 +1,30 @@
+"""Compile the Quantum Nexus YAML blueprint into the pickled sidecar the dashboard loads at startup."""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.quantum_nexus import QuantumNexus
+from app.routers.dashboard import BLUEPRINT_PATH
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("blueprint", nargs="?", type=Path, default=BLUEPRINT_PATH)
+    args = parser.parse_args()
+
+    qn = QuantumNexus.from_yaml(args.blueprint)
+    output_path = QuantumNexus.compiled_path(args.blueprint)
+    output_path.write_bytes(pickle.dumps(qn.bp, protocol=5))
+    print(f"Wrote compiled blueprint to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
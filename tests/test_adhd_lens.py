@@ -58,6 +58,12 @@ def test_adhd_lens_action_word_enhancement():
     assert "**START**" in result
 
 
+def test_adhd_lens_enhances_every_action_word():
+    lens = ADHDLens()
+    result = lens._enhance_action_words("Build it, then Run and restart; execute.")
+    assert result == "**BUILD** it, then **RUN** and restart; **EXECUTE**."
+
+
 def test_adhd_lens_response_transformation():
     lens = ADHDLens()
     response = "Here is my response to your query."
@@ -74,6 +80,13 @@ def test_adhd_lens_sentence_splitting():
     assert "Third sentence" in sentences[2]
 
 
+def test_adhd_lens_sentence_splitting_keeps_inner_punctuation():
+    lens = ADHDLens()
+    text = "  Pi is 3.14 roughly!\n\tReally?  Yes  "
+    assert lens._split_into_sentences(text) == ["Pi is 3.14 roughly!", "Really?", "Yes"]
+    assert lens._split_into_sentences("   ") == []
+
+
 def test_adhd_lens_chunk_creation():
     lens = ADHDLens()
     sentences = ["Short sentence."] * 10
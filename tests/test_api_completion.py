@@ -62,3 +62,894 @@ def test_ai_readiness_endpoint_reports_market_state(client):
     assert "blockers" in payload
     assert "ai" in payload
     assert "storage" in payload
+
+
+def test_prometheus_exposition_is_plain_text_and_cached(client):
+    first = client.get("/api/metrics/prom")
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/plain")
+    assert "qnf_total_pools " in first.text
+    assert "qnf_bus_published_total " in first.text
+    assert client.get("/api/metrics/prom").text == first.text
+
+
+def test_similarity_batch_returns_matrix_and_top_k(client):
+    vectors = [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]]
+    full = client.post("/api/cog/matrix/batch", json={"vectors": vectors})
+    assert full.status_code == 200
+    matrix = full.json()["matrix"]
+    assert matrix[0][0] == pytest.approx(1.0)
+    assert matrix[0][1] == pytest.approx(0.0)
+    assert matrix[0][2] == pytest.approx(0.7071, abs=1e-4)
+
+    top = client.post("/api/cog/matrix/batch", json={"vectors": vectors, "top_k": 1}).json()
+    assert [row[0]["index"] for row in top["neighbors"]] == [2, 2, 0]
+
+    ragged = client.post("/api/cog/matrix/batch", json={"vectors": [[1.0], [1.0, 2.0]]})
+    assert ragged.status_code == 400
+
+
+def test_readyz_returns_json_body(client):
+    response = client.get("/api/readyz")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["ready"] is True
+
+
+def test_notes_refused_until_database_is_warm(client):
+    ready = client.app.state.db_ready
+    ready.clear()
+    try:
+        assert client.get("/api/notes").status_code == 503
+        assert client.get("/api/readyz").status_code == 503
+    finally:
+        ready.set()
+    assert client.get("/api/notes").status_code == 200
+
+
+def test_notes_list_is_cached_until_upsert(client, monkeypatch):
+    from backend import api
+
+    calls = []
+
+    async def get_all_notes():
+        calls.append(1)
+        return [{"id": str(len(calls))}]
+
+    monkeypatch.setattr(api.cosmos_repo, "get_all_notes", get_all_notes)
+    monkeypatch.setitem(api._notes_cache, "expires", 0.0)
+    assert client.get("/api/notes").json() == [{"id": "1"}]
+    assert client.get("/api/notes").json() == [{"id": "1"}]
+    assert len(calls) == 1
+
+    saved = client.post("/api/notes/upsert", json={"text": "hello", "tag": "t"})
+    assert saved.status_code == 200
+    assert client.get("/api/notes").json() == [{"id": "2"}]
+
+
+def test_notes_refresh_racing_an_upsert_is_not_cached(monkeypatch):
+    import asyncio
+    from types import SimpleNamespace
+
+    from backend import api
+
+    notes = [{"id": "old"}]
+    fetching = asyncio.Event()
+    release = asyncio.Event()
+
+    async def get_all_notes():
+        snapshot = list(notes)
+        fetching.set()
+        await release.wait()
+        return snapshot
+
+    async def upsert_note(note):
+        notes.append({"id": note.id})
+        return {"id": note.id}
+
+    monkeypatch.setattr(api.cosmos_repo, "get_all_notes", get_all_notes)
+    monkeypatch.setattr(api.cosmos_repo, "upsert_note", upsert_note)
+    monkeypatch.setitem(api._notes_cache, "expires", 0.0)
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+    async def scenario():
+        stale_read = asyncio.create_task(api.notes_list(request))
+        await fetching.wait()
+        saved = await api.notes_upsert(request, {"text": "hello", "tag": "t"})
+        release.set()
+        assert await stale_read == [{"id": "old"}]
+        # The writer sees its own note on the next read
+        assert await api.notes_list(request) == [{"id": "old"}, {"id": saved["id"]}]
+
+    asyncio.run(scenario())
+
+
+def test_dashboard_payloads_are_cached_until_state_changes(client, monkeypatch):
+    from backend import api
+
+    api._dashboard_cache.clear()
+    first = client.get("/api/dashboard/sentinel").json()
+    monkeypatch.setattr(api.service, "profile_get", lambda: {"codename": "Changed"})
+    assert client.get("/api/dashboard/sentinel").json() == first
+
+    monkeypatch.setattr(api.service, "state_save", lambda: {"ok": True})
+    assert client.post("/api/state/save").status_code == 200
+    assert client.get("/api/dashboard/sentinel").json()["codename"] == "Changed"
+    api._dashboard_cache.clear()
+
+
+def test_dashboard_rebuild_during_upgrade_is_not_cached(monkeypatch):
+    import asyncio
+    import threading
+
+    from backend import api
+
+    profile = {"codename": "Before"}
+    applying = threading.Event()
+    release = threading.Event()
+
+    def upgrade_apply():
+        applying.set()
+        release.wait(2.0)
+        profile["codename"] = "After"
+        return {"status": "ok"}
+
+    async def build():
+        return dict(profile)
+
+    monkeypatch.setattr(api.service, "upgrade_apply", upgrade_apply)
+    api._dashboard_cache.clear()
+
+    async def scenario():
+        upgrade = asyncio.create_task(api.upgrade_apply())
+        await asyncio.to_thread(applying.wait, 2.0)
+        # A poll while the upgrade runs sees the old profile...
+        body, _ = await api._dashboard_cached("race", build)
+        assert b"Before" in body
+        release.set()
+        await upgrade
+        # ...but once it returns, the next poll rebuilds
+        body, _ = await api._dashboard_cached("race", build)
+        assert b"After" in body
+
+    asyncio.run(scenario())
+    api._dashboard_cache.clear()
+
+
+def test_eval_scores_recomputed_only_when_file_changes(tmp_path, monkeypatch):
+    import os
+
+    from backend import api
+
+    results = tmp_path / "eval_results.json"
+    results.write_text('[{"success": true, "scores": {"relevance": 2, "coherence": 4, "groundedness": 3}}, {"success": false}]')
+    monkeypatch.setattr(api, "EVAL_RESULTS_FILE", results)
+    monkeypatch.setattr(api, "_eval_cache", {"mtime": None, "value": None})
+    assert api._get_eval_scores() == {"relevance": 2.0, "coherence": 4.0, "groundedness": 3.0}
+
+    calls = []
+    monkeypatch.setattr(api, "_eval_averages", lambda data: calls.append(data) or {"relevance": 1.0})
+    api._get_eval_scores()
+    assert calls == []
+
+    stat = results.stat()
+    os.utime(results, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert api._get_eval_scores() == {"relevance": 1.0}
+    assert len(calls) == 1
+
+
+def test_eval_averages_skip_failed_results():
+    from backend.api import _eval_averages
+
+    results = [
+        {"success": True, "scores": {"relevance": 1.0, "coherence": 2.0, "groundedness": 3.0}},
+        {"success": True, "scores": {"relevance": 3.0, "coherence": 4.0, "groundedness": 5.0}},
+        {"success": False, "scores": {"relevance": 100.0, "coherence": 100.0, "groundedness": 100.0}},
+        {"success": True},
+    ]
+    assert _eval_averages(results) == {"relevance": 2.0, "coherence": 3.0, "groundedness": 4.0}
+    assert _eval_averages([{"success": False}]) == {"relevance": 0.0, "coherence": 0.0, "groundedness": 0.0}
+
+
+def test_glyph_validate_reply_and_request_validation(client):
+    response = client.post("/api/glyphs/validate", json={"sequence": ["nope"]})
+    assert response.status_code == 200
+    assert response.json() == {"valid": False, "reason": "Unknown glyph in sequence"}
+    assert client.post("/api/glyphs/validate", json={"sequence": "nope"}).status_code == 422
+
+
+def test_activity_stream_sends_counts_then_new_events(monkeypatch):
+    import asyncio
+    import threading
+
+    import orjson
+
+    from backend import api
+    from backend.eventbus import bus
+    from backend.service import service
+
+    class Request:
+        async def is_disconnected(self):
+            return False
+
+    counted = []
+    activity_counts = api._activity_counts
+    monkeypatch.setattr(api, "_activity_counts", lambda: counted.append(1) or activity_counts())
+
+    def parse(message):
+        event, data = message.split(b"\n")[:2]
+        return event, orjson.loads(data[len(b"data: "):])
+
+    async def scenario():
+        service.add_event({"type": "activity.backlog"})
+        stream = api._activity_sse_stream(Request())
+        event, data = parse(await stream.__anext__())
+        assert event == b"event: counts"
+        assert "intents" in data
+
+        # Logged from another thread, the way sync routes do
+        threading.Thread(target=service.add_event, args=({"type": "activity.test"},)).start()
+        event, data = parse(await asyncio.wait_for(stream.__anext__(), 2.0))
+        assert event == b"event: events"
+        assert data == [{"type": "activity.test"}]
+        # Plain logged events never recompute the counts
+        assert len(counted) == 1
+
+        service._intent_counts["stream-test"] = 1
+        bus.publish({"type": "cog.intent", "data": {}})
+        event, data = parse(await asyncio.wait_for(stream.__anext__(), 2.0))
+        assert event == b"event: counts"
+        assert data["intents"]["stream-test"] == 1
+        await stream.aclose()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        service._intent_counts.pop("stream-test", None)
+    assert service._event_notifiers == ()
+
+
+def test_cors_preflight_is_cacheable(client):
+    response = client.options(
+        "/api/dashboard/metrics",
+        headers={
+            "Origin": "https://dashboard.example",
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": "X-API-Key",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-max-age"] == "86400"
+    assert "X-API-Key" in response.headers["access-control-allow-headers"]
+
+
+def test_dashboard_payloads_support_conditional_get(client):
+    first = client.get("/api/dashboard/sentinel")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "max-age=2"
+
+    cached = client.get("/api/dashboard/sentinel", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get("/api/dashboard/sentinel", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_dashboard_metrics_etag_survives_a_rebuild(client, monkeypatch):
+    import time
+
+    from backend import api
+
+    monkeypatch.setattr(api, "DASHBOARD_CACHE_TTL", 0.05)
+    api._dashboard_cache.clear()
+    first = client.get("/api/dashboard/metrics")
+    time.sleep(0.1)  # past the TTL: the payload and its timestamp are rebuilt
+    cached = client.get("/api/dashboard/metrics", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    time.sleep(0.1)
+    rebuilt = client.get("/api/dashboard/metrics")
+    assert rebuilt.headers["etag"] == first.headers["etag"]
+    assert rebuilt.json()["timestamp"] > first.json()["timestamp"]
+    api._dashboard_cache.clear()
+
+
+def test_status_reads_do_not_wait_for_service_lock(client):
+    import threading
+
+    from backend.service import service
+
+    before = service.status()
+    service.create_pool("seqlock_test_pool", 1)
+    after = service.status()
+    assert after is not before
+    assert "seqlock_test_pool" in after.get("pool_status", {})
+
+    # A writer holding the lock (e.g. a long stress test) must not block readers
+    held, release = threading.Event(), threading.Event()
+
+    def writer():
+        with service._qnf_lock:
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert held.wait(5)
+        assert service.status() is after
+        assert "pools" in service.metrics()
+    finally:
+        release.set()
+        thread.join()
+
+
+def test_guild_membership_is_consistent_under_concurrency(client):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.service import service
+
+    players = [f"p{i}" for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda p: service.add_guild_member("lock_test_guild", p), players))
+        list(pool.map(lambda p: service.add_friendship("lock_test_hub", p), players))
+
+    assert service.get_guild("lock_test_guild")["members"] == sorted(players)
+    assert service.list_friendships("lock_test_hub")["friends"] == sorted(players)
+    # Re-adding keeps the maintained order and uniqueness
+    assert service.add_guild_member("lock_test_guild", "p5")["members"] == sorted(players)
+    service.add_friendship("p7", "lock_test_hub")
+    assert service.list_friendships("lock_test_hub")["friends"] == sorted(players)
+
+
+def test_ops_page_is_cacheable_html(client):
+    response = client.get("/api/ops")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.headers["cache-control"] == "public, max-age=300"
+    assert "QNF Ops" in response.text
+
+
+def test_event_stream_batches_pending_events_into_one_chunk():
+    from backend.api import _ndjson_stream
+    from backend.service import service
+
+    service.add_event({"type": "batch.test", "n": 1})
+    service.add_event({"type": "batch.test", "n": 2})
+    chunk = next(_ndjson_stream())
+    lines = chunk.splitlines()
+    assert lines[-2:] == [b'{"type":"batch.test","n":1}', b'{"type":"batch.test","n":2}']
+
+
+def test_event_batches_keep_up_after_ring_wraps():
+    from backend.service import EVENT_RING_SIZE, QNFService
+
+    svc = QNFService()
+    for n in range(EVENT_RING_SIZE + 10):
+        svc.add_event({"n": n})
+    start = svc.event_count()
+    assert start == EVENT_RING_SIZE + 10
+    assert [e["n"] for e in svc.recent_events(3)] == [start - 3, start - 2, start - 1]
+
+    batches = svc.event_batches(start)
+    svc.add_event({"n": "fresh"})
+    assert next(batches) == [{"n": "fresh"}]
+
+    # A consumer lapped by the ring only sees what is still buffered
+    lagging = next(svc.event_batches(0))
+    assert len(lagging) == EVENT_RING_SIZE
+    assert lagging[-1] == {"n": "fresh"}
+
+
+def test_seed_views_and_resonance_helpers(tmp_path):
+    from backend.service import QNFService, _match_seeds, _resonance, _seed_boost
+    from backend.storage import JSONStore
+
+    svc = QNFService()
+    svc._store = JSONStore(str(tmp_path / "state.json"))
+    svc.glyphs_pack({"shapes": {"orbit": {"topic": "astro", "seeds": ["Nebula"]}}})
+    assert svc._seed_view == frozenset({"nebula"})
+    assert svc._alias_view["nebula"] == "astro"
+
+    svc.seeds_add(["deep space", "deep space probe"])
+    assert svc._seed_view == frozenset({"nebula"})
+    hits = _match_seeds("launch the deep  space probe at a nebula", svc._seed_view, svc._seed_phrases)
+    assert hits == {"nebula", "deep space probe"}
+    assert _match_seeds("deepspace nebulas", svc._seed_view, svc._seed_phrases) == frozenset()
+
+    assert _seed_boost(0.5, 1) == pytest.approx(0.6)
+    assert _seed_boost(0.9, 5) == 1.0
+    res = _resonance({"reflective_refs": [{"score": 0.5}], "ethics": {"flag": False}}, thread_len=25)
+    assert res["score"] == pytest.approx((0.5 + 0.0 + 1.0 + 0.5) / 5)
+
+
+def test_runtime_state_is_persisted_in_the_background(tmp_path, monkeypatch):
+    import time
+
+    from backend import service as service_module
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    monkeypatch.setattr(service_module, "PERSIST_DEBOUNCE_S", 0.05)
+    svc = QNFService()
+    saves = []
+    store = JSONStore(str(tmp_path / "state.json"))
+    monkeypatch.setattr(store, "save", lambda payload: saves.append(payload))
+    svc._store = store
+
+    for word in ("alpha", "beta", "gamma"):
+        svc.seeds_add([word])
+    assert saves == []  # nothing written on the request path
+    deadline = time.monotonic() + 2
+    while not saves and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(saves) == 1
+    assert saves[0]["seeds"] == ["alpha", "beta", "gamma"]
+
+    # Unchanged state is not rewritten
+    svc.seeds_add(["alpha"])
+    time.sleep(0.2)
+    assert len(saves) == 1
+
+
+def test_topic_cooccurrence_matrix_round_trips(tmp_path):
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    svc = QNFService()
+    with svc._threads_lock:
+        for _ in range(3):
+            svc._count_cooccurrence(["a", "b"])
+        svc._count_cooccurrence(["a", "c", "a"])
+        svc._count_cooccurrence([f"t{i}" for i in range(20)])  # grows the matrix
+    assert svc.cog_matrix(top_k=1)["matrix"]["a"] == [("b", 3)]
+    assert svc.cog_matrix()["matrix"]["a"] == [("b", 3), ("c", 1)]
+
+    store = JSONStore(str(tmp_path / "state.json"))
+    svc._store = store
+    svc.state_save()
+    restored = QNFService()
+    restored._store = store
+    restored._load_state_if_present()
+    assert restored.cog_matrix()["matrix"] == svc.cog_matrix()["matrix"]
+
+
+def test_cog_signature_is_memoized_and_order_sensitive():
+    from backend import service as service_module
+    from backend.service import _signature
+    from sentinel_sync import _glyphic_signature
+
+    service_module._signature_cache.clear()
+    sig = _signature("status please", "status", ("ops", "health"))
+    assert sig == _glyphic_signature({"text": "status please", "intent": "status", "topics": ["ops", "health"]})
+    assert _signature("status please", "status", ("ops", "health")) is sig
+    assert _signature("status please", "status", ("health", "ops")) != sig
+    # Keys hold a fixed-size digest, never the prompt itself
+    assert all(len(key[0]) == 16 for key in service_module._signature_cache)
+
+
+def test_cog_signature_cache_is_bounded(monkeypatch):
+    from backend import service as service_module
+    from backend.service import _signature
+
+    monkeypatch.setattr(service_module, "SIGNATURE_CACHE_MAX", 2)
+    service_module._signature_cache.clear()
+    first = _signature("a" * 100_000, "chat", ())
+    _signature("b", "chat", ())
+    _signature("c", "chat", ())
+    assert len(service_module._signature_cache) == 2
+    assert _signature("a" * 100_000, "chat", ()) is not first
+    service_module._signature_cache.clear()
+
+
+def test_restored_threads_keep_a_bounded_item_window(tmp_path):
+    from backend.service import THREAD_ITEMS_MAX, QNFService
+    from backend.storage import JSONStore
+
+    store = JSONStore(str(tmp_path / "state.json"))
+    items = [{"text": str(n)} for n in range(THREAD_ITEMS_MAX + 50)]
+    store.save({"threads": {"thr_1": {"id": "thr_1", "topic": "ops", "items": items}}})
+    svc = QNFService()
+    svc._store = store
+    svc._load_state_if_present()
+
+    thread = svc._threads["thr_1"]["items"]
+    assert len(thread) == THREAD_ITEMS_MAX and thread[0] == {"text": "50"}
+    thread.append({"text": "new"})
+    assert len(thread) == THREAD_ITEMS_MAX
+    assert svc.cog_thread("thr_1", limit=2)["items"] == [{"text": str(THREAD_ITEMS_MAX + 49)}, {"text": "new"}]
+    assert svc._runtime_state()["threads"]["thr_1"]["items"][-1] == {"text": "new"}
+
+
+def test_recent_events_returns_only_the_requested_tail():
+    from backend.service import QNFService
+
+    svc = QNFService()
+    assert svc.recent_events(10) == []
+    for n in range(3):
+        svc.add_event({"n": n})
+    assert svc.recent_events(10) == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert svc.recent_events(2) == [{"n": 1}, {"n": 2}]
+    assert svc.recent_events(0) == []
+
+
+def test_build_env_is_resolved_once(monkeypatch):
+    from backend.service import QNFService
+
+    monkeypatch.setenv("QNF_VERSION", "1.2.3")
+    monkeypatch.setenv("QNF_POOL_P1_VERSION", "p-1")
+    svc = QNFService()
+    monkeypatch.setenv("QNF_VERSION", "changed")
+    assert svc.build_info()["version"] == "1.2.3"
+
+    assert svc._per_pool_build("p1")["version"] == "p-1"
+    monkeypatch.setenv("QNF_POOL_P1_VERSION", "p-2")
+    assert svc._per_pool_build("p1")["version"] == "p-1"
+    svc.rebuild(1, 1)  # pools rebuilt: per-pool build is looked up again
+    assert svc._per_pool_build("p1")["version"] == "p-2"
+
+
+def test_metrics_heap_bytes_use_entry_size(monkeypatch):
+    from backend.service import QNFService
+
+    monkeypatch.setenv("QNF_HEAP_ENTRY_BYTES", "1048576")
+    svc = QNFService()
+    svc.create_pool("heap_a", 2)
+    svc.create_pool("heap_b", 1)
+    svc.process({"probe": 1}, "heap_a")
+    pools = svc.metrics()["pools"]
+    assert pools
+    for pool in pools.values():
+        assert pool["heap_mib"] == pytest.approx(float(pool["heap_size"] or 0))
+    assert svc.metrics()["global_heap_mib"] == pytest.approx(sum(float(p["heap_size"] or 0) for p in pools.values()))
+
+
+def test_cog_messages_are_logged_as_deltas_and_replayed(tmp_path, monkeypatch):
+    import time
+    from types import SimpleNamespace
+
+    from backend import service as service_module
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    monkeypatch.setattr(service_module, "PERSIST_DEBOUNCE_S", 0.02)
+    store = JSONStore(str(tmp_path / "state.json"))
+
+    def fresh():
+        svc = QNFService()
+        svc._store = store
+        svc._load_state_if_present()
+        monkeypatch.setattr(svc._cog, "process", lambda data: SimpleNamespace(
+            input=data, output=data, signature="", processing_time=0.0,
+            metadata={"intent": {"label": "help"}, "topics": ["ops", "health"]},
+        ))
+        return svc
+
+    svc = fresh()
+    svc.state_save()
+    for n in range(3):
+        svc.cog_process(f"message {n}")
+    deadline = time.monotonic() + 2
+    while len(store.replay()) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [r["seq"] for r in store.replay()] == [1, 2, 3]
+    assert store.load()["log_seq"] == 0
+
+    replayed = fresh()
+    assert replayed.cog_stats()["intents"] == {"help": 3}
+    assert replayed.cog_matrix()["matrix"]["ops"] == [("health", 3)]
+    assert [t["count"] for t in replayed.cog_threads()["threads"]] == [3]
+
+    # Compaction folds the log into the snapshot without double counting
+    replayed.state_save()
+    assert store.replay() == []
+    assert fresh().cog_stats()["intents"] == {"help": 3}
+
+
+def test_state_save_during_delta_flush_keeps_every_message(tmp_path, monkeypatch):
+    import threading
+    import time
+    from types import SimpleNamespace
+
+    from backend import service as service_module
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    monkeypatch.setattr(service_module, "PERSIST_DEBOUNCE_S", 0.0)
+    store = JSONStore(str(tmp_path / "state.json"))
+
+    def fresh():
+        svc = QNFService()
+        svc._store = store
+        svc._load_state_if_present()
+        monkeypatch.setattr(svc._cog, "process", lambda data: SimpleNamespace(
+            input=data, output=data, signature="", processing_time=0.0,
+            metadata={"intent": {"label": "help"}, "topics": ["ops"]},
+        ))
+        return svc
+
+    svc = fresh()
+    save = store.save
+    saving = threading.Event()
+
+    def slow_save(data):
+        # Messages arrive and the writer wakes while the snapshot is written
+        saving.set()
+        time.sleep(0.2)
+        save(data)
+
+    monkeypatch.setattr(store, "save", slow_save)
+    svc.cog_process("before")
+    saver = threading.Thread(target=svc.state_save)
+    saver.start()
+    assert saving.wait(2.0)
+    for n in range(5):
+        svc.cog_process(f"during {n}")
+    saver.join()
+
+    deadline = time.monotonic() + 2
+    while (svc._pending_deltas or len(store.replay()) < 5) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fresh().cog_stats()["intents"] == {"help": 6}
+
+
+def test_glyphs_interpret_normalizes_every_separator():
+    from backend.service import QNFService
+
+    svc = QNFService()
+    svc._alias_view = {"core": "cognition"}
+    out = svc.glyphs_interpret("🜂 → core—🚀-> ")
+    assert out["tokens"] == ["APEX", "CORE", "EMIT"]
+    assert out["topics"] == ["cognition"]
+    assert out["route"] == {"action": "process", "target": "local"}
+    assert svc.glyphs_interpret("fire->🌳")["route"]["action"] == "help"
+
+
+def test_seed_aliases_are_added_to_topics_once(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    svc = QNFService()
+    svc._store = JSONStore(str(tmp_path / "state.json"))
+    svc.glyphs_pack({"shapes": {"sky": {"topic": "astro", "seeds": ["moon", "star", "comet"]}}})
+    monkeypatch.setattr(svc._cog, "process", lambda data: SimpleNamespace(
+        input=data, output=data, signature="", processing_time=0.0,
+        metadata={"intent": {"label": "help"}, "topics": ["astro"]},
+    ))
+    meta = svc.cog_process("moon star comet")["metadata"]
+    assert meta["seeds"] == ["comet", "moon", "star"]
+    assert meta["topics"] == ["astro", "seeded"]
+
+
+def test_json_store_round_trips_with_orjson(tmp_path):
+    import numpy as np
+
+    from backend.storage import JSONStore
+
+    store = JSONStore(str(tmp_path / "state.json"))
+    store.save({"seeds": {"b"}, "count": np.int32(3), "text": "naïve ✓"})
+    assert store.load() == {"seeds": ["b"], "count": 3, "text": "naïve ✓"}
+    assert (tmp_path / "state.json").read_text(encoding="utf-8").startswith("{\n  ")
+
+    store.append([{"seq": 1}, {"seq": 2}])
+    with open(store.log_path, "ab") as f:
+        f.write(b'{"seq": 3')  # torn write from a crash
+    assert store.replay() == [{"seq": 1}, {"seq": 2}]
+
+
+def test_triage_tuner_state_follows_setter():
+    from backend.service import QNFService
+
+    svc = QNFService()
+    assert svc.metrics()["triage_tuner"] == {"enabled": False}
+    svc.triage_tuner_set(enabled=True, target_p95_ms=40.0)
+    state = svc.metrics()["triage_tuner"]
+    assert state["enabled"] is True and state["target_ms"] == 40.0
+    svc.triage_tuner_set(enabled=False)
+    assert svc.metrics()["triage_tuner"] == {"enabled": False}
+
+
+def test_cog_intent_is_published_off_the_request_thread(tmp_path, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    from backend import service as service_module
+    from backend.service import QNFService
+    from backend.storage import JSONStore
+
+    published = []
+    done = threading.Event()
+
+    def fake_publish(payload, **kwargs):
+        # Other background publishers may still be running from earlier tests.
+        if payload.get("type") != "cog.intent":
+            return
+        published.append((payload, threading.current_thread().name))
+        done.set()
+
+    monkeypatch.setattr(service_module.bus, "publish", fake_publish)
+    svc = QNFService()
+    svc._store = JSONStore(str(tmp_path / "state.json"))
+    monkeypatch.setattr(svc._cog, "process", lambda data: SimpleNamespace(
+        input=data, output=data, signature="", processing_time=0.0,
+        metadata={"intent": {"label": "status"}, "topics": ["ops"]},
+    ))
+    svc.cog_process("how are things")
+    assert done.wait(2.0)
+    payload, thread_name = published[0]
+    assert payload["type"] == "cog.intent"
+    assert payload["data"]["intent"] == "status"
+    assert thread_name == "qnf-publish"
+
+
+def test_route_hint_table():
+    from backend.service import QNFService
+
+    svc = QNFService()
+    hint = svc._route_hint
+    assert hint(intent="HELP", topics=[], confidence=0.0) == {"action": "help", "target": "local"}
+    assert hint(intent="benchmark", topics=[], confidence=0.0) == {"action": "stress_test", "target": "local"}
+    assert hint(intent="update", topics=[], confidence=0.0) == {"action": "upgrade", "target": "llm"}
+    assert hint(intent="", topics=[], confidence=0.0) == {"action": "process", "target": "local"}
+
+
+def test_notes_upsert_keeps_a_running_centroid():
+    import numpy as np
+    import pytest
+
+    from backend.service import QNFService
+
+    svc = QNFService()
+    svc.notes_upsert("n1", vec=[1.0, 0.0, 2.0])
+    out = svc.notes_upsert("n1", vec=[3.0, 2.0, 0.0], weight=3.0)
+    assert out == {"id": "n1", "tag": None, "count": 4, "vec_dim": 3}
+    centroid = svc._notes["n1"]["centroid"]
+    assert centroid.dtype == np.float32
+    np.testing.assert_allclose(centroid, [2.5, 1.5, 0.5])
+    assert svc.notes_list() == [{"id": "n1", "tag": None, "count": 4, "vec_dim": 3}]
+    with pytest.raises(ValueError):
+        svc.notes_upsert("n1", vec=[1.0, 2.0])
+
+
+def test_notes_upsert_caches_text_embeddings(monkeypatch):
+    import os
+    from types import SimpleNamespace
+
+    from backend.service import QNFService
+
+    svc = QNFService()
+    cno = svc._cog.sp.cno
+    calls = []
+
+    def execute(atom):
+        calls.append(atom.data)
+        dim = int(os.environ.get("QNF_EMB_DIM", "16"))
+        return SimpleNamespace(metadata={"neural_vec": [float(len(atom.data))] * dim})
+
+    monkeypatch.setattr(cno, "execute", execute)
+
+    svc.notes_upsert("a", text="same words")
+    svc.notes_upsert("b", text="same words")
+    assert calls == ["same words"]
+    assert svc._notes["a"]["centroid"].tolist() == svc._notes["b"]["centroid"].tolist()
+
+    monkeypatch.setenv("QNF_EMB_DIM", "8")
+    assert svc.notes_upsert("c", text="same words")["vec_dim"] == 8
+    assert len(calls) == 2
+
+
+def test_notes_upsert_many_folds_each_note_once(monkeypatch):
+    import numpy as np
+    import pytest
+
+    from backend.service import QNFService
+
+    svc = QNFService()
+    texts = []
+    monkeypatch.setattr(svc, "_embed_text", lambda text: texts.append(text) or [float(len(text)), 0.0])
+    svc.notes_upsert("a", vec=[0.0, 4.0])
+
+    out = svc.notes_upsert_many([
+        {"id": "a", "vec": [4.0, 0.0], "weight": 3.0},
+        {"id": "b", "text": "abc", "tag": "t"},
+        {"id": "b", "text": "abc"},
+    ])
+    assert out == [
+        {"id": "a", "tag": None, "count": 4, "vec_dim": 2},
+        {"id": "b", "tag": "t", "count": 2, "vec_dim": 2},
+    ]
+    assert texts == ["abc"]
+    np.testing.assert_allclose(svc._notes["a"]["centroid"], [3.0, 1.0])
+    np.testing.assert_allclose(svc._notes["b"]["centroid"], [3.0, 0.0])
+
+    with pytest.raises(ValueError):
+        svc.notes_upsert_many([{"id": "c", "vec": [1.0]}, {"id": "a", "vec": [1.0]}])
+    assert "c" not in svc._notes
+
+    out = svc.notes_upsert_many([{"id": "d", "vec": [1.0, 1.0], "weight": None}])
+    assert out == [{"id": "d", "tag": None, "count": 1, "vec_dim": 2}]
+    with pytest.raises(ValueError):
+        svc.notes_upsert_many([{"id": "d", "vec": [1.0, 1.0], "weight": [2]}])
+
+
+def test_stress_jobs_run_on_the_shared_executor(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from backend.service import QNFService
+
+    svc = QNFService()
+    svc._stress_executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    threads = []
+
+    def stress_test(iterations, concurrent):
+        threads.append(threading.current_thread())
+        release.wait(2.0)
+        return {"iterations": iterations}
+
+    monkeypatch.setattr(svc, "stress_test", stress_test)
+    first = svc.submit_stress_job(3, False)
+    second = svc.submit_stress_job(5, False)
+    assert svc.cancel_job(second)
+    assert svc.job_status(second)["status"] == "cancelled"
+    assert not svc.cancel_job("job_missing")
+
+    release.set()
+    svc._stress_executor.shutdown(wait=True)
+    status = svc.job_status(first)
+    assert status["status"] == "completed"
+    assert status["result"] == {"iterations": 3}
+    assert len(threads) == 1 and threads[0] is not threading.current_thread()
+    assert all(not futures for _, futures, _ in svc._job_shards)
+
+
+def test_jobs_are_spread_across_shards():
+    from backend.service import QNFService
+
+    svc = QNFService()
+    for i in range(64):
+        jobs, _, lock = svc._job_shard(f"job_{i:08x}")
+        with lock:
+            jobs[f"job_{i:08x}"] = {"status": "queued"}
+    assert sum(1 for jobs, _, _ in svc._job_shards if jobs) > 1
+    assert svc.job_status("job_0000002a") == {"status": "queued", "job_id": "job_0000002a"}
+    assert svc.job_status("job_missing")["status"] == "not_found"
+
+
+def test_chat_times_out_with_504(client, monkeypatch):
+    import asyncio
+
+    from backend import api
+
+    async def stalled(**_kwargs):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(api._get_orchestrator(), "process_message", stalled)
+    monkeypatch.setattr(api.settings, "CHAT_TIMEOUT_S", 0.05)
+    response = client.post("/api/chat", json={"messages": [{"role": "user", "content": "hi"}]})
+    assert response.status_code == 504
+    assert "x-response-time-ms" in response.headers
+
+
+def test_readyz_failure_body_is_valid_json(client, monkeypatch):
+    from backend import api
+
+    def broken():
+        raise RuntimeError("status unavailable")
+
+    monkeypatch.setattr(api.service, "status", broken)
+    response = client.get("/api/readyz")
+    assert response.status_code == 503
+    assert response.content == b'{"ready":false}'
+
+
+def test_large_text_responses_are_gzipped(client):
+    response = client.get("/api/metrics/prom", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert "qnf_total_pools" in response.text
@@ -75,3 +75,19 @@ def test_full_transformation(lens):
     assert "- **platform**: a base for building applications." in result
     assert "3 supporting detail(s)" in result
     assert "1 definition(s)" in result
+
+def test_details_are_capped_across_lines(lens):
+    text = "Main point here. One. Two.\nThree. Four.\n- Five.\nSix."
+    result = lens.transform_context(text)
+
+    assert "1. One." in result
+    assert "2. Two." in result
+    assert "3. Three." in result
+    assert "Four." not in result
+    assert "3 supporting detail(s)" in result
+
+def test_definitions_are_keyed_case_insensitively(lens):
+    definitions = lens._extract_definitions("An API is a contract. Then it is used. The api means an interface.")
+
+    assert list(definitions) == ["api"]
+    assert definitions["api"]["definition"] == "an interface"
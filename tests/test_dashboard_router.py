@@ -0,0 +1,184 @@
+import asyncio
+import os
+import pickle
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cache import StaleWhileRevalidate
+from app.main import app
+from app.quantum_nexus import QuantumNexus
+from app.routers.dashboard import BLUEPRINT_PATH
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_metrics_reports_lattice_context(client):
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["dependency"]["id"] == "dep_AllFiles_L2R_to_Z1"
+    assert payload["great_greg"]["origin"]["cell"] == "A1"
+    assert payload["great_greg"]["terminus"]["cell"] == "Z1"
+    assert "timestamp" in payload
+
+
+def test_resolve_accepts_node_prefixed_reference(client):
+    response = client.get("/api/resolve/Node_3:P1")
+    assert response.status_code == 200
+    assert response.json()["node_id"] == "Node_3"
+
+
+def test_resolve_unknown_cell_is_404(client):
+    assert client.get("/api/resolve/ZZ99").status_code == 404
+
+
+def test_diagonal_trace_follows_dependency_path(client):
+    response = client.get("/api/lattice/diagonal")
+    assert response.status_code == 200
+    cells = [step["cell"] for step in response.json()["path"]]
+    assert cells == ["A1", "H1", "O1", "V1"]
+
+
+def test_lateral_trace_runs_origin_to_terminus(client):
+    response = client.get("/api/lattice/lateral")
+    assert response.status_code == 200
+    cells = [step["cell"] for step in response.json()["path"]]
+    assert cells[0] == "A1"
+    assert cells[-1] == "Z1"
+
+
+def test_dependency_trace_and_unknown_dependency(client):
+    response = client.get("/api/dependency/dep_A1_to_V1")
+    assert response.status_code == 200
+    assert len(response.json()["traced_path"]) == 4
+    assert client.get("/api/dependency/dep_unknown").status_code == 404
+
+
+def test_dashboard_page_renders_diagonal_path(client):
+    response = client.get("/dashboard")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert "dep_A1_to_V1" in response.text
+    assert "AI Mind Map Generation" in response.text
+
+
+def test_lattice_routes_support_conditional_get(client):
+    first = client.get("/api/lattice/lateral")
+    etag = first.headers["etag"]
+    assert "max-age" in first.headers["cache-control"]
+
+    cached = client.get("/api/lattice/lateral", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get("/api/lattice/lateral", headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_metrics_etag_ignores_timestamp(client):
+    first = client.get("/api/metrics")
+    second = client.get("/api/metrics")
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["cache-control"] == "public, max-age=5"
+
+
+def test_cache_stats_without_redis(client):
+    response = client.get("/api/cache")
+    assert response.status_code == 200
+    assert response.json()["backend"] == "local"
+
+
+def test_compiled_sidecar_is_preferred_only_when_fresh(tmp_path):
+    blueprint = tmp_path / "blueprint.yaml"
+    blueprint.write_bytes(BLUEPRINT_PATH.read_bytes())
+    compiled = QuantumNexus.compiled_path(blueprint)
+    compiled.write_bytes(pickle.dumps({"dependencies": [{"id": "dep_compiled"}]}, protocol=5))
+
+    assert QuantumNexus.load(blueprint).dependency_ids() == ["dep_compiled"]
+
+    # A YAML edit newer than the sidecar falls back to parsing the YAML
+    stat = compiled.stat()
+    os.utime(blueprint, (stat.st_atime, stat.st_mtime + 10))
+    assert "dep_A1_to_V1" in QuantumNexus.load(blueprint).dependency_ids()
+
+
+def test_lateral_trace_serves_precompressed_gzip(client):
+    compressed = client.get("/api/lattice/lateral", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    identity = client.get("/api/lattice/lateral", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert compressed.json() == identity.json()
+
+
+def test_gzip_refused_with_zero_quality_is_not_sent(client):
+    from app.middleware import accepts_gzip
+
+    assert accepts_gzip("gzip, deflate")
+    assert accepts_gzip("br;q=1.0, *;q=0.5")
+    assert not accepts_gzip("gzip;q=0, identity")
+    assert not accepts_gzip("identity, *;q=0")
+
+    for path in ("/api/lattice/lateral", "/dashboard"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+
+def test_gzip_and_identity_bodies_have_distinct_etags(client):
+    gzipped = client.get("/api/lattice/lateral", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/api/lattice/lateral", headers={"Accept-Encoding": "identity"})
+    assert gzipped.headers["etag"] != identity.headers["etag"]
+    assert gzipped.headers["etag"].endswith('-gz"')
+    assert identity.headers["vary"] == "Accept-Encoding"
+    assert client.get("/dashboard", headers={"Accept-Encoding": "gzip"}).headers["vary"] == "Accept-Encoding"
+
+    # A validator for one coding never revalidates the other
+    crossed = client.get(
+        "/api/lattice/lateral",
+        headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert crossed.status_code == 200
+    same = client.get(
+        "/api/lattice/lateral",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert same.status_code == 304
+
+
+def test_stale_while_revalidate_serves_stale_then_refreshes():
+    builds = []
+
+    async def build():
+        builds.append(len(builds))
+        return str(len(builds)).encode()
+
+    async def scenario():
+        swr = StaleWhileRevalidate(build, expire=0.05, stale=10)
+        assert await swr.get() == b"1"
+        assert await swr.get() == b"1"  # fresh
+        await asyncio.sleep(0.06)
+        assert await swr.get() == b"1"  # stale: served while refreshing
+        await asyncio.sleep(0.01)
+        assert await swr.get() == b"2"
+
+    asyncio.run(scenario())
+    assert len(builds) == 2
+
+
+def test_trailing_slash_is_served_without_redirect(client):
+    response = client.get("/api/lattice/diagonal/", follow_redirects=False)
+    assert response.status_code == 200
+    assert "etag" in response.headers
+
+
+def test_etag_matching_accepts_lists_weak_and_wildcard():
+    from backend.responses import etag_matches
+
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches(" * ", '"x"')
+    assert not etag_matches('"a"', '"b"')
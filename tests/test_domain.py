@@ -79,3 +79,35 @@ def test_memory_snapshot_ignores_extra_fields():
     dumped = snap.model_dump()
     assert "extraneous" not in dumped
     assert "timestamp" not in dumped
+
+
+def test_models_build_their_validators_at_import():
+    """Schema compilation happens at import, never on the first request."""
+    import inspect
+
+    from pydantic import BaseModel
+
+    from backend import schemas
+    from backend.domain import models
+
+    for module in (models, schemas):
+        for name, obj in vars(module).items():
+            if inspect.isclass(obj) and issubclass(obj, BaseModel) and obj.__module__ == module.__name__:
+                assert obj.__pydantic_complete__, f"{module.__name__}.{name} defers its schema build"
+
+
+def test_zoned_note_keeps_typed_glyph_matches():
+    from backend.domain.models import GlyphMatch, SymbolicMetadata, ZonedNote
+
+    match = GlyphMatch(shape="APEX", topic="initiation", confidence=1.0, matched_seeds=["start"], applied_rules={})
+    note = ZonedNote(text="start", tag="t", symbolic_metadata=SymbolicMetadata(matched_glyphs=[match]))
+    assert note.symbolic_metadata.matched_glyphs[0] is match
+
+
+def test_symbolic_tags_are_shared_frozensets():
+    from backend.domain.models import SymbolicMetadata
+
+    first = SymbolicMetadata(matched_glyphs=[], symbolic_tags={"tag:a", "tag:b"})
+    second = SymbolicMetadata(matched_glyphs=[], symbolic_tags=["tag:b", "tag:a"])
+    assert isinstance(first.symbolic_tags, frozenset)
+    assert first.symbolic_tags is second.symbolic_tags
@@ -0,0 +1,27 @@
+import math
+
+from quantum_nexus_forge_v5_2_enhanced import RollingStats
+
+
+def test_rolling_stats_tracks_only_the_window():
+    stats = RollingStats(window=10)
+    assert stats.mean() == 0.0
+    assert stats.percentile(95.0) == 0.0
+
+    for value in range(100):
+        stats.add(float(value))
+
+    # Only the last 10 samples (90..99) remain
+    assert math.isclose(stats.mean(), 94.5)
+    assert stats.percentile(0.0) == 90.0
+    assert stats.percentile(95.0) == 99.0
+    assert stats.status()["samples"] == 10
+
+
+def test_rolling_stats_handles_repeated_values():
+    stats = RollingStats(window=10)
+    for value in [5.0] * 10 + [1.0] * 5:
+        stats.add(value)
+    assert stats.percentile(0.0) == 1.0
+    assert stats.percentile(100.0) == 5.0
+    assert math.isclose(stats.mean(), 3.0)